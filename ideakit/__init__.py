@@ -0,0 +1,7 @@
+"""
+IdeaKit workspace tools
+Command-line utilities that operate on a workspace created by install.py
+Run with: python3 -m ideakit <command> [OPTIONS]
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,67 @@
+"""
+IdeaKit command dispatcher
+Run with: python3 -m ideakit <command> [OPTIONS]
+"""
+
+import importlib
+import sys
+from typing import List, Optional
+
+# Command name -> (module, one-line description)
+COMMANDS = {
+    'autocommit': ('ideakit.autocommit', 'Debounce idea changes and commit them grouped per idea'),
+    'context': ('ideakit.context', 'Build compact, size-bounded context packs for Cursor commands'),
+    'dedupe': ('ideakit.dedupe', 'Find near-duplicate ideas (MinHash/LSH) or check new text'),
+    'domains': ('ideakit.domains', 'Rank explored and unexplored domain pairings for @expand'),
+    'export': ('ideakit.export', 'Stream ideas into a columnar, memory-mappable file for notebooks'),
+    'import': ('ideakit.importer', 'Stream CSV/TSV/JSONL records into idea files (resumable)'),
+    'index': ('ideakit.index', 'Refresh and query the persistent idea index'),
+    'lineage': ('ideakit.lineage', 'Trace seeds to their expansions, reality checks and proposals'),
+    'lint': ('ideakit.lint', 'Check idea files against the templates and constitution (parallel)'),
+    'move': ('ideakit.move', 'Move batches of ideas between status folders (journaled)'),
+    'new': ('ideakit.new', 'Create idea files from the installed templates (single or batch)'),
+    'reshard': ('ideakit.reshard', 'Migrate ideas/ to the flat, date or hash layout in place'),
+    'restore': ('ideakit.restore', 'Restore the workspace from a snapshot (incremental)'),
+    'scores': ('ideakit.scores', 'Rank and filter ideas by weighted constitution scores'),
+    'search': ('ideakit.search', 'Ranked BM25 full-text search over ideas and research'),
+    'snapshot': ('ideakit.snapshot', 'Take deduplicated, compressed snapshots of the workspace'),
+    'status': ('ideakit.status', 'Show cached project status (counts, recent ideas, scores)'),
+    'watch': ('ideakit.watch', 'Watch the workspace and keep cached snapshots current'),
+}
+
+def print_help():
+    """Print help message"""
+    print("🚀 IdeaKit Workspace Tools")
+    print()
+    print("USAGE:")
+    print("  python3 -m ideakit <command> [OPTIONS]")
+    print()
+    print("COMMANDS:")
+    width = max(len(name) for name in COMMANDS)
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<{width}}  {description}")
+    print()
+    print("Use 'python3 -m ideakit <command> --help' for command options.")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Dispatch to the requested command module"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ['-h', '--help']:
+        print_help()
+        return 0
+    
+    command = argv[0]
+    if command not in COMMANDS:
+        print(f"❌ Error: Unknown command '{command}'")
+        print("Use --help for usage information")
+        return 1
+    
+    module = importlib.import_module(COMMANDS[command][0])
+    return module.main(argv[1:])
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled by user")
+        sys.exit(1)
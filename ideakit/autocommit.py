@@ -0,0 +1,359 @@
+"""
+IdeaKit auto-commit service
+Debounces changes under ideas/ and commits them grouped per idea, one git process per commit
+Run with: python3 -m ideakit autocommit [OPTIONS]
+"""
+
+import argparse
+import hashlib
+import os
+import posixpath
+import signal
+import struct
+import subprocess
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .context import resolve_link
+from .parser import read_idea
+from .watch import POLL_INTERVAL, Inotify, open_source
+from .workspace import IDEAS_DIR, add_root_argument, find_root
+
+DEBOUNCE = 2.0
+MAX_DELAY = 30.0
+# Links are followed this many hops to reach the seed a report belongs to
+MAX_HOPS = 4
+
+INDEX_HEADER = struct.Struct('>4sII')
+INDEX_ENTRY = struct.Struct('>10I20sH')
+INDEX_EXTENDED = 0x4000
+INDEX_STAGE = 0x3000
+INDEX_NAME_MASK = 0xFFF
+INDEX_CHECKSUM = 20
+
+class GitIndex:
+    """A version 2/3 git index, read and rewritten in-process to register new files"""
+
+    def __init__(self, git_dir: str):
+        self.git_dir = git_dir
+        self.path = os.path.join(git_dir, 'index')
+        self.version = 2
+        self.entries = {}  # type: Dict[bytes, bytes]
+        self.supported = self.load()
+
+    def load(self) -> bool:
+        """Parse the entries; False if the index uses features this writer cannot keep"""
+        try:
+            with open(os.path.join(self.git_dir, 'config'), 'rb') as f:
+                if b'objectformat' in f.read().lower():
+                    return False
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+        signature, self.version, count = INDEX_HEADER.unpack_from(data)
+        if signature != b'DIRC' or self.version not in (2, 3):
+            return False
+        position = INDEX_HEADER.size
+        for _ in range(count):
+            flags = INDEX_ENTRY.unpack_from(data, position)[-1]
+            if flags & INDEX_STAGE:
+                # Unmerged paths: leave conflict resolution to the user
+                return False
+            start = position + INDEX_ENTRY.size + (2 if flags & INDEX_EXTENDED else 0)
+            end = data.index(b'\0', start)
+            size = (end - position + 8) & ~7
+            self.entries[data[start:end]] = data[position:position + size]
+            position += size
+        # Optional extensions (upper-case signatures) such as the cache tree can be dropped;
+        # git rebuilds them. Required ones (split index, sparse index) cannot
+        while position + 8 <= len(data) - INDEX_CHECKSUM:
+            extension, size = struct.unpack_from('>4sI', data, position)
+            if not b'A' <= extension[:1] <= b'Z':
+                return False
+            position += 8 + size
+        return True
+
+    def add(self, name: str, path: str):
+        """Stage a file as a loose blob with its current stat data"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        st = os.stat(path)
+        sha = write_object(self.git_dir, 'blob', data)
+        encoded = name.encode('utf-8')
+        mode = 0o100755 if st.st_mode & 0o111 else 0o100644
+        fields = (int(st.st_ctime), st.st_ctime_ns % 1000000000, int(st.st_mtime), st.st_mtime_ns % 1000000000,
+                  st.st_dev, st.st_ino, mode, st.st_uid, st.st_gid, st.st_size)
+        entry = INDEX_ENTRY.pack(*(value & 0xFFFFFFFF for value in fields), sha,
+                                 min(len(encoded), INDEX_NAME_MASK)) + encoded
+        self.entries[encoded] = entry + b'\0' * (8 - len(entry) % 8)
+
+    def write(self):
+        """Replace the index under git's own lock file"""
+        lock = self.path + '.lock'
+        fd = os.open(lock, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            body = [INDEX_HEADER.pack(b'DIRC', self.version, len(self.entries))]
+            body.extend(self.entries[name] for name in sorted(self.entries))
+            data = b''.join(body)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data + hashlib.sha1(data).digest())
+            os.replace(lock, self.path)
+        except BaseException:
+            os.unlink(lock)
+            raise
+
+def write_object(git_dir: str, kind: str, data: bytes) -> bytes:
+    """Store a loose object and return its binary SHA-1"""
+    raw = f"{kind} {len(data)}".encode('ascii') + b'\0' + data
+    sha = hashlib.sha1(raw).digest()
+    directory = os.path.join(git_dir, 'objects', sha.hex()[:2])
+    path = os.path.join(directory, sha.hex()[2:])
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(zlib.compress(raw, 1))
+        os.replace(tmp, path)
+    return sha
+
+def find_git(root: str) -> Tuple[str, str]:
+    """Return (work tree, git dir) of the repository containing the workspace"""
+    top = os.path.abspath(root)
+    while True:
+        dot_git = os.path.join(top, '.git')
+        if os.path.isdir(dot_git):
+            return top, dot_git
+        if os.path.isfile(dot_git):
+            with open(dot_git, 'r', encoding='utf-8') as f:
+                line = f.readline().strip()
+            if line.startswith('gitdir:'):
+                return top, os.path.normpath(os.path.join(top, line[len('gitdir:'):].strip()))
+        parent = os.path.dirname(top)
+        if parent == top:
+            raise OSError(f"{root} is not inside a git repository")
+        top = parent
+
+def is_idea(relpath: str) -> bool:
+    """Check whether a workspace path is a markdown file under ideas/"""
+    parts = relpath.split('/')
+    return parts[0] == IDEAS_DIR and relpath.endswith('.md') and not any(p.startswith('.') for p in parts)
+
+def uncommitted(top: str, prefix: str) -> Set[str]:
+    """Ask git once for idea files that differ from HEAD (e.g. edited while the service was stopped)"""
+    result = subprocess.run(['git', 'status', '--porcelain', '-z', '--untracked-files=all', '--',
+                             posixpath.join(prefix, IDEAS_DIR) if prefix else IDEAS_DIR],
+                            cwd=top, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise OSError(result.stderr.decode('utf-8', 'replace').strip())
+    paths = set()
+    records = iter(result.stdout.decode('utf-8').split('\0'))
+    for record in records:
+        if len(record) < 4:
+            continue
+        paths.add(record[3:])
+        if record[0] in 'RC':
+            # Renames and copies are followed by their source path
+            paths.add(next(records, ''))
+    return {posixpath.relpath(path, prefix) if prefix else path for path in paths if path}
+
+def group_changes(root: str, paths: Iterable[str]) -> List[List[str]]:
+    """Group changed files per idea by following Related Files links (seed, expansion, validation, ...)"""
+    parent = {}
+
+    def find(path: str) -> str:
+        while parent.setdefault(path, path) != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    paths = sorted(paths)
+    removed = {posixpath.basename(p): p for p in paths if not os.path.exists(os.path.join(root, p))}
+    for path in paths:
+        find(path)
+        if path in removed.values():
+            continue
+        # A file moved between status folders joins its old path's group
+        if posixpath.basename(path) in removed:
+            parent[find(removed[posixpath.basename(path)])] = find(path)
+        frontier = [path]
+        for _ in range(MAX_HOPS):
+            linked = []
+            for current in frontier:
+                try:
+                    links = read_idea(os.path.join(root, current)).links
+                except OSError:
+                    continue
+                for token in links:
+                    target = resolve_link(token, current)
+                    if find(target) != find(path):
+                        parent[find(target)] = find(path)
+                        linked.append(target)
+            frontier = linked
+    groups = {}
+    for path in paths:
+        groups.setdefault(find(path), []).append(path)
+    return sorted(groups.values())
+
+def commit_message(root: str, group: List[str], added: Set[str]) -> str:
+    """Describe a group: subject names the idea, body lists each file"""
+    present = [p for p in group if os.path.exists(os.path.join(root, p))]
+    titles = []
+    for path in present:
+        try:
+            idea = read_idea(os.path.join(root, path))
+        except OSError:
+            continue
+        # The seed carries the idea's capture date; reports based on it do not
+        titles.append((idea.captured is None, path, idea.title or posixpath.basename(path)))
+    title = min(titles)[2] if titles else posixpath.basename(group[0])
+    if not present:
+        verb = "Remove"
+    elif all(p in added for p in group):
+        verb = "Add"
+    elif len(group) == 2 * len(present) and {posixpath.basename(p) for p in group} == {
+            posixpath.basename(p) for p in present}:
+        verb = "Move"
+    else:
+        verb = "Update"
+    lines = [f"{verb} idea: {title}", ""]
+    for path in group:
+        state = 'removed' if path not in present else 'added' if path in added else 'updated'
+        lines.append(f"- {state} {path}")
+    return '\n'.join(lines) + '\n'
+
+class AutoCommitter:
+    """Commits batches of idea changes, one `git commit` per idea group"""
+
+    def __init__(self, root: str, verify: bool = True):
+        self.root = root
+        self.top, self.git_dir = find_git(root)
+        self.prefix = os.path.relpath(root, self.top).replace(os.sep, '/')
+        self.prefix = '' if self.prefix == '.' else self.prefix
+        self.verify = verify
+        self.commits = 0
+
+    def name(self, relpath: str) -> str:
+        """Path in the git index for a workspace path"""
+        return posixpath.join(self.prefix, relpath) if self.prefix else relpath
+
+    def commit(self, paths: Iterable[str]) -> List[Tuple[str, Optional[str]]]:
+        """Commit changed idea files grouped per idea; return (subject, error or None) per group"""
+        paths = {p for p in paths if is_idea(p)}
+        if not paths:
+            return []
+        index = GitIndex(self.git_dir)
+        known = set(index.entries)
+        added = {p for p in paths if self.name(p).encode('utf-8') not in known
+                 and os.path.isfile(os.path.join(self.root, p))}
+        # Files created and deleted within one batch never reached git
+        paths = {p for p in paths if p in added or self.name(p).encode('utf-8') in known}
+        if added:
+            self.register(index, added)
+
+        results = []
+        for group in group_changes(self.root, paths):
+            message = commit_message(self.root, group, added)
+            command = ['git', 'commit', '--quiet', '--only', '-F', '-']
+            if not self.verify:
+                command.append('--no-verify')
+            result = subprocess.run(command + ['--'] + [self.name(p) for p in group], cwd=self.top,
+                                    input=message.encode('utf-8'), stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT)
+            output = result.stdout.decode('utf-8', 'replace').strip()
+            if result.returncode == 0:
+                self.commits += 1
+                results.append((message.splitlines()[0], None))
+            elif 'nothing' not in output and 'no changes' not in output:
+                results.append((message.splitlines()[0], output.splitlines()[-1] if output else "git failed"))
+        return results
+
+    def register(self, index: GitIndex, added: Set[str]):
+        """Make new files known to git so `git commit --only` can take them"""
+        if index.supported:
+            for path in added:
+                index.add(self.name(path), os.path.join(self.root, path))
+            try:
+                index.write()
+                return
+            except FileExistsError:
+                pass
+        # Index locked by another git process or in a format this writer does not handle
+        subprocess.run(['git', 'add', '--'] + [self.name(p) for p in sorted(added)], cwd=self.top,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def run(root: str, poll: bool = False, interval: float = POLL_INTERVAL, debounce: float = DEBOUNCE,
+        verify: bool = True, report=None):
+    """Commit pending changes, then keep committing after each quiet period until SIGINT/SIGTERM"""
+    report = report or (lambda message: None)
+    committer = AutoCommitter(root, verify)
+    source = open_source(root, poll, interval)
+    report(f"👀 Auto-committing {os.path.join(root, IDEAS_DIR)} "
+           f"({'inotify' if isinstance(source, Inotify) else 'polling'}, {debounce:g}s debounce)")
+
+    def flush(paths: Set[str]):
+        for subject, error in committer.commit(paths):
+            report(f"❌ {subject}: {error}" if error else f"📝 {subject}")
+
+    flush(uncommitted(committer.top, committer.prefix))
+    stopping = []
+    previous = signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    pending = set()
+    first = last = 0.0
+    try:
+        while not stopping:
+            changed = source.wait(debounce if pending else 1.0)
+            now = time.monotonic()
+            if changed is None:
+                # Event queue overflowed: let git say what changed
+                changed = uncommitted(committer.top, committer.prefix)
+            changed = {p for p in changed if is_idea(p)}
+            if changed:
+                pending |= changed
+                first = first or now
+                last = now
+            if pending and (now - last >= debounce or now - first >= MAX_DELAY):
+                flush(pending)
+                pending, first = set(), 0.0
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+        if pending:
+            flush(pending)
+        source.close()
+    return committer.commits
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit autocommit', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE,
+                        help=f"Quiet period before committing, in seconds (default: {DEBOUNCE:g})")
+    parser.add_argument('--poll', action='store_true', help="Poll instead of using inotify")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help="Polling interval in seconds (default: 1.0)")
+    parser.add_argument('--no-verify', action='store_true', help="Skip git pre-commit and commit-msg hooks")
+    parser.add_argument('--once', action='store_true', help="Commit uncommitted idea changes and exit")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    try:
+        if args.once:
+            committer = AutoCommitter(root, not args.no_verify)
+            results = committer.commit(uncommitted(committer.top, committer.prefix))
+            for subject, error in results:
+                print(f"❌ {subject}: {error}" if error else f"📝 {subject}")
+            if not results:
+                print("✅ Nothing to commit")
+            return 1 if any(error for _, error in results) else 0
+        commits = run(root, args.poll, args.interval, args.debounce, not args.no_verify,
+                      report=lambda message: print(message, flush=True))
+    except OSError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    print(f"👋 Auto-commit stopped after {commits} commits")
+    return 0
@@ -0,0 +1,69 @@
+"""
+IdeaKit change log
+Append-only JSON-lines log of idea changes made by IdeaKit tools
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Tuple
+
+from .workspace import cache_path
+
+CHANGELOG_FILE = 'changes.log'
+
+def entry(op: str, path: str, **fields) -> Dict:
+    """Build a change entry: op is 'add', 'remove' or 'update'"""
+    record = {'op': op, 'path': path}
+    record.update(fields)
+    return record
+
+def record_many(root: str, entries: Iterable[Dict]):
+    """Append entries with a single write so concurrent writers never interleave lines"""
+    data = ''.join(json.dumps(e, ensure_ascii=False, separators=(',', ':')) + '\n' for e in entries)
+    if not data:
+        return
+    fd = os.open(cache_path(root, CHANGELOG_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+def record(root: str, op: str, path: str, **fields):
+    """Append one change entry"""
+    record_many(root, [entry(op, path, **fields)])
+
+def size(root: str) -> int:
+    """Return the current log size in bytes"""
+    try:
+        return os.path.getsize(cache_path(root, CHANGELOG_FILE))
+    except OSError:
+        return 0
+
+def read_since(root: str, offset: int) -> Tuple[List[Dict], int]:
+    """Return complete entries written after offset and the offset to resume from"""
+    path = cache_path(root, CHANGELOG_FILE)
+    try:
+        with open(path, 'rb') as f:
+            if offset > os.fstat(f.fileno()).st_size:
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        return [], offset
+
+    # Ignore a trailing partial line that is still being written
+    end = data.rfind(b'\n') + 1
+    entries = []
+    for line in data[:end].splitlines():
+        try:
+            entries.append(json.loads(line.decode('utf-8')))
+        except ValueError:
+            continue
+    return entries, offset + end
+
+def truncate(root: str):
+    """Discard the log once a full rescan has made it redundant"""
+    try:
+        os.truncate(cache_path(root, CHANGELOG_FILE), 0)
+    except OSError:
+        pass
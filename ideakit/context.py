@@ -0,0 +1,324 @@
+"""
+IdeaKit context packs
+Build compact, size-bounded context bundles for the Cursor commands
+Run with: python3 -m ideakit context [IDEA] --command NAME [OPTIONS]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+from typing import Dict, List, Optional, Tuple
+
+from . import domains, index
+from .move import LINK_RE, RELATED_SECTION
+from .parser import FOOTER_RE, parse_idea_text
+from .search import SearchIndex
+from .workspace import CACHE_DIR, CONSTITUTION, IDEAS_DIR, add_root_argument, find_root, resolve_idea
+
+PACK_DIR = 'context'
+PACK_INDEX = 'packs.json'
+PACK_VERSION = 2
+
+# Character budget of a pack per command (roughly four characters per token)
+COMMAND_BUDGETS = {'spark': 4000, 'expand': 8000, 'reality-check': 10000, 'blueprint': 12000}
+# Parts included per command, in priority order
+COMMAND_PARTS = {
+    'spark': ('constitution', 'related'),
+    'expand': ('constitution', 'idea', 'expansion', 'domains', 'related'),
+    'reality-check': ('constitution', 'idea', 'expansion', 'validation', 'related'),
+    'blueprint': ('constitution', 'idea', 'expansion', 'validation', 'related'),
+}
+# Share of the budget each part is guaranteed; space a part does not use goes to the others
+SHARES = {'constitution': 0.15, 'idea': 0.35, 'expansion': 0.2, 'validation': 0.15, 'domains': 0.1,
+          'related': 0.15}
+HEADINGS = {'constitution': 'Constitution', 'idea': 'Idea', 'expansion': 'Latest Creative Expansion',
+            'validation': 'Latest Validation Report', 'domains': 'Domain Pairings',
+            'related': 'Related Ideas'}
+DEFAULT_RELATED = 3
+DOMAINS_SUMMARY = f"{CACHE_DIR}/{domains.SUMMARY_FILE}"
+SUMMARY_CHARS = 240
+
+# Companion documents are recognised by their title label or file name
+KINDS = (('expansion', re.compile(r'creative[ -]expansion', re.IGNORECASE)),
+         ('validation', re.compile(r'validation|reality[ -]check', re.IGNORECASE)))
+# A line whose only content after its bullet, checkbox and label is template brackets such as '[reason]'
+PLACEHOLDER_RE = re.compile(r'^\s*(?:[-*]\s*)?(?:\[[ xX]?\]\s*)?(?:\*\*[^*]+\*\*:?\s*|[\w ]+:\s*)?'
+                            r'(?:\[[^\]]*\][\s\-/]*)+$')
+TRAILING_PLACEHOLDER_RE = re.compile(r'(?:\s*-\s*\[[^\]]*\])+\s*$')
+TRUNCATED = '\n…(truncated)'
+
+def read_text(root: str, relpath: str) -> Optional[str]:
+    """Read a workspace file, None if it is missing"""
+    try:
+        with open(os.path.join(root, relpath), 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def stamp(root: str, relpath: str) -> Optional[List[int]]:
+    """Return [mtime_ns, size] of a workspace file"""
+    try:
+        st = os.stat(os.path.join(root, relpath))
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def digest_constitution(text: str) -> str:
+    """Drop blank lines, emphasis and the footer from the constitution"""
+    lines = []
+    for line in FOOTER_RE.sub('', text).splitlines():
+        line = line.replace('**', '').rstrip()
+        if not line or line.startswith('---') or (line.startswith('*') and line.endswith('*')):
+            continue
+        if line.startswith('#'):
+            line = '### ' + line.lstrip('#').strip()
+        lines.append(line)
+    return '\n'.join(lines[1:] if lines and lines[0].startswith('### ') else lines)
+
+def compact_idea(text: str) -> str:
+    """Keep an idea's title, header fields and filled-in sections, without links or placeholders"""
+    idea = parse_idea_text(text)
+    lines = [f"**{idea['title']}**"] if idea['title'] else []
+    lines.extend(f"{key}: {value}" for key, value in idea['fields'].items()
+                 if value and not PLACEHOLDER_RE.match(value))
+    for name, body in idea['sections'].items():
+        if name == RELATED_SECTION:
+            continue
+        kept = [TRAILING_PLACEHOLDER_RE.sub('', line) for line in body.splitlines()
+                if line.strip() and not PLACEHOLDER_RE.match(line)]
+        if kept:
+            lines.append(f"### {name}")
+            lines.extend(kept)
+    return '\n'.join(lines)
+
+def truncate(text: str, limit: int) -> str:
+    """Cut text at a line boundary so it fits in limit characters"""
+    if len(text) <= limit:
+        return text
+    cut = text.rfind('\n', 0, max(limit - len(TRUNCATED), 0))
+    return text[:max(cut, 0)] + TRUNCATED
+
+def fit(parts: List[Tuple[str, str]], budget: int) -> List[Tuple[str, str]]:
+    """Give each part its share of the budget, then hand unused space to parts in priority order"""
+    total = sum(SHARES[name] for name, _ in parts) or 1.0
+    limits = [int(budget * SHARES[name] / total) for name, _ in parts]
+    spare = budget - sum(min(len(text), limit) for (_, text), limit in zip(parts, limits))
+    for i, (_, text) in enumerate(parts):
+        extra = min(max(len(text) - limits[i], 0), spare)
+        limits[i] += extra
+        spare -= extra
+    return [(name, truncate(text, limit)) for (name, text), limit in zip(parts, limits)]
+
+def resolve_link(token: str, from_path: str) -> str:
+    """Resolve a Related Files link relative to the file containing it"""
+    if token.startswith(IDEAS_DIR + '/'):
+        return posixpath.normpath(token)
+    return posixpath.normpath(posixpath.join(posixpath.dirname(from_path), token))
+
+def kind_of(relpath: str, text: str) -> Optional[str]:
+    """Classify a companion document as an expansion or validation report"""
+    heading = next((line for line in text.splitlines() if line.startswith('# ')), '')
+    for kind, pattern in KINDS:
+        if pattern.search(heading) or pattern.search(posixpath.basename(relpath)):
+            return kind
+    return None
+
+def find_companions(root: str, conn, idea_path: str, idea_text: str) -> Dict[str, str]:
+    """Return the newest expansion and validation linked to or from an idea"""
+    candidates = set()
+    idea = parse_idea_text(idea_text)
+    for token in LINK_RE.findall(idea['sections'].get(RELATED_SECTION, '')):
+        candidates.add(resolve_link(token, idea_path))
+    name = posixpath.basename(idea_path)
+    for path, body in conn.execute("SELECT path, body FROM sections WHERE name = ? AND body LIKE ?",
+                                   (RELATED_SECTION, '%' + name + '%')):
+        if idea_path in (resolve_link(token, path) for token in LINK_RE.findall(body)):
+            candidates.add(path)
+    candidates.discard(idea_path)
+
+    newest = {}
+    for path in candidates:
+        text = read_text(root, path)
+        st = stamp(root, path)
+        kind = kind_of(path, text) if text is not None and st else None
+        if kind and (kind not in newest or st[0] > newest[kind][0]):
+            newest[kind] = (st[0], path)
+    return {kind: path for kind, (_, path) in newest.items()}
+
+def related_ideas(root: str, engine: SearchIndex, query: str, exclude: set, limit: int) -> Dict[str, str]:
+    """Return {path: text} of the ideas (not expansions or reports) ranking highest for the query text"""
+    found = {}
+    if not query.strip() or limit <= 0:
+        return found
+    for _, path in engine.search(query, {}, 2 * limit + len(exclude)):
+        if path in exclude or not path.startswith(IDEAS_DIR + '/'):
+            continue
+        text = read_text(root, path)
+        if text is not None and kind_of(path, text) is None:
+            found[path] = text
+            if len(found) == limit:
+                break
+    return found
+
+def summarize_related(ideas: Dict[str, str]) -> str:
+    """One line per related idea: title, score and the start of its Raw Idea"""
+    lines = []
+    for path, text in ideas.items():
+        idea = parse_idea_text(text)
+        raw = ' '.join(line.strip() for line in idea['sections'].get('Raw Idea', '').splitlines()
+                       if line.strip() and not PLACEHOLDER_RE.match(line))
+        if len(raw) > SUMMARY_CHARS:
+            raw = raw[:SUMMARY_CHARS].rsplit(' ', 1)[0] + '…'
+        score = f", {idea['score']}/50" if idea['score'] is not None else ''
+        lines.append(f"- {idea['title'] or posixpath.basename(path)} ({path}{score}){': ' + raw if raw else ''}")
+    return '\n'.join(lines)
+
+def pack_directory(root: str) -> str:
+    """Return the pack cache directory, creating it if needed"""
+    directory = os.path.join(root, CACHE_DIR, PACK_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+def load_pack_index(root: str) -> Dict:
+    """Read the map of (command, idea) to the last pack built for it"""
+    try:
+        with open(os.path.join(pack_directory(root), PACK_INDEX), 'r', encoding='utf-8') as f:
+            packs = json.load(f)
+        if packs.get('version') == PACK_VERSION:
+            return packs
+    except (OSError, ValueError):
+        pass
+    return {'version': PACK_VERSION, 'packs': {}}
+
+def save_pack_index(root: str, packs: Dict):
+    """Atomically write the pack map"""
+    path = os.path.join(pack_directory(root), PACK_INDEX)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(packs, f, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+def build_pack(root: str, command: str, idea_path: Optional[str] = None, text: str = '',
+               budget: Optional[int] = None, related: int = DEFAULT_RELATED,
+               refresh: bool = True) -> Tuple[str, bool]:
+    """Return (pack file, reused) for a command, rebuilding only when one of its inputs changed"""
+    budget = budget or COMMAND_BUDGETS[command]
+    parts = COMMAND_PARTS[command] if idea_path else ('constitution', 'related')
+    packs = load_pack_index(root)
+    entry_key = f"{command}:{idea_path or ''}:{budget}:{related}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+
+    conn = index.open_index(root)
+    engine = SearchIndex(root)
+    try:
+        if refresh:
+            index.refresh(root, conn)
+            engine.refresh()
+            if 'domains' in parts:
+                domains.refresh(root)
+        state = [index.generation(conn), engine.manifest['next']]
+        entry = packs['packs'].get(entry_key)
+        pack_file = entry and os.path.join(pack_directory(root), entry['key'] + '.md')
+        # Fast path: nothing in the workspace changed since the pack was built
+        if (entry and entry['state'] == state and os.path.exists(pack_file)
+                and all(stamp(root, path) == value for path, value in entry['inputs'].items())):
+            return pack_file, True
+
+        inputs = {CONSTITUTION: read_text(root, CONSTITUTION) or ''}
+        if idea_path:
+            idea_text = read_text(root, idea_path)
+            if idea_text is None:
+                raise FileNotFoundError(idea_path)
+            inputs[idea_path] = idea_text
+            companions = {kind: path for kind, path in find_companions(root, conn, idea_path, idea_text).items()
+                          if kind in parts}
+            for path in companions.values():
+                inputs[path] = read_text(root, path) or ''
+            idea = parse_idea_text(idea_text)
+            query = ' '.join([idea['title'], idea['sections'].get('Raw Idea', ''), text])
+        else:
+            companions = {}
+            query = text
+        nearby = related_ideas(root, engine, query, set(inputs), related) if 'related' in parts else {}
+        summary = domains.load_summary(root) if 'domains' in parts else None
+        if summary is not None:
+            # Listed as an input so the pack is rebuilt when the pairings change
+            inputs[DOMAINS_SUMMARY] = read_text(root, DOMAINS_SUMMARY) or ''
+        inputs.update(nearby)
+    finally:
+        engine.close()
+        conn.close()
+
+    digest = hashlib.sha256(f"{PACK_VERSION}\0{command}\0{budget}\0{related}\0{text}".encode('utf-8'))
+    for path in sorted(inputs):
+        digest.update(f"\0{path}\0".encode('utf-8'))
+        digest.update(hashlib.sha256(inputs[path].encode('utf-8')).digest())
+    key = digest.hexdigest()[:24]
+    pack_file = os.path.join(pack_directory(root), key + '.md')
+    reused = os.path.exists(pack_file)
+
+    if not reused:
+        sections = {'constitution': digest_constitution(inputs[CONSTITUTION]),
+                    'related': summarize_related(nearby)}
+        if idea_path:
+            sections['idea'] = compact_idea(inputs[idea_path])
+        for kind, path in companions.items():
+            sections[kind] = compact_idea(inputs[path])
+        if summary is not None:
+            sections['domains'] = domains.suggest(root, summary, inputs[idea_path])
+        present = [(name, sections[name]) for name in parts if sections.get(name)]
+        body = [f"# IdeaKit context: {command}",
+                f"<!-- ideakit-context {key}; budget {budget} characters -->"]
+        for name, content in fit(present, budget):
+            source = idea_path if name == 'idea' else companions.get(name)
+            body.append(f"\n## {HEADINGS[name]}" + (f" ({source})" if source else ''))
+            body.append(content)
+        with open(pack_file + '.tmp', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(body) + '\n')
+        os.replace(pack_file + '.tmp', pack_file)
+
+    previous = packs['packs'].get(entry_key)
+    packs['packs'][entry_key] = {'key': key, 'state': state,
+                                 'inputs': {path: stamp(root, path) for path in inputs}}
+    if previous and previous['key'] != key and not any(
+            other['key'] == previous['key'] for other in packs['packs'].values()):
+        try:
+            os.remove(os.path.join(pack_directory(root), previous['key'] + '.md'))
+        except OSError:
+            pass
+    save_pack_index(root, packs)
+    return pack_file, reused
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit context', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('idea', nargs='?', help="Idea file the command works on (relative to the workspace)")
+    parser.add_argument('--command', required=True, choices=sorted(COMMAND_BUDGETS),
+                        help="Cursor command the pack is for")
+    parser.add_argument('--text', default='', help="Extra text to find related ideas (e.g. a new @spark idea)")
+    parser.add_argument('--budget', type=int, help="Maximum pack size in characters (default: per command)")
+    parser.add_argument('--related', type=int, default=DEFAULT_RELATED,
+                        help=f"Number of related ideas (default: {DEFAULT_RELATED})")
+    parser.add_argument('--path', action='store_true', help="Print the pack file path instead of its content")
+    parser.add_argument('--no-refresh', action='store_true', help="Use the caches without checking files for changes")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    idea_path = None
+    if args.idea:
+        full = os.path.abspath(args.idea if os.path.exists(args.idea) else os.path.join(root, args.idea))
+        idea_path = resolve_idea(root, os.path.relpath(full, root))
+    try:
+        pack_file, _ = build_pack(root, args.command, idea_path, args.text, args.budget, args.related,
+                                  refresh=not args.no_refresh)
+    except FileNotFoundError:
+        print(f"❌ Idea file not found: {args.idea}")
+        return 1
+    if args.path:
+        print(pack_file)
+    else:
+        with open(pack_file, 'r', encoding='utf-8') as f:
+            print(f.read(), end='')
+    return 0
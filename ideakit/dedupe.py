@@ -0,0 +1,375 @@
+"""
+IdeaKit near-duplicate detection
+One-permutation MinHash signatures of the Raw Idea and Core Problem sections with an LSH band index
+Run with: python3 -m ideakit dedupe [clusters|check TEXT] [OPTIONS]
+"""
+
+import argparse
+import bisect
+import json
+import operator
+import os
+import re
+import struct
+import time
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Set
+
+from . import index
+from .templates import SECTION_BODY_RE
+from .workspace import add_root_argument, cache_path, find_root
+
+INDEX_FILE = 'minhash.bin'
+INDEX_MAGIC = b'IKM2'
+HEADER = struct.Struct('<4sQIHH')  # magic, index generation, row count, permutations, bands
+
+DEDUPE_SECTIONS = ('Raw Idea', 'Core Problem/Opportunity')
+SHINGLE_WORDS = 2
+# Dropped before shingling so rephrasings of the same idea still share most shingles
+STOPWORDS = frozenset('a an and are as at be but by for from has have i if in into is it its my of on '
+                      'or our so that the their then this to we when where which while who will with '
+                      'would you your actually really just very'.split())
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.6
+# Up to this many (or 10% of all) changed ideas are patched into the index instead of rebuilding it
+REBUILD_MIN = 1000
+MASK64 = (1 << 64) - 1
+# Signature of ideas without text; such rows are kept for bookkeeping but never banded
+EMPTY = 0xFFFFFFFF
+WORD_RE = re.compile(r'\w+')
+
+# Odd 64-bit multiplier spreading 32-bit shingle hashes over bins and values
+MIX = 0x9E3779B97F4A7C15
+BIN_SHIFT = 64 - (NUM_PERM - 1).bit_length()
+# Added per bin of distance when an empty bin borrows its neighbour's value
+ROTATION = 0x2545F491
+
+def shingles(text: str) -> Set[int]:
+    """Hash overlapping word pairs of text without stopwords and plural 's' (single words for short texts)"""
+    words = [w[:-1] if len(w) > 3 and w.endswith('s') else w
+             for w in WORD_RE.findall(text.lower()) if w not in STOPWORDS]
+    if len(words) < SHINGLE_WORDS:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+    return {zlib.crc32(gram.encode('utf-8')) for gram in grams}
+
+def signature(hashes: Set[int]) -> array:
+    """One-permutation MinHash: one hash per shingle split into NUM_PERM bins, empty bins densified"""
+    bins = [EMPTY] * NUM_PERM
+    if not hashes:
+        return array('I', bins)
+    for x in hashes:
+        h = (x * MIX) & MASK64
+        b = h >> BIN_SHIFT
+        v = min((h >> 16) & 0xFFFFFFFF, EMPTY - 1)
+        if v < bins[b]:
+            bins[b] = v
+    # Rotation densification: an empty bin takes the next filled bin's value plus an offset
+    filled = [i for i, v in enumerate(bins) if v != EMPTY]
+    if len(filled) < NUM_PERM:
+        for i in range(NUM_PERM):
+            if bins[i] == EMPTY:
+                j = filled[bisect.bisect_left(filled, i) % len(filled)]
+                bins[i] = (bins[j] + ROTATION * ((j - i) % NUM_PERM)) % EMPTY
+    return array('I', bins)
+
+def idea_text(bodies: Iterable[Optional[str]]) -> str:
+    """Join the compared sections, ignoring unfilled template placeholders"""
+    parts = []
+    for body in bodies:
+        body = (body or '').strip()
+        if body and not SECTION_BODY_RE.match(body):
+            parts.append(body)
+    return '\n'.join(parts)
+
+def band_key(sig, band: int) -> int:
+    """Hash one band of a signature"""
+    return zlib.crc32(array('I', sig[band * ROWS:(band + 1) * ROWS]).tobytes())
+
+def similarity(a, b) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(map(operator.eq, a, b)) / NUM_PERM
+
+class MinHashIndex:
+    """Signatures in one flat array plus, per band, sorted band keys for binary search"""
+
+    def __init__(self, paths: List[str], mtimes: array, sizes: array, signatures: array,
+                 generation: int = 0, bands: Optional[List[tuple]] = None):
+        self.paths = paths
+        self.mtimes = mtimes
+        self.sizes = sizes
+        self.signatures = signatures
+        self.generation = generation
+        self.bands = bands if bands is not None else self.build_bands()
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def sig(self, row: int) -> array:
+        """Return the signature of one row"""
+        return self.signatures[row * NUM_PERM:(row + 1) * NUM_PERM]
+
+    def build_bands(self) -> List[tuple]:
+        """Sort the rows of every band by band key: [(keys, rows)]"""
+        rows = [row for row in range(len(self)) if self.signatures[row * NUM_PERM] != EMPTY]
+        data = memoryview(self.signatures).cast('B')
+        stride, width = NUM_PERM * self.signatures.itemsize, ROWS * self.signatures.itemsize
+        bands = []
+        for band in range(BANDS):
+            offset = band * width
+            keyed = sorted((zlib.crc32(data[row * stride + offset:row * stride + offset + width]), row)
+                           for row in rows)
+            bands.append((array('I', [k for k, _ in keyed]), array('I', [r for _, r in keyed])))
+        return bands
+
+    def band(self, row: int):
+        """Insert one row into every band"""
+        sig = self.sig(row)
+        if sig[0] == EMPTY:
+            return
+        for number, (keys, rows) in enumerate(self.bands):
+            key = band_key(sig, number)
+            i = bisect.bisect_right(keys, key)
+            keys.insert(i, key)
+            rows.insert(i, row)
+
+    def unband(self, row: int):
+        """Remove one row from every band"""
+        sig = self.sig(row)
+        if sig[0] == EMPTY:
+            return
+        for number, (keys, rows) in enumerate(self.bands):
+            key = band_key(sig, number)
+            i = bisect.bisect_left(keys, key)
+            while i < len(keys) and keys[i] == key:
+                if rows[i] == row:
+                    del keys[i]
+                    del rows[i]
+                    break
+                i += 1
+
+    @property
+    def ideas(self) -> int:
+        """Number of live (not deleted) rows"""
+        return sum(1 for path in self.paths if path)
+
+    def candidates(self, sig) -> Set[int]:
+        """Rows sharing at least one band with sig"""
+        found = set()
+        for band, (keys, rows) in enumerate(self.bands):
+            key = band_key(sig, band)
+            i = bisect.bisect_left(keys, key)
+            while i < len(keys) and keys[i] == key:
+                found.add(rows[i])
+                i += 1
+        return found
+
+    def query(self, sig, threshold: float = THRESHOLD) -> List[tuple]:
+        """Return (similarity, path) of indexed ideas similar to sig, most similar first"""
+        if sig[0] == EMPTY:
+            return []
+        matches = [(similarity(sig, self.sig(row)), self.paths[row]) for row in self.candidates(sig)]
+        return sorted((m for m in matches if m[0] >= threshold), key=lambda m: (-m[0], m[1]))
+
+    def clusters(self, threshold: float = THRESHOLD) -> List[List[tuple]]:
+        """Group near-duplicates; each band run is compared against its first row only"""
+        parent = list(range(len(self)))
+
+        def find(row):
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        for keys, rows in self.bands:
+            start = 0
+            while start < len(keys):
+                end = start
+                while end < len(keys) and keys[end] == keys[start]:
+                    end += 1
+                first = rows[start]
+                for i in range(start + 1, end):
+                    row = rows[i]
+                    if find(row) != find(first) and similarity(self.sig(first), self.sig(row)) >= threshold:
+                        parent[find(row)] = find(first)
+                start = end
+
+        groups = {}
+        for row in range(len(self)):
+            if self.paths[row]:
+                groups.setdefault(find(row), []).append(row)
+        result = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            members.sort(key=lambda row: self.paths[row])
+            head = self.sig(members[0])
+            result.append([(round(similarity(head, self.sig(row)), 2), self.paths[row]) for row in members])
+        return sorted(result, key=lambda group: (-len(group), group[0][1]))
+
+def section_text(conn, path: str) -> str:
+    """Read the compared sections of one idea from the index"""
+    rows = dict(conn.execute("SELECT name, body FROM sections WHERE path = ? AND name IN (?, ?)",
+                             (path,) + DEDUPE_SECTIONS))
+    return idea_text(rows.get(name) for name in DEDUPE_SECTIONS)
+
+def build_index(conn, previous: Optional[MinHashIndex] = None) -> MinHashIndex:
+    """Bring signatures up to date with the idea index, touching only changed ideas"""
+    current = {path: (mtime, size) for path, mtime, size in
+               conn.execute("SELECT path, mtime_ns, size FROM ideas ORDER BY path")}
+    if previous is not None:
+        table = update_index(conn, previous, current)
+        if table is not None:
+            return table
+    paths, mtimes, sizes, signatures = [], array('q'), array('q'), array('I')
+    for path, (mtime, size) in current.items():
+        signatures.extend(signature(shingles(section_text(conn, path))))
+        paths.append(path)
+        mtimes.append(mtime)
+        sizes.append(size)
+    return MinHashIndex(paths, mtimes, sizes, signatures, index.generation(conn))
+
+def update_index(conn, table: MinHashIndex, current: Dict[str, tuple]) -> Optional[MinHashIndex]:
+    """Patch rows and band arrays in place; None when a full rebuild is cheaper"""
+    rows = {path: row for row, path in enumerate(table.paths) if path}
+    changed = [path for path, stamp in current.items()
+               if path in rows and (table.mtimes[rows[path]], table.sizes[rows[path]]) != stamp]
+    removed = [path for path in rows if path not in current]
+    added = [path for path in current if path not in rows]
+    live = len(rows) - len(removed) + len(added)
+    dead = len(table) - len(rows) + len(removed)
+    if len(changed) + len(removed) + len(added) > max(REBUILD_MIN, live // 10) or dead > live // 4:
+        return None
+
+    for path in changed + removed:
+        table.unband(rows[path])
+    for path in removed:
+        row = rows[path]
+        table.paths[row] = ''
+        table.signatures[row * NUM_PERM:(row + 1) * NUM_PERM] = array('I', [EMPTY] * NUM_PERM)
+    for path in added:
+        rows[path] = len(table.paths)
+        table.paths.append(path)
+        table.mtimes.append(0)
+        table.sizes.append(0)
+        table.signatures.extend(array('I', [EMPTY] * NUM_PERM))
+    for path in changed + added:
+        row = rows[path]
+        table.mtimes[row], table.sizes[row] = current[path]
+        table.signatures[row * NUM_PERM:(row + 1) * NUM_PERM] = signature(shingles(section_text(conn, path)))
+        table.band(row)
+    table.generation = index.generation(conn)
+    return table
+
+def save_index(table: MinHashIndex, path: str):
+    """Write header, stamps, signatures, band arrays and a path blob"""
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(INDEX_MAGIC, table.generation, len(table), NUM_PERM, BANDS))
+        table.mtimes.tofile(f)
+        table.sizes.tofile(f)
+        table.signatures.tofile(f)
+        for keys, rows in table.bands:
+            f.write(struct.pack('<I', len(keys)))
+            keys.tofile(f)
+            rows.tofile(f)
+        f.write('\n'.join(table.paths).encode('utf-8'))
+    os.replace(tmp, path)
+
+def load_saved_index(path: str) -> Optional[MinHashIndex]:
+    """Read an index written by save_index, None if missing, unreadable or differently shaped"""
+    try:
+        with open(path, 'rb') as f:
+            magic, generation, count, perms, bands = HEADER.unpack(f.read(HEADER.size))
+            if magic != INDEX_MAGIC or perms != NUM_PERM or bands != BANDS:
+                return None
+            mtimes, sizes, signatures = array('q'), array('q'), array('I')
+            mtimes.fromfile(f, count)
+            sizes.fromfile(f, count)
+            signatures.fromfile(f, count * NUM_PERM)
+            band_arrays = []
+            for _ in range(BANDS):
+                (size,) = struct.unpack('<I', f.read(4))
+                keys, rows = array('I'), array('I')
+                keys.fromfile(f, size)
+                rows.fromfile(f, size)
+                band_arrays.append((keys, rows))
+            blob = f.read().decode('utf-8')
+    except (OSError, EOFError, ValueError, struct.error):
+        return None
+    paths = blob.split('\n') if count else []
+    return MinHashIndex(paths, mtimes, sizes, signatures, generation, band_arrays)
+
+def load_minhash(root: str, refresh: bool = True) -> MinHashIndex:
+    """Load the cached MinHash index, updating changed ideas when the idea index changed"""
+    conn = index.open_index(root)
+    try:
+        if refresh:
+            index.refresh(root, conn)
+        path = cache_path(root, INDEX_FILE)
+        table = load_saved_index(path)
+        if table is None or table.generation != index.generation(conn):
+            table = build_index(conn, table)
+            save_index(table, path)
+        return table
+    finally:
+        conn.close()
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit dedupe', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    sub = parser.add_subparsers(dest='action')
+    clusters = sub.add_parser('clusters', help="Report clusters of near-duplicate ideas (default)")
+    check = sub.add_parser('check', help="Check new idea text against every idea")
+    check.add_argument('text', help="Raw idea text")
+    check.add_argument('--problem', default='', help="Core problem or opportunity text")
+    # Shared options are accepted before or after the action; the action's copies default to SUPPRESS so
+    # they never overwrite a value given before it
+    for command, default in ((parser, None), (clusters, argparse.SUPPRESS), (check, argparse.SUPPRESS)):
+        command.add_argument('--threshold', type=float, default=default or THRESHOLD,
+                             help=f"Minimum estimated similarity 0-1 (default: {THRESHOLD})")
+        command.add_argument('--json', action='store_true', default=default or False,
+                             help="Print results as JSON")
+        command.add_argument('--no-refresh', action='store_true', default=default or False,
+                             help="Use the index without refreshing it")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    started = time.perf_counter()
+    table = load_minhash(root, refresh=not args.no_refresh)
+
+    if args.action == 'check':
+        sig = signature(shingles(idea_text([args.text, args.problem])))
+        matches = table.query(sig, args.threshold)
+        elapsed = (time.perf_counter() - started) * 1000
+        if args.json:
+            print(json.dumps([{'path': p, 'similarity': round(s, 2)} for s, p in matches], indent=2))
+            return 0
+        if not matches:
+            print(f"✅ No near-duplicates among {table.ideas} ideas ({elapsed:.1f} ms)")
+            return 0
+        print(f"⚠️  {len(matches)} similar ideas already exist:")
+        for score, path in matches[:10]:
+            print(f"   {score:4.0%}  {path}")
+        return 0
+
+    groups = table.clusters(args.threshold)
+    elapsed = (time.perf_counter() - started) * 1000
+    if args.json:
+        print(json.dumps([[{'path': p, 'similarity': s} for s, p in group] for group in groups], indent=2))
+        return 0
+    if not groups:
+        print(f"✅ No near-duplicate clusters among {table.ideas} ideas ({elapsed:.0f} ms)")
+        return 0
+    print(f"🔁 {len(groups)} near-duplicate clusters among {table.ideas} ideas:")
+    for number, group in enumerate(groups, 1):
+        print(f"\n{number}. {len(group)} ideas")
+        for score, path in group:
+            print(f"   {score:4.0%}  {path}")
+    print(f"\nℹ️  Clustered in {elapsed:.0f} ms")
+    return 0
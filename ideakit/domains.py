@@ -0,0 +1,479 @@
+"""
+IdeaKit domain co-occurrence
+Tag ideas with domains, count which pairs were already combined and rank the unexplored ones for @expand
+Run with: python3 -m ideakit domains [IDEA] [OPTIONS]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import struct
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .parser import parse_idea_bytes, parse_idea_text
+from .search import tokenize
+from .workspace import (CONSTITUTION, add_root_argument, cache_path, find_root, iter_idea_files, resolve_idea,
+                        stat_idea_paths)
+
+MATRIX_FILE = 'domains.bin'
+SUMMARY_FILE = 'domains.json'
+SUMMARY_VERSION = 1
+MATRIX_MAGIC = b'IKM1'
+# magic, documents, non-zero cells, domains, vocabulary digest
+MATRIX_HEADER = struct.Struct('<4sIII8s')
+
+# Built-in vocabulary: domain name and the words (besides the name) that tag an idea with it; a "## Domains"
+# section in the constitution adds or replaces entries with lines like "- robotics: robot, drone".
+# Words that usually describe a feature or constraint rather than a field ("budget", "camera") are left out.
+DOMAINS = (
+    ('pet', ('dog', 'cat', 'puppy', 'kitten')),
+    ('fitness', ('workout', 'exercise', 'gym', 'runner', 'jogging')),
+    ('gaming', ('game', 'gamer', 'gamified', 'gamification')),
+    ('cooking', ('cook', 'recipe', 'kitchen', 'chef', 'meal', 'baking')),
+    ('music', ('song', 'musician', 'playlist', 'band', 'concert')),
+    ('gardening', ('garden', 'plant', 'gardener')),
+    ('travel', ('trip', 'tourist', 'tourism', 'vacation')),
+    ('finance', ('money', 'investing', 'bank', 'banking')),
+    ('education', ('school', 'student', 'teacher', 'tutor', 'classroom')),
+    ('sleep', ('dream', 'bedtime', 'nap')),
+    ('language', ('vocabulary', 'translation')),
+    ('photography', ('photo', 'photographer')),
+    ('fashion', ('clothing', 'outfit', 'wardrobe')),
+    ('parenting', ('parent', 'kid', 'child', 'baby')),
+    ('productivity', ('todo', 'focus', 'procrastination')),
+    ('dating', ('romance', 'couple', 'relationship')),
+    ('art', ('artist', 'drawing', 'painting')),
+    ('sports', ('football', 'soccer', 'basketball', 'tennis', 'athlete')),
+    ('reading', ('book', 'reader', 'library')),
+    ('meditation', ('mindfulness', 'yoga', 'breathing')),
+    ('home', ('house', 'chore', 'cleaning', 'furniture')),
+    ('weather', ('forecast', 'climate', 'rain')),
+    ('coding', ('programming', 'developer', 'code', 'software')),
+    ('shopping', ('shop', 'shopper', 'retail')),
+    ('health', ('medical', 'wellness', 'doctor')),
+    ('film', ('movie', 'cinema')),
+    ('transport', ('commute', 'car', 'bike', 'cycling')),
+    ('sustainability', ('recycling', 'eco', 'waste')),
+)
+DOMAINS_SECTION = 'Domains'
+DOMAIN_LINE_RE = re.compile(r'^\s*[-*]\s*\**([\w +/-]+?)\**\s*:\s*(.+)$')
+# Where an idea names its domains; the body of each section is mostly about execution
+SECTIONS = ('Raw Idea', 'Original Concept Recap')
+INSPIRATION_RE = re.compile(rb'\*\*Cross-domain inspiration:\*\*([^\n]*)')
+HEADING_RE = re.compile(rb'^# [^\n]*', re.MULTILINE)
+# Validation reports and proposals repeat their seed's domains; counting them would inflate its pairs
+SKIP_RE = re.compile(r'validation|reality[ -]check|project[ -]proposal|blueprint', re.IGNORECASE)
+# A mention in the title or a cross-domain inspiration line weighs this much, one in the text 1; an idea
+# belongs to the domains weighing at least MIN_WEIGHT, so a word dropped in passing does not tag it
+STRONG_WEIGHT = 2
+MIN_WEIGHT = 2
+DEFAULT_LIMIT = 10
+# A pair counts as under-explored when it has fewer than this share of the ideas chance would give it
+UNDER_EXPLORED = 0.5
+
+class Vocabulary:
+    """Domain names and a word-to-domain map, with a digest that changes when either (or a weight) does"""
+
+    def __init__(self, domains: List[Tuple[str, Tuple[str, ...]]]):
+        self.names = [name for name, _ in domains]
+        self.words = {}
+        # Words are tokenized like idea text, so "sports" and "fitness" match as "sport" and "fitnes"
+        for i, (name, words) in enumerate(domains):
+            for word in tokenize(' '.join((name,) + tuple(words))):
+                self.words.setdefault(word, i)
+        settings = json.dumps([domains, STRONG_WEIGHT, MIN_WEIGHT])
+        self.digest = hashlib.sha1(settings.encode('utf-8')).digest()[:8]
+
+    def tag(self, text: str, counts: Dict[int, int], weight: int = 1):
+        """Add the weight of the domain words found in text to counts"""
+        for word in tokenize(text):
+            domain = self.words.get(word)
+            if domain is not None:
+                counts[domain] = counts.get(domain, 0) + weight
+
+def load_vocabulary(root: str) -> Vocabulary:
+    """The built-in domains, extended by the constitution's Domains section"""
+    domains = dict(DOMAINS)
+    try:
+        with open(os.path.join(root, CONSTITUTION), 'r', encoding='utf-8') as f:
+            section = parse_idea_text(f.read())['sections'].get(DOMAINS_SECTION, '')
+    except OSError:
+        section = ''
+    for line in section.splitlines():
+        match = DOMAIN_LINE_RE.match(line)
+        if match:
+            domains[match.group(1).strip().lower()] = tuple(
+                word.strip().lower() for word in match.group(2).split(',') if word.strip())
+    return Vocabulary(sorted(domains.items(), key=lambda item: item[0]))
+
+def tag_document(data: bytes, relpath: str, vocabulary: Vocabulary) -> Optional[Dict[int, int]]:
+    """Weighted domain term counts of one idea, None for documents that only restate another idea"""
+    heading = HEADING_RE.search(data)
+    if SKIP_RE.search(heading.group(0).decode('utf-8', 'replace') if heading else '') or \
+            SKIP_RE.search(relpath.rsplit('/', 1)[-1]):
+        return None
+    idea = parse_idea_bytes(data, relpath)
+    counts = {}
+    vocabulary.tag(idea.title, counts, STRONG_WEIGHT)
+    sections = idea.sections(data)
+    for name in SECTIONS:
+        vocabulary.tag(sections.get(name, ''), counts)
+    for match in INSPIRATION_RE.finditer(data):
+        vocabulary.tag(match.group(1).decode('utf-8', 'replace'), counts, STRONG_WEIGHT)
+    return counts
+
+def scan_file(root: str, relpath: str, vocabulary: Vocabulary) -> Optional[Dict[int, int]]:
+    """Read and tag one idea file"""
+    try:
+        with open(os.path.join(root, relpath), 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    return tag_document(data, relpath, vocabulary)
+
+class Matrix:
+    """Sparse term-document matrix (one row of domain counts per idea) and its co-occurrence counts"""
+
+    def __init__(self, domains: int, digest: bytes):
+        self.domains = domains
+        self.digest = digest
+        self.paths = []  # type: List[str]
+        self.mtimes = array('q')
+        self.sizes = array('q')
+        self.row_start = array('I', [0])
+        self.cols = array('H')
+        self.counts = array('H')
+        # Ideas tagged with each domain, and with each pair (row-major upper triangle of a square)
+        self.frequency = array('I', bytes(4 * domains))
+        self.pairs = array('I', bytes(4 * domains * domains))
+        self.tagged = 0
+
+    def row(self, i: int) -> Tuple[array, array]:
+        """Column ids and term counts of one idea"""
+        start, end = self.row_start[i], self.row_start[i + 1]
+        return self.cols[start:end], self.counts[start:end]
+
+    def append(self, relpath: str, mtime: int, size: int, cols, counts):
+        """Add an idea's row and its contribution to the co-occurrence counts"""
+        self.paths.append(relpath)
+        self.mtimes.append(mtime)
+        self.sizes.append(size)
+        self.cols.extend(cols)
+        self.counts.extend(counts)
+        self.row_start.append(len(self.cols))
+        self.count(cols, counts, 1)
+
+    def count(self, cols, counts, sign: int):
+        """Add (sign 1) or remove (sign -1) one idea's domains from the frequencies and pairs"""
+        cols = [col for col, weight in zip(cols, counts) if weight >= MIN_WEIGHT]
+        if not cols:
+            return
+        self.tagged += sign
+        d = self.domains
+        for k, a in enumerate(cols):
+            self.frequency[a] += sign
+            for b in cols[k + 1:]:
+                self.pairs[a * d + b] += sign
+
+    def drop(self, rows: List[int]):
+        """Remove rows and their contribution to the co-occurrence counts, keeping the others in order"""
+        paths, mtimes, sizes = [], array('q'), array('q')
+        row_start, cols, counts = array('I', [0]), array('H'), array('H')
+        start = 0
+        # Rows are copied in runs between the dropped ones; only row_start needs shifting
+        for i in sorted(rows) + [len(self.paths)]:
+            first, last = self.row_start[start], self.row_start[i]
+            shift = len(cols) - first
+            paths.extend(self.paths[start:i])
+            mtimes.extend(self.mtimes[start:i])
+            sizes.extend(self.sizes[start:i])
+            row_start.extend(end + shift for end in self.row_start[start + 1:i + 1])
+            cols.extend(self.cols[first:last])
+            counts.extend(self.counts[first:last])
+            if i < len(self.paths):
+                self.count(*self.row(i), -1)
+            start = i + 1
+        self.paths, self.mtimes, self.sizes = paths, mtimes, sizes
+        self.row_start, self.cols, self.counts = row_start, cols, counts
+
+def matrix_path(root: str) -> str:
+    """Location of the persisted matrix"""
+    return cache_path(root, MATRIX_FILE)
+
+def load_matrix(root: str, vocabulary: Vocabulary) -> Optional[Matrix]:
+    """Read the persisted matrix, None if missing, unreadable or built with another vocabulary"""
+    try:
+        with open(matrix_path(root), 'rb') as f:
+            data = f.read()
+        magic, n, nnz, d, digest = MATRIX_HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return None
+    if magic != MATRIX_MAGIC or digest != vocabulary.digest or d != len(vocabulary.names):
+        return None
+    matrix = Matrix(d, digest)
+    offset = MATRIX_HEADER.size
+    try:
+        for name, items in (('mtimes', n), ('sizes', n), ('row_start', n + 1), ('cols', nnz),
+                            ('counts', nnz), ('frequency', d), ('pairs', d * d)):
+            part = array(getattr(matrix, name).typecode)
+            end = offset + part.itemsize * items
+            part.frombytes(data[offset:end])
+            setattr(matrix, name, part)
+            offset = end
+        path_start = array('Q')
+        path_start.frombytes(data[offset:offset + 8 * (n + 1)])
+        blob = data[offset + 8 * (n + 1):]
+        if len(path_start) != n + 1 or len(blob) != path_start[-1]:
+            return None
+        matrix.paths = [blob[path_start[i]:path_start[i + 1]].decode('utf-8') for i in range(n)]
+    except (ValueError, UnicodeDecodeError):
+        return None
+    matrix.tagged = sum(1 for i in range(n) if max(matrix.row(i)[1], default=0) >= MIN_WEIGHT)
+    return matrix
+
+def save_matrix(root: str, matrix: Matrix):
+    """Atomically write the matrix"""
+    encoded = [p.encode('utf-8') for p in matrix.paths]
+    path_start = array('Q', [0])
+    for name in encoded:
+        path_start.append(path_start[-1] + len(name))
+    path = matrix_path(root)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(MATRIX_HEADER.pack(MATRIX_MAGIC, len(matrix.paths), len(matrix.cols), matrix.domains,
+                                   matrix.digest))
+        for part in (matrix.mtimes, matrix.sizes, matrix.row_start, matrix.cols, matrix.counts,
+                     matrix.frequency, matrix.pairs, path_start):
+            part.tofile(f)
+        f.write(b''.join(encoded))
+    os.replace(path + '.tmp', path)
+
+def build(root: str, vocabulary: Vocabulary,
+          previous: Optional[Matrix] = None) -> Tuple[Matrix, Dict[str, int]]:
+    """Scan ideas/ and return the matrix, re-reading only files changed since the previous one"""
+    stats = {'scanned': 0, 'parsed': 0, 'removed': 0}
+    files = sorted(iter_idea_files(root), key=lambda item: item[0])
+    stats['scanned'] = len(files)
+    known = {relpath: i for i, relpath in enumerate(previous.paths)} if previous is not None else {}
+    matrix = Matrix(len(vocabulary.names), vocabulary.digest)
+    # The previous counts are patched: rows of changed and removed ideas are subtracted, new rows added
+    if previous is not None:
+        matrix.frequency, matrix.pairs, matrix.tagged = previous.frequency, previous.pairs, previous.tagged
+    for relpath, st in files:
+        i = known.pop(relpath, None)
+        if i is not None and (previous.mtimes[i], previous.sizes[i]) == (st.st_mtime_ns, st.st_size):
+            cols, counts = previous.row(i)
+            matrix.paths.append(relpath)
+            matrix.mtimes.append(st.st_mtime_ns)
+            matrix.sizes.append(st.st_size)
+            matrix.cols.extend(cols)
+            matrix.counts.extend(counts)
+            matrix.row_start.append(len(matrix.cols))
+            continue
+        if i is not None:
+            matrix.count(*previous.row(i), -1)
+        stats['parsed'] += 1
+        tags = scan_file(root, relpath, vocabulary) or {}
+        cols = sorted(tags)
+        matrix.append(relpath, st.st_mtime_ns, st.st_size, cols, [min(tags[c], 0xFFFF) for c in cols])
+    for i in known.values():
+        matrix.count(*previous.row(i), -1)
+        stats['removed'] += 1
+    return matrix, stats
+
+def summarize(matrix: Matrix, names: List[str], limit: int = DEFAULT_LIMIT) -> Dict:
+    """Domain frequencies, every combined pair, and the most and least explored pairs"""
+    d, total = matrix.domains, matrix.tagged
+    pairs, explored, gaps = {}, [], []
+    for a in range(d):
+        for b in range(a + 1, d):
+            observed = matrix.pairs[a * d + b]
+            pair = f"{names[a]} + {names[b]}"
+            if observed:
+                pairs[pair] = observed
+            expected = matrix.frequency[a] * matrix.frequency[b] / total if total else 0.0
+            if observed:
+                explored.append((-observed, pair, observed, round(observed / expected, 2)))
+            if expected and observed < expected * UNDER_EXPLORED:
+                gaps.append((observed - expected, pair, observed, round(expected, 1)))
+    explored.sort()
+    gaps.sort()
+    return {
+        'version': SUMMARY_VERSION,
+        'documents': len(matrix.paths),
+        'tagged': total,
+        'domains': dict(sorted(((names[a], matrix.frequency[a]) for a in range(d)),
+                               key=lambda item: (-item[1], item[0]))),
+        'pairs': pairs,
+        'explored': [{'pair': pair, 'ideas': observed, 'lift': lift}
+                     for _, pair, observed, lift in explored[:limit]],
+        'unexplored': [{'pair': pair, 'ideas': observed, 'expected': expected}
+                       for _, pair, observed, expected in gaps[:limit]],
+    }
+
+def summary_path(root: str) -> str:
+    """Location of the summary the expand command reads"""
+    return cache_path(root, SUMMARY_FILE)
+
+def load_summary(root: str) -> Optional[Dict]:
+    """Read the summary, None if missing or from another version"""
+    try:
+        with open(summary_path(root), 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return summary if isinstance(summary, dict) and summary.get('version') == SUMMARY_VERSION else None
+
+def save_summary(root: str, summary: Dict):
+    """Atomically write the summary"""
+    path = summary_path(root)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=1)
+    os.replace(path + '.tmp', path)
+
+def refresh(root: str, rebuild: bool = False) -> Tuple[Dict, Dict[str, int]]:
+    """Bring the matrix and summary up to date; untouched workspaces cost one directory walk"""
+    vocabulary = load_vocabulary(root)
+    previous = None if rebuild else load_matrix(root, vocabulary)
+    matrix, stats = build(root, vocabulary, previous)
+    summary = None if previous is None or stats['parsed'] or stats['removed'] else load_summary(root)
+    if summary is None:
+        save_matrix(root, matrix)
+        summary = summarize(matrix, vocabulary.names)
+        save_summary(root, summary)
+    return summary, stats
+
+def update(root: str, paths: Iterable[str]) -> Tuple[Dict, Dict[str, int]]:
+    """Patch the matrix and summary for ideas at or below the given relative paths (a watcher's changes)"""
+    vocabulary = load_vocabulary(root)
+    matrix = load_matrix(root, vocabulary)
+    if matrix is None:
+        return refresh(root)
+    found, scopes = stat_idea_paths(root, paths)
+    stats = {'scanned': len(found), 'parsed': 0, 'removed': 0}
+    inside = set(scopes)
+    prefixes = tuple(scope + '/' for scope in scopes)
+    stale, seen = [], set()
+    for i, relpath in enumerate(matrix.paths):
+        if relpath not in inside and not relpath.startswith(prefixes):
+            continue
+        st = found.get(relpath)
+        if st is not None and (matrix.mtimes[i], matrix.sizes[i]) == (st.st_mtime_ns, st.st_size):
+            seen.add(relpath)
+            continue
+        stale.append(i)
+        stats['removed'] += st is None
+    changed = sorted(relpath for relpath in found if relpath not in seen)
+    summary = None if stale or changed else load_summary(root)
+    if summary is None:
+        matrix.drop(stale)
+        for relpath in changed:
+            st = found[relpath]
+            stats['parsed'] += 1
+            tags = scan_file(root, relpath, vocabulary) or {}
+            cols = sorted(tags)
+            matrix.append(relpath, st.st_mtime_ns, st.st_size, cols, [min(tags[c], 0xFFFF) for c in cols])
+        save_matrix(root, matrix)
+        summary = summarize(matrix, vocabulary.names)
+        save_summary(root, summary)
+    return summary, stats
+
+def partners(summary: Dict, domain: str, limit: int = 3) -> Tuple[List[str], List[str]]:
+    """(most combined, least explored) partner domains of one domain"""
+    counts = {}
+    for pair, observed in summary['pairs'].items():
+        a, b = pair.split(' + ')
+        if domain in (a, b):
+            counts[b if a == domain else a] = observed
+    frequency, total = summary['domains'], summary['tagged'] or 1
+    others = [name for name in frequency if name != domain]
+    common = sorted((name for name in others if counts.get(name)), key=lambda name: (-counts[name], name))
+    # Partners the workspace uses a lot but rarely with this domain come first
+    gaps = sorted(others, key=lambda name: (counts.get(name, 0) - frequency[domain] * frequency[name] / total,
+                                            name))
+    return common[:limit], [name for name in gaps if name not in common[:limit]][:limit]
+
+def suggest(root: str, summary: Dict, text: str, limit: int = 3) -> str:
+    """Markdown lines naming an idea's domains, their explored pairings and unexplored ones"""
+    vocabulary = load_vocabulary(root)
+    tags = tag_document(text.encode('utf-8'), '', vocabulary) or {}
+    domains = [vocabulary.names[c] for c in sorted(tags, key=lambda c: (-tags[c], c))
+               if tags[c] >= MIN_WEIGHT and vocabulary.names[c] in summary['domains']]
+    lines = [f"Domains of this idea: {', '.join(domains) if domains else 'none recognized'}"]
+    for domain in domains:
+        common, gaps = partners(summary, domain, limit)
+        lines.append(f"- {domain}: already combined with {', '.join(common) or 'nothing yet'}; "
+                     f"unexplored: {', '.join(gaps)}")
+    if summary['unexplored']:
+        lines.append("Unexplored across the workspace: "
+                     + ', '.join(item['pair'] for item in summary['unexplored'][:limit * 2]))
+    return '\n'.join(lines)
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit domains', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('idea', nargs='?', help="Suggest pairings for this idea file")
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT,
+                        help=f"Pairs to list in each ranking (default: {DEFAULT_LIMIT})")
+    parser.add_argument('--no-refresh', action='store_true', help="Use the stored summary without rescanning")
+    parser.add_argument('--rebuild', action='store_true', help="Re-read every file instead of changed ones")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    stats = {}
+    if args.no_refresh:
+        summary = load_summary(root)
+        if summary is None:
+            print("❌ No domain summary yet: run without --no-refresh")
+            return 1
+    else:
+        summary, stats = refresh(root, args.rebuild)
+
+    if args.idea:
+        relpath = resolve_idea(root, os.path.relpath(os.path.abspath(args.idea), root)
+                               if os.path.exists(args.idea) else args.idea)
+        try:
+            with open(os.path.join(root, relpath), 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            print(f"❌ Idea file not found: {args.idea}")
+            return 1
+        result = suggest(root, summary, text, max(args.limit // 3, 3))
+        if args.json:
+            print(json.dumps({'idea': relpath, 'suggestions': result.splitlines()}, ensure_ascii=False,
+                             indent=2))
+        else:
+            print(f"🧭 {relpath}")
+            print(result)
+        return 0
+
+    if args.limit != DEFAULT_LIMIT:
+        vocabulary = load_vocabulary(root)
+        matrix = load_matrix(root, vocabulary)
+        if matrix is not None:
+            summary = summarize(matrix, vocabulary.names, args.limit)
+    if args.json:
+        public = {key: value for key, value in summary.items() if key != 'pairs'}
+        public.update(stats)
+        print(json.dumps(public, ensure_ascii=False, indent=2))
+        return 0
+    used = sum(1 for count in summary['domains'].values() if count)
+    print(f"🧭 {summary['tagged']} of {summary['documents']} ideas tagged with {used} domains, "
+          f"{len(summary['pairs'])} pairs combined")
+    if stats:
+        print(f"ℹ️  Scanned {stats['scanned']} files, re-read {stats['parsed']}")
+    if summary['explored']:
+        print("   Most explored:")
+        for item in summary['explored']:
+            print(f"   {item['ideas']:>7}  {item['pair']} (lift {item['lift']})")
+    if summary['unexplored']:
+        print("   Unexplored (fewer ideas than chance would give):")
+        for item in summary['unexplored']:
+            print(f"   {item['ideas']:>7}  {item['pair']} (expected {item['expected']})")
+    else:
+        print("✅ No under-explored pairs among the domains in use")
+    return 0
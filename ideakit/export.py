@@ -0,0 +1,381 @@
+"""
+IdeaKit columnar export
+Streams ideas/ into one memory-mappable column file for notebooks, and reads it back as zero-copy views
+Run with: python3 -m ideakit export [OPTIONS]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import shutil
+import struct
+import tempfile
+import time
+from array import array
+from collections import deque
+from datetime import date
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .parser import CRITERIA, parse_idea_bytes
+from .workspace import CACHE_DIR, add_root_argument, find_root, iter_idea_files, status_of
+
+EXPORT_FILE = 'ideas.ikc'
+MAGIC = b'IKC1'
+# magic, format version, row count, directory offset, directory length
+HEADER = struct.Struct('<4sIQQQ')
+FORMAT_VERSION = 1
+ALIGN = 8
+# Files per parse chunk, and chunks queued per worker process
+CHUNK_FILES = 512
+CHUNKS_PER_WORKER = 4
+# Rows buffered in memory before the numeric columns are appended to their spill files
+FLUSH_ROWS = 65536
+
+NO_DATE = -2 ** 31
+NO_SCORE = -1
+EPOCH = date(1970, 1, 1).toordinal()
+# Bytes twin of parser.FOOTER_RE, applied to the last section without decoding it
+FOOTER_RE = re.compile(rb'\n*---\s*\n\*Created with IdeaKit[^\n]*\*\s*$')
+CRITERION_COLUMNS = tuple('criterion_' + name.lower().replace(' ', '_') for name in CRITERIA)
+
+def date_days(value: Optional[str]) -> int:
+    """Days since 1970-01-01 of an ISO date, NO_DATE when missing or invalid"""
+    try:
+        return date(*map(int, value.split('-'))).toordinal() - EPOCH
+    except (AttributeError, ValueError):
+        return NO_DATE
+
+class NumberColumn:
+    """Fixed-width column appended through a small in-memory buffer"""
+
+    def __init__(self, code: str, spill: BinaryIO):
+        self.code = code
+        self.buffer = array(code)
+        self.spill = spill
+        self.count = 0
+        # The writer flushes every FLUSH_ROWS rows, so appending is the bare array method
+        self.append = self.buffer.append
+
+    def flush(self):
+        self.count += len(self.buffer)
+        self.buffer.tofile(self.spill)
+        del self.buffer[:]
+
+class StringColumn:
+    """Offset-indexed string table: a uint64 end offset per value and one UTF-8 blob"""
+
+    def __init__(self, blob: BinaryIO, offsets: BinaryIO):
+        self.blob = blob
+        self.size = 0
+        self.ends = NumberColumn('Q', offsets)
+
+    def append(self, value: bytes):
+        self.size += self.blob.write(value)
+        self.ends.append(self.size)
+
+class Categories:
+    """Dictionary-encoded column: a small code per row and the distinct labels"""
+
+    def __init__(self, code: str, spill: BinaryIO):
+        self.codes = NumberColumn(code, spill)
+        self.labels = {}  # type: Dict[str, int]
+
+    def append(self, label: str):
+        self.codes.append(self.labels.setdefault(label, len(self.labels)))
+
+class ExportWriter:
+    """Streams rows into per-column spill files, then lays the columns out in one file"""
+
+    def __init__(self, path: str, sections: bool = True):
+        self.path = path
+        self.scratch = tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(path)))
+        self.spills = []
+        self.rows = 0
+        # Capture dates repeat across many ideas; converted once each
+        self.dates = {}  # type: Dict[Optional[str], int]
+        self.numbers = {'mtime': NumberColumn('q', self.spill()), 'captured': NumberColumn('i', self.spill()),
+                        'score': NumberColumn('b', self.spill()),
+                        'questions_open': NumberColumn('H', self.spill()),
+                        'questions_answered': NumberColumn('H', self.spill())}
+        for name in CRITERION_COLUMNS:
+            self.numbers[name] = NumberColumn('b', self.spill())
+        self.strings = {'path': StringColumn(self.spill(), self.spill()),
+                        'title': StringColumn(self.spill(), self.spill())}
+        self.categories = {'status': Categories('B', self.spill()), 'stage': Categories('H', self.spill())}
+        self.sections = None
+        if sections:
+            # Section bodies of all rows in one table; section_start slices it per row
+            self.section_names = Categories('H', self.spill())
+            self.sections = StringColumn(self.spill(), self.spill())
+            self.section_start = NumberColumn('Q', self.spill())
+            self.section_count = 0
+
+    def spill(self) -> BinaryIO:
+        f = open(os.path.join(self.scratch.name, str(len(self.spills))), 'w+b')
+        self.spills.append(f)
+        return f
+
+    def add(self, row: Tuple):
+        """Append one parsed idea file (see parse_row)"""
+        relpath, mtime_ns, captured, score, questions_open, questions_answered, criteria, title, stage, bodies = row
+        self.numbers['mtime'].append(mtime_ns)
+        days = self.dates.get(captured)
+        if days is None:
+            days = self.dates[captured] = date_days(captured)
+        self.numbers['captured'].append(days)
+        self.numbers['score'].append(NO_SCORE if score is None else max(-128, min(127, score)))
+        self.numbers['questions_open'].append(min(questions_open, 0xFFFF))
+        self.numbers['questions_answered'].append(min(questions_answered, 0xFFFF))
+        for name, value in zip(CRITERION_COLUMNS, criteria or (0,) * len(CRITERIA)):
+            self.numbers[name].append(max(-128, min(127, value)))
+        self.strings['path'].append(relpath.encode('utf-8'))
+        self.strings['title'].append(title.encode('utf-8'))
+        self.categories['status'].append(status_of(relpath))
+        self.categories['stage'].append(stage)
+        if self.sections is not None:
+            self.section_start.append(self.section_count)
+            for name, body in bodies:
+                self.section_names.append(name)
+                self.sections.append(body)
+            self.section_count += len(bodies)
+        self.rows += 1
+        if self.rows % FLUSH_ROWS == 0:
+            self.flush()
+
+    def flush(self):
+        """Move the buffered numbers to their spill files"""
+        for column in self.numbers.values():
+            column.flush()
+        for column in self.strings.values():
+            column.ends.flush()
+        for column in self.categories.values():
+            column.codes.flush()
+        if self.sections is not None:
+            for column in (self.section_names.codes, self.sections.ends, self.section_start):
+                column.flush()
+
+    def finish(self) -> int:
+        """Write the column file atomically and return its size"""
+        columns = []  # (name, typecode, spill file)
+        for name, column in self.numbers.items():
+            columns.append((name, column.code, column))
+        for name, column in self.strings.items():
+            columns.append((name + '.ends', 'Q', column.ends))
+            columns.append((name + '.blob', 'B', column))
+        for name, column in self.categories.items():
+            columns.append((name, column.codes.code, column.codes))
+        labels = {name: sorted(column.labels, key=column.labels.get) for name, column in self.categories.items()}
+        if self.sections is not None:
+            self.section_start.append(self.section_count)
+            columns += [('section_start', 'Q', self.section_start),
+                        ('section_name', self.section_names.codes.code, self.section_names.codes),
+                        ('section.ends', 'Q', self.sections.ends), ('section.blob', 'B', self.sections)]
+            labels['section_name'] = sorted(self.section_names.labels, key=self.section_names.labels.get)
+
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        directory = {}
+        with open(tmp, 'wb') as out:
+            out.write(bytes(HEADER.size))
+            for name, code, column in columns:
+                if isinstance(column, StringColumn):
+                    spill, count = column.blob, column.size
+                else:
+                    column.flush()
+                    spill, count = column.spill, column.count
+                out.write(bytes(-out.tell() % ALIGN))
+                directory[name] = {'type': code, 'offset': out.tell(), 'count': count}
+                spill.seek(0)
+                shutil.copyfileobj(spill, out, 1 << 20)
+            meta = json.dumps({'columns': directory, 'labels': labels, 'criteria': list(CRITERIA),
+                               'no_date': NO_DATE, 'no_score': NO_SCORE}).encode('utf-8')
+            position = out.tell()
+            out.write(meta)
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.rows, position, len(meta)))
+        os.replace(tmp, self.path)
+        return os.path.getsize(self.path)
+
+    def close(self):
+        """Drop the spill files"""
+        for f in self.spills:
+            f.close()
+        self.scratch.cleanup()
+
+def parse_row(root: str, relpath: str, mtime_ns: int, sections: bool) -> Optional[Tuple]:
+    """Read and parse one idea file into the values of its row, None if it cannot be read"""
+    try:
+        with open(os.path.join(root, relpath), 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    idea = parse_idea_bytes(data, relpath)
+    bodies = []
+    if sections:
+        last = len(idea.names) - 1
+        for i, name in enumerate(idea.names):
+            body = data[idea.offsets[2 * i]:idea.offsets[2 * i + 1]]
+            bodies.append((name, (FOOTER_RE.sub(b'', body) if i == last else body).strip()))
+    return (relpath, mtime_ns, idea.captured, idea.score, idea.questions_open, idea.questions_answered,
+            idea.criteria, idea.title, idea.stage, bodies)
+
+def parse_chunk(root: str, items: List[Tuple[str, int]], sections: bool) -> List[Tuple]:
+    """Parse a chunk of (relpath, mtime_ns) in a worker process"""
+    rows = (parse_row(root, relpath, mtime_ns, sections) for relpath, mtime_ns in items)
+    return [row for row in rows if row is not None]
+
+def iter_chunks(root: str) -> Iterator[List[Tuple[str, int]]]:
+    """Walk ideas/ lazily in chunks of (relpath, mtime_ns)"""
+    chunk = []
+    for relpath, st in iter_idea_files(root):
+        chunk.append((relpath, st.st_mtime_ns))
+        if len(chunk) == CHUNK_FILES:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def export(root: str, path: str, sections: bool = True, workers: Optional[int] = None) -> Dict[str, int]:
+    """Stream every idea file into a column file, parsing chunks in worker processes when there are CPUs"""
+    workers = workers or os.cpu_count() or 1
+    writer = ExportWriter(path, sections)
+    try:
+        if workers < 2:
+            for chunk in iter_chunks(root):
+                for row in parse_chunk(root, chunk, sections):
+                    writer.add(row)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            # A bounded window of chunks in flight keeps rows in order and memory flat
+            pending = deque()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for chunk in iter_chunks(root):
+                    pending.append(pool.submit(parse_chunk, root, chunk, sections))
+                    if len(pending) >= workers * CHUNKS_PER_WORKER:
+                        for row in pending.popleft().result():
+                            writer.add(row)
+                while pending:
+                    for row in pending.popleft().result():
+                        writer.add(row)
+        size = writer.finish()
+    finally:
+        writer.close()
+    return {'rows': writer.rows, 'bytes': size}
+
+class Strings:
+    """Zero-copy view of a string table"""
+
+    def __init__(self, ends: memoryview, blob: memoryview):
+        self.ends = ends
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def raw(self, i: int) -> memoryview:
+        """The UTF-8 bytes of value i, without copying"""
+        return self.blob[self.ends[i - 1] if i else 0:self.ends[i]]
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self.raw(i)).decode('utf-8')
+
+class IdeaTable:
+    """Read-only column file; a column is mapped in only when it is first read.
+
+    Numeric columns are memoryviews cast to their type, usable as numpy.frombuffer(view, view.format)
+    without a copy. Dates are days since 1970-01-01 (no_date when missing), scores are -1 when missing."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.rows, position, length = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.map.close()
+            raise ValueError(f"{path} is not an IdeaKit export (version {FORMAT_VERSION})")
+        meta = json.loads(self.map[position:position + length].decode('utf-8'))
+        self.directory = meta['columns']
+        self.labels = meta['labels']
+        self.no_date = meta['no_date']
+        self.no_score = meta['no_score']
+        self.views = {}  # type: Dict[str, memoryview]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def columns(self) -> List[str]:
+        """Names accepted by column(), strings() and categories()"""
+        names = {name.rsplit('.', 1)[0] for name in self.directory}
+        return sorted(names - {'section', 'section_start', 'section_name'})
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy typed view of a numeric or code column"""
+        view = self.views.get(name)
+        if view is None:
+            entry = self.directory[name]
+            size = array(entry['type']).itemsize * entry['count']
+            with memoryview(self.map) as whole:
+                view = whole[entry['offset']:entry['offset'] + size].cast(entry['type'])
+            self.views[name] = view
+        return view
+
+    def strings(self, name: str) -> Strings:
+        """Zero-copy view of the path, title or section string table"""
+        return Strings(self.column(name + '.ends'), self.column(name + '.blob'))
+
+    def categories(self, name: str) -> List[str]:
+        """Labels of a dictionary-encoded column (status, stage), indexed by code"""
+        return self.labels[name]
+
+    def sections(self, row: int) -> Dict[str, str]:
+        """Section bodies of one row"""
+        if 'section_start' not in self.directory:
+            return {}
+        starts, names, bodies = self.column('section_start'), self.column('section_name'), self.strings('section')
+        labels = self.labels['section_name']
+        return {labels[names[i]]: bodies[i] for i in range(starts[row], starts[row + 1])}
+
+    def close(self):
+        """Release the views and the map"""
+        for view in self.views.values():
+            view.release()
+        self.views = {}
+        self.map.close()
+
+    def __enter__(self) -> 'IdeaTable':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_table(path: str) -> IdeaTable:
+    """Open an export for reading, e.g. open_table('.ideakit/cache/ideas.ikc').column('score')"""
+    return IdeaTable(path)
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit export', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('-o', '--output', help=f"Column file to write (default: {CACHE_DIR}/{EXPORT_FILE})")
+    parser.add_argument('--no-sections', action='store_true', help="Leave section bodies out of the file")
+    parser.add_argument('--workers', type=int, help="Parser processes (default: CPU count)")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    output = args.output or os.path.join(root, CACHE_DIR, EXPORT_FILE)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    started = time.perf_counter()
+    try:
+        stats = export(root, output, not args.no_sections, args.workers)
+    except OSError as e:
+        print(f"❌ Error: cannot write {output}: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+    if args.json:
+        print(json.dumps(dict(stats, path=output, seconds=round(elapsed, 3))))
+        return 0
+    print(f"✅ Exported {stats['rows']} ideas to {output} ({stats['bytes'] / 2 ** 20:.1f} MB, {elapsed:.2f}s)")
+    print("ℹ️  Read it with: from ideakit.export import open_table")
+    return 0
@@ -0,0 +1,327 @@
+"""
+IdeaKit bulk import
+Streams CSV/TSV/JSONL records into idea files with a resumable checkpoint
+Run with: python3 -m ideakit import FILE [OPTIONS]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .new import DEFAULT_STATUS, DEFAULT_TEMPLATE, IdeaWriter
+from .parser import CRITERIA, parse_date
+from .templates import load_template
+from .workspace import STATUS_FOLDERS, add_root_argument, cache_path, find_root
+
+CHECKPOINT_VERSION = 1
+# Records rendered and written per checkpoint; also bounds memory use
+CHUNK = 1000
+READ_BUFFER = 1 << 20
+FINGERPRINT_BYTES = 1 << 16
+PROGRESS_EVERY = 50000
+TITLE_LENGTH = 60
+FORMATS = {'.csv': 'csv', '.tsv': 'tsv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.json': 'jsonl'}
+
+# Normalized column name -> seed field
+ALIASES = {
+    'title': 'title', 'name': 'title', 'idea title': 'title',
+    'idea': 'idea', 'raw idea': 'idea', 'description': 'idea', 'summary': 'idea',
+    'problem': 'problem', 'opportunity': 'problem', 'core problem': 'problem',
+    'core problem/opportunity': 'problem',
+    'vision': 'vision', 'initial vision': 'vision',
+    'captured': 'date', 'date': 'date', 'created': 'date',
+    'questions': 'questions', 'scores': 'scores', 'reasons': 'reasons',
+}
+for _name in CRITERIA:
+    ALIASES[_name.lower()] = ALIASES[_name.lower() + ' score'] = 'score:' + _name
+    ALIASES[_name.lower() + ' reason'] = 'reason:' + _name
+
+def normalize(column: str) -> str:
+    """Lower-case a column name and collapse separators"""
+    return re.sub(r'[\s_\-]+', ' ', str(column).strip().lower())
+
+def parse_score_value(value) -> Optional[int]:
+    """Read a 1-10 score from values like 8, '8' or '8/10'"""
+    match = re.match(r'\s*(\d+(?:\.\d+)?)', str(value))
+    if not match:
+        return None
+    score = int(float(match.group(1)))
+    return score if 1 <= score <= 10 else None
+
+class ColumnMap:
+    """Maps record columns to idea seed fields, with --map overrides"""
+
+    def __init__(self, overrides: Optional[Dict[str, str]] = None):
+        self.overrides = {normalize(k): v for k, v in (overrides or {}).items()}
+        self.cache = {}
+
+    def field(self, column: str) -> Optional[str]:
+        """Return the seed field of a column, None to ignore it"""
+        if column not in self.cache:
+            key = normalize(column)
+            field = self.overrides.get(key, ALIASES.get(key))
+            self.cache[column] = None if field == 'ignore' else field
+        return self.cache[column]
+
+    def seed(self, record: Dict) -> Optional[Dict]:
+        """Convert one record to a seed for IdeaWriter, None if it has no title or idea"""
+        seed = {'scores': {}, 'reasons': {}, 'sections': {}}
+        for column, value in record.items():
+            if value is None or value == '':
+                continue
+            field = self.field(column)
+            if field is None:
+                continue
+            kind, _, name = field.partition(':')
+            if kind in ('scores', 'reasons') and isinstance(value, dict):
+                for criterion, item in value.items():
+                    mapped = self.field(f"{criterion} {kind[:-1]}")
+                    if mapped:
+                        self.store(seed, mapped, item)
+            else:
+                self.store(seed, field, value)
+        if not seed.get('title'):
+            text = seed.get('idea', '').strip()
+            if not text:
+                return None
+            seed['title'] = text.splitlines()[0][:TITLE_LENGTH].strip()
+        return seed
+
+    @staticmethod
+    def store(seed: Dict, field: str, value):
+        """Store one value under its seed field"""
+        kind, _, name = field.partition(':')
+        if kind == 'score':
+            score = parse_score_value(value)
+            if score is not None:
+                seed['scores'][name] = score
+        elif kind == 'reason':
+            seed['reasons'][name] = str(value).strip()
+        elif kind == 'section':
+            seed['sections'][name] = str(value).strip()
+        elif kind == 'questions':
+            items = value if isinstance(value, list) else re.split(r'\s*[;|\n]\s*', str(value))
+            seed['questions'] = [str(q).strip() for q in items if str(q).strip()]
+        elif kind == 'date':
+            seed['date'] = parse_date(str(value))
+        elif kind in ('title', 'idea', 'problem', 'vision', 'recap', 'based_on'):
+            seed[kind] = str(value).strip()
+
+def detect_format(path: str) -> str:
+    """Guess the record format from the file extension"""
+    return FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+def fingerprint(path: str, length: int) -> str:
+    """Hash the start of a file so a checkpoint is never applied to a different source"""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+def read_header(path: str, fmt: str) -> Tuple[Optional[List[str]], int]:
+    """Return the CSV/TSV header and the offset of the first record"""
+    if fmt == 'jsonl':
+        return None, 0
+    with open(path, 'rb') as f:
+        records = read_records(f, fmt, 0, None)
+        header, offset = next(records, ([], 0))
+        return [str(column) for column in header], offset
+
+def read_records(f, fmt: str, offset: int, header: Optional[List[str]]) -> Iterator[Tuple[object, int]]:
+    """Yield (record, offset after it) from a binary file at offset; {} for blank lines, None if invalid"""
+    position = offset
+
+    def lines():
+        nonlocal position
+        for raw in f:
+            if position == 0 and raw.startswith(b'\xef\xbb\xbf'):
+                position += 3
+                raw = raw[3:]
+            position += len(raw)
+            yield raw.decode('utf-8', 'replace')
+
+    if fmt == 'jsonl':
+        for line in lines():
+            if not line.strip():
+                yield {}, position
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield (record if isinstance(record, dict) else None), position
+        return
+
+    # csv.reader pulls exactly the lines of one record, so position stays exact
+    reader = csv.reader(lines(), delimiter='\t' if fmt == 'tsv' else ',')
+    for row in reader:
+        if header is None:
+            yield row, position
+        else:
+            yield (dict(zip(header, row)) if any(row) else {}), position
+
+def checkpoint_path(root: str, source: str) -> str:
+    """Return the checkpoint file of a source file"""
+    digest = hashlib.sha1(os.path.abspath(source).encode('utf-8')).hexdigest()[:12]
+    return cache_path(root, f"import-{digest}.json")
+
+def load_checkpoint(path: str) -> Optional[Dict]:
+    """Read a checkpoint, None if missing or from another version"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return checkpoint if checkpoint.get('version') == CHECKPOINT_VERSION else None
+
+def save_checkpoint(path: str, checkpoint: Dict):
+    """Atomically replace the checkpoint file"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+def same_content(path: str, data: bytes) -> bool:
+    """Check whether a file exists with exactly this content"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+def import_ideas(root: str, source: str, fmt: Optional[str] = None, mapping: Optional[Dict[str, str]] = None,
+                 template: str = DEFAULT_TEMPLATE, status: str = DEFAULT_STATUS, workers: int = 8,
+                 restart: bool = False, progress=None) -> Dict:
+    """Import records from source, resuming from its checkpoint; returns the checkpoint plus 'added'"""
+    fmt = fmt or detect_format(source)
+    path = checkpoint_path(root, source)
+    report = progress or (lambda message: None)
+    size = os.path.getsize(source)
+    checkpoint = None if restart else load_checkpoint(path)
+    if checkpoint and (size < checkpoint['offset']
+                       or checkpoint['fingerprint'] != fingerprint(source, checkpoint['fingerprint_bytes'])
+                       or checkpoint['format'] != fmt or checkpoint['status'] != status):
+        raise ValueError(f"checkpoint {path} belongs to a different source or options, use --restart")
+    if checkpoint and checkpoint['done'] and size == checkpoint['offset']:
+        return dict(checkpoint, added=0)
+    if checkpoint is None:
+        header, offset = read_header(source, fmt)
+        checkpoint = {'version': CHECKPOINT_VERSION, 'source': os.path.abspath(source),
+                      'fingerprint': fingerprint(source, min(size, FINGERPRINT_BYTES)),
+                      'fingerprint_bytes': min(size, FINGERPRINT_BYTES), 'format': fmt, 'status': status,
+                      'header': header, 'started': time.time(), 'offset': offset,
+                      'imported': 0, 'skipped': 0, 'pending': [], 'done': False}
+    elif checkpoint['imported'] or checkpoint['pending']:
+        report(f"ℹ️  Resuming after {checkpoint['imported']} imported records")
+
+    checkpoint['done'] = False
+    before = checkpoint['imported']
+    columns = ColumnMap(mapping)
+    writer = IdeaWriter(root, load_template(root, template), status, checkpoint['started'])
+    pending = checkpoint['pending']
+    writer.reserve(pending)
+    next_report = (checkpoint['imported'] // PROGRESS_EVERY + 1) * PROGRESS_EVERY
+
+    with open(source, 'rb', buffering=READ_BUFFER) as f, ThreadPoolExecutor(max_workers=workers) as pool:
+        f.seek(checkpoint['offset'])
+        records = read_records(f, fmt, checkpoint['offset'], checkpoint['header'])
+        while True:
+            chunk, end, skipped = [], checkpoint['offset'], 0
+            for record, end in records:
+                if record == {}:
+                    continue
+                seed = columns.seed(record) if record is not None else None
+                if seed is None:
+                    skipped += 1
+                else:
+                    chunk.append(seed)
+                if len(chunk) + skipped >= CHUNK:
+                    break
+            if end == checkpoint['offset']:
+                break
+
+            # A resumed chunk reuses the names recorded before the interruption
+            names = pending if len(pending) == len(chunk) else [None] * len(chunk)
+            prepared = [writer.prepare(seed, name) for seed, name in zip(chunk, names)]
+            checkpoint['pending'] = [relpath.rsplit('/', 1)[1] for relpath, _, _ in prepared]
+            save_checkpoint(path, checkpoint)
+
+            def write(item):
+                relpath, data, _ = item
+                if pending and same_content(os.path.join(root, relpath), data):
+                    return relpath
+                return writer.create(relpath, data)
+
+            for (_, _, entry), relpath in zip(prepared, pool.map(write, prepared)):
+                entry['path'] = relpath
+                writer.pending_log.append(entry)
+            pending = []
+            checkpoint.update(offset=end, pending=[], imported=checkpoint['imported'] + len(chunk),
+                              skipped=checkpoint['skipped'] + skipped)
+            # Checkpoint before the change log: a lost log entry only costs a status rescan
+            save_checkpoint(path, checkpoint)
+            writer.flush()
+            if checkpoint['imported'] >= next_report:
+                report(f"   ... {checkpoint['imported']} imported")
+                next_report += PROGRESS_EVERY
+
+    checkpoint['done'] = True
+    save_checkpoint(path, checkpoint)
+    checkpoint['added'] = checkpoint['imported'] - before
+    return checkpoint
+
+def parse_mapping(items: List[str]) -> Dict[str, str]:
+    """Parse --map 'Column=field' options"""
+    fields = {'title', 'idea', 'problem', 'vision', 'date', 'questions', 'recap', 'based_on', 'ignore'}
+    mapping = {}
+    for item in items:
+        column, _, field = item.partition('=')
+        kind, _, name = field.strip().partition(':')
+        valid = (field.strip() in fields or kind == 'section' and name
+                 or kind in ('score', 'reason') and name in CRITERIA)
+        if not column.strip() or not valid:
+            raise ValueError(f"invalid mapping '{item}' (expected COLUMN=FIELD, fields: "
+                             f"{', '.join(sorted(fields))}, score:<Criterion>, reason:<Criterion>, "
+                             f"section:<Name>)")
+        mapping[column.strip()] = field.strip()
+    return mapping
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit import', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('source', help="CSV, TSV or JSON-lines file")
+    parser.add_argument('--format', choices=['csv', 'tsv', 'jsonl'], help="Record format (default: from extension)")
+    parser.add_argument('--map', action='append', default=[], metavar='COLUMN=FIELD',
+                        help="Map a column to title, idea, problem, vision, date, questions, "
+                             "score:<Criterion>, reason:<Criterion>, section:<Name> or ignore")
+    parser.add_argument('--status', default=DEFAULT_STATUS, choices=STATUS_FOLDERS,
+                        help="Status folder (default: active)")
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE, help="Template (default: idea-seed)")
+    parser.add_argument('--workers', type=int, default=8, help="Parallel file writers (default: 8)")
+    parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and import from the start")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    started = time.perf_counter()
+    try:
+        mapping = parse_mapping(args.map)
+        result = import_ideas(root, args.source, args.format, mapping, args.template, args.status,
+                              max(1, args.workers), args.restart, progress=print)
+    except KeyboardInterrupt:
+        print("⚠️  Interrupted, run the same command again to resume")
+        return 130
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ Imported {result['added']} ideas into {args.status}/ in {elapsed:.2f}s "
+          f"({result['imported']} in total from {os.path.basename(args.source)})")
+    if result['skipped']:
+        print(f"⚠️  Skipped {result['skipped']} records without a title or idea")
+    return 0
@@ -0,0 +1,248 @@
+"""
+IdeaKit idea index
+Persistent SQLite index of the ideas/ tree, refreshed incrementally from mtime/size
+Run with: python3 -m ideakit index [refresh|search] [OPTIONS]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .parser import parse_idea_bytes
+from .workspace import add_root_argument, cache_path, find_root, iter_idea_files, stat_idea_paths, status_of
+
+INDEX_FILE = 'index.db'
+SCHEMA_VERSION = '2'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS ideas (
+    path TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    title TEXT NOT NULL,
+    captured TEXT,
+    stage TEXT,
+    score INTEGER,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ideas_status ON ideas (status);
+CREATE INDEX IF NOT EXISTS ideas_captured ON ideas (captured);
+CREATE TABLE IF NOT EXISTS sections (
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_path ON sections (path);
+"""
+
+# Full-text rows share their rowid with the ideas table
+FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS ideas_fts USING fts5(title, body)"
+
+def has_fts(conn: sqlite3.Connection) -> bool:
+    """Check whether the full-text table is available"""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'ideas_fts'").fetchone()
+    return row is not None
+
+def open_index(root: str) -> sqlite3.Connection:
+    """Open (and create if needed) the workspace index"""
+    conn = sqlite3.connect(cache_path(root, INDEX_FILE))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    row = None
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+    except sqlite3.OperationalError:
+        pass
+    if row is not None and row[0] != SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS ideas; DROP TABLE IF EXISTS sections; "
+                           "DROP TABLE IF EXISTS ideas_fts;")
+    conn.executescript(SCHEMA)
+    try:
+        conn.execute(FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5: keyword search falls back to LIKE
+        pass
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (SCHEMA_VERSION,))
+    conn.commit()
+    return conn
+
+def generation(conn: sqlite3.Connection) -> int:
+    """Return a counter that changes whenever refresh() modifies the index"""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+    return int(row[0]) if row else 0
+
+def refresh(root: str, conn: Optional[sqlite3.Connection] = None) -> Dict[str, int]:
+    """Re-index only files whose mtime or size changed, and drop deleted files"""
+    own = conn is None
+    conn = conn or open_index(root)
+    known = {path: (mtime, size) for path, mtime, size in
+             conn.execute("SELECT path, mtime_ns, size FROM ideas")}
+    stats = {'scanned': 0, 'updated': 0, 'removed': 0}
+
+    changed = []
+    for relpath, st in iter_idea_files(root):
+        stats['scanned'] += 1
+        if known.pop(relpath, None) != (st.st_mtime_ns, st.st_size):
+            changed.append((relpath, st))
+    write_changes(root, conn, list(known), changed, stats)
+
+    if own:
+        conn.close()
+    return stats
+
+def update(root: str, paths: Iterable[str], conn: Optional[sqlite3.Connection] = None) -> Dict[str, int]:
+    """Re-index only ideas at or below the given relative paths (what a watcher saw change)"""
+    own = conn is None
+    conn = conn or open_index(root)
+    found, scopes = stat_idea_paths(root, paths)
+    known = {}
+    for scope in scopes:
+        # Rows of the path itself and, for a folder, of everything below it
+        known.update((path, (mtime, size)) for path, mtime, size in conn.execute(
+            "SELECT path, mtime_ns, size FROM ideas WHERE path = ? OR (path > ? AND path < ?)",
+            (scope, scope + '/', scope + '0')))
+    stats = {'scanned': len(found), 'updated': 0, 'removed': 0}
+    changed = [(relpath, st) for relpath, st in sorted(found.items())
+               if known.pop(relpath, None) != (st.st_mtime_ns, st.st_size)]
+    if known or changed:
+        write_changes(root, conn, list(known), changed, stats)
+
+    if own:
+        conn.close()
+    return stats
+
+def write_changes(root: str, conn: sqlite3.Connection, removed: List[str],
+                  changed: List[Tuple[str, os.stat_result]], stats: Dict[str, int]):
+    """Drop removed ideas and (re)insert changed ones in one transaction"""
+    fts = has_fts(conn)
+    with conn:
+        stale = removed + [relpath for relpath, _ in changed]
+        for relpath in stale:
+            if fts:
+                conn.execute("DELETE FROM ideas_fts WHERE rowid = "
+                             "(SELECT rowid FROM ideas WHERE path = ?)", (relpath,))
+            conn.execute("DELETE FROM ideas WHERE path = ?", (relpath,))
+            conn.execute("DELETE FROM sections WHERE path = ?", (relpath,))
+        stats['removed'] = len(removed)
+
+        for relpath, st in changed:
+            try:
+                with open(os.path.join(root, relpath), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue
+            idea = parse_idea_bytes(data, relpath)
+            sections = idea.sections(data)
+            cursor = conn.execute("INSERT INTO ideas VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                  (relpath, status_of(relpath), idea.title, idea.captured,
+                                   idea.stage, idea.score, st.st_mtime_ns, st.st_size))
+            conn.executemany("INSERT INTO sections VALUES (?, ?, ?)",
+                             [(relpath, name, body) for name, body in sections.items()])
+            if fts:
+                conn.execute("INSERT INTO ideas_fts (rowid, title, body) VALUES (?, ?, ?)",
+                             (cursor.lastrowid, idea.title, '\n'.join(sections.values())))
+            stats['updated'] += 1
+
+        if stats['updated'] or stats['removed']:
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)",
+                         (str(generation(conn) + 1),))
+
+def rename(conn: sqlite3.Connection, moves: List[Tuple[str, str]]) -> int:
+    """Point rows at renamed files so refresh() does not re-parse them (renames keep mtime and size)"""
+    renamed = 0
+    with conn:
+        for old, new in moves:
+            cursor = conn.execute("UPDATE ideas SET path = ?, status = ? WHERE path = ?",
+                                  (new, status_of(new), old))
+            if cursor.rowcount:
+                conn.execute("UPDATE sections SET path = ? WHERE path = ?", (new, old))
+                renamed += 1
+        if renamed:
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)",
+                         (str(generation(conn) + 1),))
+    return renamed
+
+def fts_query(keyword: str) -> str:
+    """Quote each term so user input is never parsed as FTS syntax"""
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in keyword.split())
+
+def search(conn: sqlite3.Connection, keyword: Optional[str] = None, status: Optional[str] = None,
+           since: Optional[str] = None, until: Optional[str] = None,
+           limit: int = 50) -> List[Dict]:
+    """Query the index by keyword, status folder and capture date range"""
+    where = []
+    params = []
+    if keyword:
+        if has_fts(conn):
+            where.append("rowid IN (SELECT rowid FROM ideas_fts WHERE ideas_fts MATCH ?)")
+            params.append(fts_query(keyword))
+        else:
+            where.append("(title LIKE ? OR path IN (SELECT path FROM sections WHERE body LIKE ?))")
+            params.extend(['%' + keyword + '%'] * 2)
+    if status:
+        where.append("status = ?")
+        params.append(status)
+    if since:
+        where.append("captured >= ?")
+        params.append(since)
+    if until:
+        where.append("captured <= ?")
+        params.append(until)
+
+    sql = "SELECT path, status, title, captured, stage, score FROM ideas"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY captured DESC, path LIMIT ?"
+    params.append(limit)
+    columns = ('path', 'status', 'title', 'captured', 'stage', 'score')
+    return [dict(zip(columns, row)) for row in conn.execute(sql, params)]
+
+def section(conn: sqlite3.Connection, path: str, name: str) -> Optional[str]:
+    """Return one indexed section body of an idea"""
+    row = conn.execute("SELECT body FROM sections WHERE path = ? AND name = ?",
+                       (path, name)).fetchone()
+    return row[0] if row else None
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit index', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    sub = parser.add_subparsers(dest='action')
+    sub.add_parser('refresh', help="Update the index from changed files (default)")
+    query = sub.add_parser('search', help="Query ideas by keyword, status and date")
+    query.add_argument('keyword', nargs='?', help="Words that must all appear")
+    query.add_argument('--status', help="Status folder (active, archive, implemented, unsorted)")
+    query.add_argument('--since', help="Captured on or after YYYY-MM-DD")
+    query.add_argument('--until', help="Captured on or before YYYY-MM-DD")
+    query.add_argument('--limit', type=int, default=50)
+    query.add_argument('--json', action='store_true', help="Print results as JSON")
+    query.add_argument('--no-refresh', action='store_true', help="Query without refreshing first")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    conn = open_index(root)
+    try:
+        if args.action != 'search' or not args.no_refresh:
+            started = time.perf_counter()
+            stats = refresh(root, conn)
+            if args.action != 'search':
+                print(f"✅ Indexed {stats['scanned']} ideas "
+                      f"({stats['updated']} updated, {stats['removed']} removed) "
+                      f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+                return 0
+
+        results = search(conn, args.keyword, args.status, args.since, args.until, args.limit)
+        if args.json:
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+        else:
+            for idea in results:
+                score = f"{idea['score']}/50" if idea['score'] is not None else "-"
+                print(f"{idea['captured'] or '----------'}  {score:>5}  {idea['path']}  {idea['title']}")
+            print(f"ℹ️  {len(results)} ideas found")
+    finally:
+        conn.close()
+    return 0
@@ -0,0 +1,389 @@
+"""
+IdeaKit idea lineage graph
+Links seeds to their expansions, validation reports and proposals, and finds broken links and orphans
+Run with: python3 -m ideakit lineage [IDEA] [OPTIONS]
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import re
+import struct
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .context import resolve_link
+from .parser import parse_idea_bytes
+from .workspace import (CACHE_DIR, add_root_argument, cache_path, find_root, iter_idea_files,
+                        logical_path, resolve_idea)
+
+GRAPH_FILE = 'lineage.bin'
+GRAPH_MAGIC = b'IKG1'
+# magic, nodes, edges, pipelines
+GRAPH_HEADER = struct.Struct('<4sIII')
+
+# Node kinds; MISSING marks the target of a broken link
+MISSING, SEED, EXPANSION, VALIDATION, PROPOSAL = range(5)
+KIND_NAMES = ('missing', 'seed', 'expansion', 'validation', 'proposal')
+# Matched against the title heading, then the file name; anything else in ideas/ is a seed
+KINDS = ((EXPANSION, re.compile(r'creative[ -]expansion', re.IGNORECASE)),
+         (VALIDATION, re.compile(r'validation|reality[ -]check', re.IGNORECASE)),
+         (PROPOSAL, re.compile(r'project[ -]proposal|blueprint', re.IGNORECASE)))
+STAGES = {'expansion': EXPANSION, 'validation': VALIDATION, 'reality-check': VALIDATION,
+          'proposal': PROPOSAL, 'blueprint': PROPOSAL}
+HEADING_RE = re.compile(rb'^# [^\n]*', re.MULTILINE)
+
+def kind_of(relpath: str, data: bytes, head_end: int) -> int:
+    """Classify a document by its title heading, falling back to its file name"""
+    match = HEADING_RE.search(data, 0, head_end)
+    heading = match.group(0).decode('utf-8', 'replace') if match else ''
+    for kind, pattern in KINDS:
+        if pattern.search(heading):
+            return kind
+    name = relpath.rsplit('/', 1)[-1]
+    for kind, pattern in KINDS:
+        if pattern.search(name):
+            return kind
+    return SEED
+
+def scan_file(root: str, relpath: str) -> Tuple[int, List[str]]:
+    """Return the kind of a document and its Related Files links, resolved against its folder"""
+    try:
+        with open(os.path.join(root, relpath), 'rb') as f:
+            data = f.read()
+    except OSError:
+        return SEED, []
+    idea = parse_idea_bytes(data, relpath)
+    head_end = idea.offsets[0] if idea.names else len(data)
+    return kind_of(relpath, data, head_end), [resolve_link(token, relpath) for token in idea.links]
+
+class Lineage:
+    """Read-only lineage graph; every array stays on disk behind mmap.
+
+    Nodes are sorted paths. Outgoing and incoming links are adjacency arrays (an offset per node into
+    one flat target array), and the connected documents of each pipeline are stored together."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.edges, self.pipelines = GRAPH_HEADER.unpack_from(self.map, 0)
+        if magic != GRAPH_MAGIC:
+            self.map.close()
+            raise ValueError(f"bad lineage file {path}")
+        n, m, c = self.count, self.edges, self.pipelines
+        view = memoryview(self.map)
+        self.views = []
+
+        def take(code: str, items: int) -> memoryview:
+            nonlocal start
+            size = array(code).itemsize * items
+            part = view[start:start + size].cast(code)
+            start += size
+            self.views.append(part)
+            return part
+
+        start = GRAPH_HEADER.size
+        self.mtimes = take('q', n)
+        self.sizes = take('q', n)
+        self.out_start = take('I', n + 1)
+        self.out = take('I', m)
+        self.in_start = take('I', n + 1)
+        self.inbound = take('I', m)
+        self.pipeline = take('I', n)
+        self.member_start = take('I', c + 1)
+        self.members = take('I', n)
+        self.path_start = take('Q', n + 1)
+        self.kinds = take('B', n)
+        self.stages = take('B', c)
+        self.blob_start = start
+
+    def path(self, node: int) -> str:
+        """Return the workspace-relative path of a node"""
+        start = self.blob_start + self.path_start[node]
+        return self.map[start:self.blob_start + self.path_start[node + 1]].decode('utf-8')
+
+    def find(self, relpath: str) -> Optional[int]:
+        """Binary search the sorted paths for a node"""
+        lo = bisect.bisect_left(PathView(self), relpath)
+        return lo if lo < self.count and self.path(lo) == relpath else None
+
+    def links(self, node: int) -> List[int]:
+        """Nodes a document links to"""
+        return list(self.out[self.out_start[node]:self.out_start[node + 1]])
+
+    def linked_from(self, node: int) -> List[int]:
+        """Documents linking to a node"""
+        return list(self.inbound[self.in_start[node]:self.in_start[node + 1]])
+
+    def pipeline_of(self, node: int) -> List[int]:
+        """Every document connected to a node, seed first, then by stage and path"""
+        p = self.pipeline[node]
+        return sorted(self.members[self.member_start[p]:self.member_start[p + 1]],
+                      key=lambda i: (self.kinds[i], i))
+
+    def missing_stage(self, stage: int) -> Iterator[int]:
+        """Seeds whose pipeline has no document of the given stage"""
+        bit = 1 << stage
+        for node in range(self.count):
+            if self.kinds[node] == SEED and not self.stages[self.pipeline[node]] & bit:
+                yield node
+
+    def broken(self) -> Iterator[Tuple[int, int]]:
+        """(source, missing target) of every broken link"""
+        for node in range(self.count):
+            if self.kinds[node] == MISSING:
+                for source in self.inbound[self.in_start[node]:self.in_start[node + 1]]:
+                    yield source, node
+
+    def orphans(self) -> Iterator[int]:
+        """Expansions, validations and proposals not connected to any seed"""
+        bit = 1 << SEED
+        for node in range(self.count):
+            if self.kinds[node] > SEED and not self.stages[self.pipeline[node]] & bit:
+                yield node
+
+    def close(self):
+        """Release the map"""
+        for part in self.views:
+            part.release()
+        self.map.close()
+
+class PathView:
+    """Sequence of node paths for bisect"""
+
+    def __init__(self, graph: Lineage):
+        self.graph = graph
+
+    def __len__(self) -> int:
+        return self.graph.count
+
+    def __getitem__(self, node: int) -> str:
+        return self.graph.path(node)
+
+def graph_path(root: str) -> str:
+    """Location of the persisted graph"""
+    return os.path.join(root, CACHE_DIR, GRAPH_FILE)
+
+def open_graph(root: str) -> Optional[Lineage]:
+    """Open the persisted graph, None if missing or unreadable"""
+    try:
+        return Lineage(graph_path(root))
+    except (OSError, ValueError, struct.error):
+        return None
+
+def build(root: str, previous: Optional[Lineage] = None) -> Dict[str, int]:
+    """Scan ideas/ once and write the graph, re-reading only files changed since the previous graph"""
+    stats = {'scanned': 0, 'parsed': 0}
+    files = {}  # type: Dict[str, Tuple[int, int, int, List[str]]]
+    known = {previous.path(node): node for node in range(previous.count)} if previous is not None else {}
+    for relpath, st in iter_idea_files(root):
+        stats['scanned'] += 1
+        node = known.get(relpath)
+        if node is not None and previous.kinds[node] != MISSING and \
+                (previous.mtimes[node], previous.sizes[node]) == (st.st_mtime_ns, st.st_size):
+            files[relpath] = (st.st_mtime_ns, st.st_size, previous.kinds[node],
+                              [previous.path(target) for target in previous.links(node)])
+            continue
+        stats['parsed'] += 1
+        kind, targets = scan_file(root, relpath)
+        files[relpath] = (st.st_mtime_ns, st.st_size, kind, targets)
+
+    if previous is not None and not stats['parsed'] and \
+            len(files) == previous.count - bytes(previous.kinds).count(MISSING):
+        # Nothing was added, changed or removed: the stored graph is current
+        stats.update(nodes=previous.count, links=previous.edges, pipelines=previous.pipelines)
+        return stats
+
+    # Links may name ideas/<status>/<file> in a sharded workspace; map them to where the file lives
+    logical = {logical_path(relpath): relpath for relpath in files}
+    resolved = {}
+    for relpath, (_, _, _, targets) in files.items():
+        found = []
+        for target in targets:
+            target = target if target in files else logical.get(logical_path(target), target)
+            if target == relpath or target in found:
+                continue
+            if target in files or not os.path.exists(os.path.join(root, target)):
+                found.append(target)
+        resolved[relpath] = found
+    paths = sorted(set(files).union(*resolved.values()))
+    ids = {relpath: i for i, relpath in enumerate(paths)}
+    n = len(paths)
+
+    kinds = array('B', (files[p][2] if p in files else MISSING for p in paths))
+    out_start, out = array('I', [0]), array('I')
+    indegree = array('I', bytes(4 * (n + 1)))
+    for relpath in paths:
+        targets = sorted(ids[target] for target in resolved.get(relpath, ()))
+        out.extend(targets)
+        out_start.append(len(out))
+        for target in targets:
+            indegree[target + 1] += 1
+    in_start = array('I', [0])
+    for node in range(n):
+        in_start.append(in_start[-1] + indegree[node + 1])
+    inbound = array('I', bytes(4 * len(out)))
+    fill = array('I', in_start[:n])
+    for source in range(n):
+        for target in out[out_start[source]:out_start[source + 1]]:
+            inbound[fill[target]] = source
+            fill[target] += 1
+
+    # Pipelines are the documents connected to a seed; broken links and links between two seeds
+    # (related ideas) do not join pipelines
+    parent = array('I', range(n))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for source in range(n):
+        for target in out[out_start[source]:out_start[source + 1]]:
+            if kinds[target] != MISSING and not kinds[source] == kinds[target] == SEED:
+                a, b = find(source), find(target)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+    pipeline_ids = {}
+    pipeline = array('I', (pipeline_ids.setdefault(find(node), len(pipeline_ids)) for node in range(n)))
+    c = len(pipeline_ids)
+    stages = array('B', bytes(c))
+    sizes = array('I', bytes(4 * (c + 1)))
+    for node in range(n):
+        stages[pipeline[node]] |= 1 << kinds[node]
+        sizes[pipeline[node] + 1] += 1
+    member_start = array('I', [0])
+    for p in range(c):
+        member_start.append(member_start[-1] + sizes[p + 1])
+    members = array('I', bytes(4 * n))
+    fill = array('I', member_start[:c])
+    for node in range(n):
+        members[fill[pipeline[node]]] = node
+        fill[pipeline[node]] += 1
+
+    encoded = [p.encode('utf-8') for p in paths]
+    path_start = array('Q', [0])
+    for name in encoded:
+        path_start.append(path_start[-1] + len(name))
+    path = cache_path(root, GRAPH_FILE)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(GRAPH_HEADER.pack(GRAPH_MAGIC, n, len(out), c))
+        array('q', (files[p][0] if p in files else 0 for p in paths)).tofile(f)
+        array('q', (files[p][1] if p in files else 0 for p in paths)).tofile(f)
+        for part in (out_start, out, in_start, inbound, pipeline, member_start, members, path_start,
+                     kinds, stages):
+            part.tofile(f)
+        f.write(b''.join(encoded))
+    os.replace(path + '.tmp', path)
+    stats.update(nodes=n, links=len(out), pipelines=c)
+    return stats
+
+def refresh(root: str, rebuild: bool = False) -> Tuple[Lineage, Dict[str, int]]:
+    """Bring the persisted graph up to date and open it"""
+    previous = None if rebuild else open_graph(root)
+    try:
+        stats = build(root, previous)
+    finally:
+        if previous is not None:
+            previous.close()
+    return Lineage(graph_path(root)), stats
+
+def describe(graph: Lineage, node: int) -> Dict:
+    """JSON-friendly view of a node"""
+    return {'path': graph.path(node), 'kind': KIND_NAMES[graph.kinds[node]]}
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit lineage', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('idea', nargs='?', help="Show the full pipeline of this idea file")
+    parser.add_argument('--missing', choices=sorted(STAGES),
+                        help="List seeds whose pipeline has no document of this stage")
+    parser.add_argument('--broken', action='store_true', help="List links to files that do not exist")
+    parser.add_argument('--orphans', action='store_true',
+                        help="List expansions, validations and proposals not linked to any seed")
+    parser.add_argument('--no-refresh', action='store_true', help="Query the stored graph without rescanning")
+    parser.add_argument('--rebuild', action='store_true', help="Re-read every file instead of changed ones")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    if args.no_refresh:
+        graph, stats = open_graph(root), {}
+        if graph is None:
+            print("❌ No lineage graph yet: run without --no-refresh")
+            return 1
+    else:
+        graph, stats = refresh(root, args.rebuild)
+
+    try:
+        if args.idea:
+            relpath = resolve_idea(root, os.path.relpath(os.path.abspath(args.idea), root)
+                                   if os.path.exists(args.idea) else args.idea)
+            node = graph.find(relpath)
+            if node is None:
+                print(f"❌ Not in the lineage graph: {relpath}")
+                return 1
+            result = [describe(graph, member) for member in graph.pipeline_of(node)]
+            if args.json:
+                print(json.dumps(result, indent=2))
+                return 0
+            print(f"🔎 Pipeline of {relpath}")
+            for item in result:
+                mark = '❌' if item['kind'] == 'missing' else '✅'
+                print(f"   {mark} {item['kind']:10} {item['path']}")
+            return 0
+
+        if args.missing or args.broken or args.orphans:
+            result = {}
+            if args.missing:
+                result['missing_' + args.missing] = [graph.path(node)
+                                                     for node in graph.missing_stage(STAGES[args.missing])]
+            if args.broken:
+                result['broken'] = [{'source': graph.path(source), 'target': graph.path(target)}
+                                    for source, target in graph.broken()]
+            if args.orphans:
+                result['orphans'] = [describe(graph, node) for node in graph.orphans()]
+            if args.json:
+                print(json.dumps(result, indent=2))
+                return 0
+            for relpath in result.get('missing_' + (args.missing or ''), ()):
+                print(relpath)
+            for link in result.get('broken', ()):
+                print(f"{link['source']}: broken link to {link['target']}")
+            for item in result.get('orphans', ()):
+                print(f"{item['path']}: orphan {item['kind']}")
+            return 1 if result.get('broken') else 0
+
+        counts = [0] * len(KIND_NAMES)
+        for node in range(graph.count):
+            counts[graph.kinds[node]] += 1
+        summary = {
+            'documents': {KIND_NAMES[kind]: counts[kind] for kind in range(SEED, len(KIND_NAMES))},
+            # Components made only of a broken link target are not pipelines
+            'pipelines': sum(1 for p in range(graph.pipelines) if graph.stages[p] & ~(1 << MISSING)),
+            'seeds_without': {stage: sum(1 for _ in graph.missing_stage(STAGES[stage]))
+                              for stage in ('expansion', 'validation', 'proposal')},
+            'broken_links': sum(1 for _ in graph.broken()),
+            'orphans': sum(1 for _ in graph.orphans()),
+        }
+        if args.json:
+            summary.update(stats)
+            print(json.dumps(summary, indent=2))
+            return 0
+        documents = ', '.join(f"{count} {kind}{'' if count == 1 else 's'}"
+                              for kind, count in summary['documents'].items())
+        print(f"🌳 {documents} in {summary['pipelines']} pipelines")
+        if stats:
+            print(f"ℹ️  Scanned {stats['scanned']} files, re-read {stats['parsed']}")
+        without = summary['seeds_without']
+        print(f"   Seeds without an expansion: {without['expansion']}, a reality check: "
+              f"{without['validation']}, a proposal: {without['proposal']}")
+        print(f"{'⚠️ ' if summary['broken_links'] else '✅'} {summary['broken_links']} broken links, "
+              f"{summary['orphans']} orphan documents")
+        return 0
+    finally:
+        graph.close()
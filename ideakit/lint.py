@@ -0,0 +1,307 @@
+"""
+IdeaKit idea linter
+Checks idea files against the installed templates and constitution criteria, in parallel and incrementally
+Run with: python3 -m ideakit lint [FILE...] [OPTIONS]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from .parser import (ASSESSMENT_SECTION, CRITERIA, DATE_RE, HEADER_RE, parse_criteria_weights,
+                     parse_idea_text)
+from .templates import TEMPLATES_DIR
+from .workspace import CONSTITUTION, IDEAS_DIR, add_root_argument, cache_path, find_root, iter_idea_files
+
+CACHE_FILE = 'lint.json'
+CACHE_VERSION = 1
+# Below this many files the process pool costs more than it saves
+POOL_MIN_FILES = 256
+CHUNKS_PER_WORKER = 4
+CLOCK_MARGIN_NS = 2 * 10 ** 9
+DATE_FIELDS = ('Captured', 'Expanded')
+SCORE_FIELD = 'Constitution Score'
+MAX_SCORE = 50
+CRITERION_RANGE = (1, 10)
+
+TEMPLATE_LABEL_RE = re.compile(r'^#\s+[^\w\[]*(?P<label>[^:\[]+?)\s*:')
+ASSESSMENT_LINE_RE = re.compile(r'^\s*[-*]\s*\*\*(?P<name>[^*]+?):?\*\*:?\s*(?P<value>.*)$')
+CRITERION_VALUE_RE = re.compile(r'^(?P<score>-?\d+)\s*/\s*10\b')
+SCORE_VALUE_RE = re.compile(r'^(?P<score>-?\d+)\s*/\s*50$')
+PLACEHOLDER_RE = re.compile(r'^\[[^\]]*\]')
+
+# (line, level, message); line 0 refers to the whole file
+Issue = Tuple[int, str, str]
+
+def load_rules(root: str) -> Dict:
+    """Collect the header fields and sections each installed template requires, plus the criteria"""
+    templates = {}
+    directory = os.path.join(root, TEMPLATES_DIR)
+    for filename in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+        if not filename.endswith('.md'):
+            continue
+        with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+            text = f.read()
+        match = TEMPLATE_LABEL_RE.match(text)
+        template = parse_idea_text(text)
+        templates[filename[:-3]] = {
+            'label': match.group('label').strip().lower() if match else '',
+            'fields': list(template['fields']),
+            'sections': list(template['sections']),
+        }
+    try:
+        with open(os.path.join(root, CONSTITUTION), 'r', encoding='utf-8') as f:
+            criteria = list(parse_criteria_weights(f.read()))
+    except OSError:
+        criteria = []
+    return {'templates': templates, 'criteria': criteria or list(CRITERIA)}
+
+def rules_key(rules: Dict) -> str:
+    """Fingerprint of the rules, so cached results are dropped when templates change"""
+    return hashlib.sha1(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def pick_template(title: str, fields: Dict, rules: Dict) -> Optional[str]:
+    """Choose the template a file follows by its title label or header fields, None for other files"""
+    match = TEMPLATE_LABEL_RE.match('# ' + title)
+    label = match.group('label').strip().lower() if match else ''
+    for name, template in rules['templates'].items():
+        if label and label == template['label']:
+            return name
+    # Files with another label (e.g. the example idea) follow a template only if they carry all its headers;
+    # a validation report shares 'Based on' with expansions but is not one
+    for name, template in rules['templates'].items():
+        if template['fields'] and set(template['fields']) <= set(fields):
+            return name
+    return None
+
+def check_date(value: str) -> Optional[str]:
+    """Return a problem with a header date, None if it is a valid ISO date"""
+    match = DATE_RE.search(value)
+    if not match:
+        return "is not a YYYY-MM-DD date"
+    try:
+        date(*map(int, match.group(0).split('-')))
+    except ValueError:
+        return f"{match.group(0)} is not a valid date"
+    return None
+
+def lint_text(text: str, rules: Dict) -> List[Issue]:
+    """Check one idea file's text and return its issues"""
+    issues = []
+    title = None
+    fields = {}
+    sections = {}
+    assessment = []
+    current = None
+    for number, line in enumerate(text.splitlines(), 1):
+        if line.startswith('## '):
+            current = line[3:].strip()
+            if current in sections:
+                issues.append((number, 'warning', f"duplicate section '{current}'"))
+            sections.setdefault(current, number)
+        elif line.startswith('# ') and title is None and current is None:
+            title = (line[2:].strip(), number)
+        elif current is None:
+            match = HEADER_RE.match(line)
+            if match:
+                fields[match.group('key').strip()] = (match.group('value'), number)
+        elif current == ASSESSMENT_SECTION:
+            match = ASSESSMENT_LINE_RE.match(line)
+            if match:
+                assessment.append((number, match.group('name').strip(), match.group('value').strip()))
+
+    if title is None:
+        issues.append((1, 'error', "missing '# ' title heading"))
+    name = pick_template(title[0] if title else '', fields, rules)
+    if name is None:
+        return issues
+    template = rules['templates'][name]
+    for field in template['fields']:
+        if field not in fields:
+            issues.append((0, 'error', f"missing '**{field}:**' header ({name} template)"))
+    for section in template['sections']:
+        if section not in sections:
+            issues.append((0, 'error', f"missing '## {section}' section ({name} template)"))
+
+    for field in DATE_FIELDS:
+        value, number = fields.get(field, ('', 0))
+        problem = value and not PLACEHOLDER_RE.match(value) and check_date(value)
+        if problem:
+            issues.append((number, 'error', f"{field} {problem}"))
+
+    scores = {}
+    for number, criterion, value in assessment:
+        if PLACEHOLDER_RE.match(value):
+            continue
+        if criterion not in rules['criteria']:
+            issues.append((number, 'warning', f"'{criterion}' is not a constitution criterion"))
+            continue
+        match = CRITERION_VALUE_RE.match(value)
+        if not match:
+            issues.append((number, 'error', f"{criterion} score '{value.split(' - ')[0]}' is not N/10"))
+            continue
+        score = int(match.group('score'))
+        low, high = CRITERION_RANGE
+        if not low <= score <= high:
+            issues.append((number, 'error', f"{criterion} score {score}/10 is out of range ({low}-{high})"))
+        scores[criterion] = score
+    if scores and len(scores) < len(rules['criteria']):
+        missing = [criterion for criterion in rules['criteria'] if criterion not in scores]
+        issues.append((sections.get(ASSESSMENT_SECTION, 0), 'warning', f"no score for {', '.join(missing)}"))
+
+    value, number = fields.get(SCORE_FIELD, ('', 0))
+    if value and not PLACEHOLDER_RE.match(value):
+        match = SCORE_VALUE_RE.match(value)
+        if not match:
+            issues.append((number, 'error', f"{SCORE_FIELD} '{value}' is not N/{MAX_SCORE}"))
+        elif not 0 <= int(match.group('score')) <= MAX_SCORE:
+            issues.append((number, 'error', f"{SCORE_FIELD} {value} is out of range (0-{MAX_SCORE})"))
+        elif len(scores) == len(rules['criteria']) and sum(scores.values()) != int(match.group('score')):
+            issues.append((number, 'warning', f"{SCORE_FIELD} {value} does not match the criteria "
+                                              f"total {sum(scores.values())}/{MAX_SCORE}"))
+    return sorted(issues)
+
+def lint_file(root: str, relpath: str, rules: Dict) -> List[Issue]:
+    """Check one idea file on disk"""
+    try:
+        with open(os.path.join(root, relpath), 'r', encoding='utf-8') as f:
+            text = f.read()
+    except UnicodeDecodeError:
+        return [(0, 'error', "file is not valid UTF-8")]
+    except OSError as e:
+        return [(0, 'error', f"cannot read file: {e.strerror}")]
+    return lint_text(text, rules)
+
+def lint_chunk(root: str, relpaths: List[str], rules: Dict) -> List[Tuple[str, List[Issue]]]:
+    """Worker entry point: check a chunk of files"""
+    return [(relpath, lint_file(root, relpath, rules)) for relpath in relpaths]
+
+def lint_files(root: str, relpaths: List[str], rules: Dict, workers: Optional[int] = None) -> Dict[str, List]:
+    """Check files, fanning chunks out over a process pool for large batches"""
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or len(relpaths) < POOL_MIN_FILES:
+        return dict(lint_chunk(root, relpaths, rules))
+    from concurrent.futures import ProcessPoolExecutor
+    size = max(64, -(-len(relpaths) // (workers * CHUNKS_PER_WORKER)))
+    chunks = [relpaths[i:i + size] for i in range(0, len(relpaths), size)]
+    results = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        for done in pool.map(lint_chunk, [root] * len(chunks), chunks, [rules] * len(chunks)):
+            results.update(done)
+    return results
+
+def load_cache(root: str, key: str) -> Dict:
+    """Read the previous run's start time and issues, empty if the rules changed"""
+    try:
+        with open(cache_path(root, CACHE_FILE), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != CACHE_VERSION or cache.get('rules') != key:
+        return {}
+    return cache
+
+def save_cache(root: str, key: str, started_ns: int, issues: Dict[str, List]):
+    """Atomically replace the cache"""
+    path = cache_path(root, CACHE_FILE)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'rules': key, 'started_ns': started_ns, 'issues': issues},
+                  f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, path)
+
+def staged_files(root: str) -> List[str]:
+    """Return the idea files added or modified in the git index, as absolute paths"""
+    result = subprocess.run(['git', 'diff', '--cached', '--name-only', '--relative', '-z',
+                             '--diff-filter=ACMR', '--', IDEAS_DIR],
+                            cwd=root, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise OSError(result.stderr.decode('utf-8', 'replace').strip().splitlines()[0])
+    names = result.stdout.decode('utf-8').split('\0')
+    return [os.path.join(root, name) for name in names if name.endswith('.md')]
+
+def lint(root: str, paths: Optional[List[str]] = None, changed: bool = False,
+         workers: Optional[int] = None) -> Tuple[Dict[str, List], int]:
+    """Lint the given files or all of ideas/ and return (issues by file, files checked)"""
+    rules = load_rules(root)
+    if paths is not None:
+        relpaths = [os.path.relpath(os.path.abspath(path), root).replace(os.sep, '/') for path in paths]
+        results = lint_files(root, relpaths, rules, workers)
+        return {path: found for path, found in results.items() if found}, len(relpaths)
+
+    key = rules_key(rules)
+    cache = load_cache(root, key) if changed else {}
+    # A file changed since the last run started has a newer mtime, or ctime if it was renamed;
+    # the margin covers coarse filesystem timestamps
+    since = cache['started_ns'] - CLOCK_MARGIN_NS if 'started_ns' in cache else None
+    started_ns = int(time.time() * 1e9)
+    current = set()
+    stale = []
+    for relpath, st in iter_idea_files(root, IDEAS_DIR):
+        current.add(relpath)
+        if since is None or max(st.st_mtime_ns, st.st_ctime_ns) >= since:
+            stale.append(relpath)
+    issues = {path: found for path, found in cache.get('issues', {}).items() if path in current}
+    for path, found in lint_files(root, stale, rules, workers).items():
+        if found:
+            issues[path] = found
+        else:
+            issues.pop(path, None)
+    save_cache(root, key, started_ns, issues)
+    return issues, len(stale)
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit lint', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('files', nargs='*', help="Idea files to check (default: everything in ideas/)")
+    parser.add_argument('--changed', action='store_true',
+                        help="Only re-check files changed since the last run, reusing earlier results")
+    parser.add_argument('--staged', action='store_true',
+                        help="Only check idea files staged in git (for a pre-commit hook)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--strict', action='store_true', help="Fail on warnings too")
+    parser.add_argument('--json', action='store_true', help="Print issues as JSON")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    started = time.perf_counter()
+    files = args.files or None
+    if args.staged:
+        try:
+            files = staged_files(root)
+        except OSError as e:
+            print(f"❌ Error: cannot list staged files: {e}")
+            return 1
+    issues, checked = lint(root, files, args.changed, args.workers)
+    elapsed = time.perf_counter() - started
+
+    counts = {'error': 0, 'warning': 0}
+    for found in issues.values():
+        for _, level, _ in found:
+            counts[level] += 1
+    failed = counts['error'] > 0 or (args.strict and counts['warning'] > 0)
+    if args.json:
+        print(json.dumps({path: [{'line': line, 'level': level, 'message': message}
+                                 for line, level, message in found]
+                          for path, found in sorted(issues.items())}, indent=2))
+        return 1 if failed else 0
+
+    for path in sorted(issues):
+        for line, level, message in issues[path]:
+            print(f"{path}:{line}: {level}: {message}" if line else f"{path}: {level}: {message}")
+    summary = f"{checked} files checked in {elapsed:.2f}s"
+    if not issues:
+        print(f"✅ No problems ({summary})")
+    elif failed:
+        print(f"❌ {counts['error']} errors, {counts['warning']} warnings in {len(issues)} files "
+              f"({summary})")
+    else:
+        print(f"⚠️  {counts['warning']} warnings in {len(issues)} files ({summary})")
+    return 1 if failed else 0
@@ -0,0 +1,357 @@
+"""
+IdeaKit status transitions
+Moves batches of ideas between status folders with renames, keeping Status headers and links in sync
+Run with: python3 -m ideakit move [PATTERN...] --to FOLDER [OPTIONS]
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import posixpath
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from . import changelog, index
+from .parser import LINK_RE, RELATED_SECTION
+from .status import dir_mtimes
+from .workspace import (IDEAS_DIR, STATUS_FOLDERS, add_root_argument, cache_path, find_root, idea_folder,
+                        load_layout, logical_path)
+
+JOURNAL_FILE = 'move-journal.json'
+JOURNAL_VERSION = 1
+# Status header value written when an idea enters a folder; 'active' restores the previous stage
+STATUS_LABELS = {'archive': 'Archived', 'implemented': 'Implemented'}
+
+STATUS_RE = re.compile(r'^(\*\*Status:\*\*[ \t]*)(.*?)[ \t]*$', re.MULTILINE)
+LABEL_RE = re.compile(r'^(?P<label>.+?) \(from (?P<stage>.+)\)$')
+RELATED_RE = re.compile(r'^## ' + re.escape(RELATED_SECTION) + r'[ \t]*$', re.MULTILINE)
+SECTION_END_RE = re.compile(r'^(?:## |---\s*$)', re.MULTILINE)
+
+class MoveError(Exception):
+    """Raised when a batch cannot be planned or an unfinished batch exists"""
+
+def status_label(current: str, target: str) -> str:
+    """Return the Status header value of an idea moved to target"""
+    match = LABEL_RE.match(current)
+    if match and match.group('label') in STATUS_LABELS.values():
+        stage = match.group('stage')
+    elif current in STATUS_LABELS.values():
+        stage = 'Active'
+    else:
+        stage = current
+    label = STATUS_LABELS.get(target)
+    return f"{label} (from {stage})" if label else stage
+
+def related_span(text: str) -> Optional[Tuple[int, int]]:
+    """Return the character range of the Related Files section body"""
+    match = RELATED_RE.search(text)
+    if not match:
+        return None
+    end = SECTION_END_RE.search(text, match.end() + 1)
+    return match.end(), end.start() if end else len(text)
+
+def link_targets(body: str) -> List[str]:
+    """Return the file names of all .md links in a section body"""
+    return [posixpath.basename(token) for token in LINK_RE.findall(body)]
+
+def rewrite_text(text: str, old_path: str, new_path: str, moves: Dict[str, str], known: set,
+                 target: Optional[str] = None) -> str:
+    """Update the Status header (when target is given) and the Related Files links of one idea"""
+    if target is not None:
+        header_end = text.find('\n## ')
+        match = STATUS_RE.search(text, 0, len(text) if header_end < 0 else header_end)
+        if match:
+            text = text[:match.start(2)] + status_label(match.group(2), target) + text[match.end(2):]
+
+    span = related_span(text)
+    if span is None:
+        return text
+    old_dir, new_dir = posixpath.dirname(old_path), posixpath.dirname(new_path)
+
+    def relink(match):
+        token = match.group(1)
+        rooted = token.startswith(IDEAS_DIR + '/')
+        resolved = posixpath.normpath(token if rooted else posixpath.join(old_dir, token))
+        if resolved not in known:
+            return token
+        destination = moves.get(resolved, resolved)
+        if rooted:
+            return destination
+        if destination == resolved and new_dir == old_dir:
+            return token
+        return posixpath.relpath(destination, new_dir)
+
+    start, end = span
+    return text[:start] + LINK_RE.sub(relink, text[start:end]) + text[end:]
+
+def select(conn, root: str, patterns: List[str], query: Optional[str], status: Optional[str],
+           since: Optional[str], until: Optional[str], min_score: Optional[int],
+           max_score: Optional[int]) -> List[Dict]:
+    """Return index rows of the ideas matched by glob patterns and/or index filters"""
+    rows = index.search(conn, query, status, since, until, limit=-1)
+    if min_score is not None or max_score is not None:
+        rows = [r for r in rows if r['score'] is not None
+                and (min_score is None or r['score'] >= min_score)
+                and (max_score is None or r['score'] <= max_score)]
+    if patterns:
+        globs = [posixpath.normpath(os.path.relpath(os.path.abspath(p), root).replace(os.sep, '/'))
+                 for p in patterns]
+        # Globs name ideas as ideas/<status>/<name> whatever shard folder holds them
+        rows = [r for r in rows if any(fnmatch.fnmatchcase(r['path'], g)
+                                       or fnmatch.fnmatchcase(logical_path(r['path']), g) for g in globs)]
+    return rows
+
+def plan_moves(root: str, conn, rows: List[Dict], target: Optional[str],
+               layout: Optional[str] = None) -> Dict:
+    """Build the journal of a batch: renames, original and rewritten contents, change log entries
+
+    target is the destination status folder; None keeps each idea's folder and only
+    moves it to where the layout (default: the workspace's) places it.
+    """
+    layout = layout or load_layout(root)
+    listings = {}
+
+    def taken(folder: str) -> set:
+        if folder not in listings:
+            directory = os.path.join(root, folder)
+            listings[folder] = set(os.listdir(directory)) if os.path.isdir(directory) else set()
+        return listings[folder]
+
+    moves = {}
+    for row in sorted(rows, key=lambda r: r['path']):
+        status = target or row['status']
+        base = posixpath.basename(row['path'])[:-len('.md')]
+        if posixpath.dirname(row['path']) == idea_folder(status, base + '.md', layout):
+            continue
+        name, n = f"{base}.md", 2
+        while name in taken(idea_folder(status, name, layout)):
+            name = f"{base}-{n}.md"
+            n += 1
+        folder = idea_folder(status, name, layout)
+        taken(folder).add(name)
+        moves[row['path']] = f"{folder}/{name}"
+
+    # Files outside the batch only need rewriting when their Related Files mention a moved name
+    moved_names = {posixpath.basename(path) for path in moves}
+    related = {path: link_targets(body) for path, body in conn.execute(
+        "SELECT path, body FROM sections WHERE name = ?", (RELATED_SECTION,))}
+    linking = [path for path, targets in related.items()
+               if path not in moves and moved_names.intersection(targets)]
+    known = {path for path, in conn.execute("SELECT path FROM ideas")}
+
+    rewrites = []
+    # Moved files change their Status header, or (without a target) only their relative links
+    candidates = list(moves) if target else [path for path in moves if related.get(path)]
+    for path in candidates + sorted(linking):
+        with open(os.path.join(root, path), 'r', encoding='utf-8', newline='') as f:
+            original = f.read()
+        destination = moves.get(path, path)
+        updated = rewrite_text(original, path, destination, moves, known,
+                               target if path in moves else None)
+        if updated != original:
+            rewrites.append({'path': path, 'original': original, 'updated': updated})
+
+    by_path = {row['path']: row for row in rows}
+    log = []
+    for old, new in moves.items():
+        row = by_path[old]
+        fields = {'title': row['title'], 'captured': row['captured'], 'score': row['score']}
+        log.append(changelog.entry('remove', old, **fields))
+        log.append(changelog.entry('add', new, **fields))
+    return {'version': JOURNAL_VERSION, 'target': target, 'layout': layout, 'moves': sorted(moves.items()),
+            'rewrites': rewrites, 'log': log, 'started': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+def destination(journal: Dict) -> str:
+    """Describe where a batch moves ideas, for messages"""
+    if journal.get('target'):
+        return f"{journal['target']}/"
+    return f"the {journal.get('layout')} layout"
+
+def journal_path(root: str) -> str:
+    """Return the path of the batch journal"""
+    return cache_path(root, JOURNAL_FILE)
+
+def load_journal(root: str) -> Optional[Dict]:
+    """Read the journal of an unfinished batch, None if there is none"""
+    try:
+        with open(journal_path(root), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        raise MoveError(f"unreadable move journal {journal_path(root)}")
+
+def write_journal(root: str, journal: Dict):
+    """Durably write the journal before the first rename"""
+    path = journal_path(root)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        # dumps() uses the C encoder; dump() would stream through the pure-Python one
+        f.write(json.dumps(journal, ensure_ascii=False))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def write_text(path: str, text: str):
+    """Rewrite a file in place"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+def sync_dirs(root: str, folders):
+    """Flush directory entries so the renames survive a crash (no-op where unsupported)"""
+    for folder in folders:
+        try:
+            fd = os.open(os.path.join(root, folder), os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+def apply_journal(root: str, journal: Dict):
+    """Perform (or replay) a journaled batch; every step is idempotent"""
+    moves = dict(journal['moves'])
+    for old, new in journal['moves']:
+        source, destination = os.path.join(root, old), os.path.join(root, new)
+        if os.path.exists(source) and not os.path.exists(destination):
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.rename(source, destination)
+    for rewrite in journal['rewrites']:
+        write_text(os.path.join(root, moves.get(rewrite['path'], rewrite['path'])), rewrite['updated'])
+    finish(root, journal)
+
+def roll_back_journal(root: str, journal: Dict):
+    """Undo a journaled batch: restore original contents, then rename files back"""
+    moves = dict(journal['moves'])
+    for rewrite in journal['rewrites']:
+        path = rewrite['path']
+        current = moves.get(path, path)
+        if not os.path.exists(os.path.join(root, current)):
+            current = path
+        write_text(os.path.join(root, current), rewrite['original'])
+    for old, new in reversed(journal['moves']):
+        source, destination = os.path.join(root, new), os.path.join(root, old)
+        if os.path.exists(source) and not os.path.exists(destination):
+            os.rename(source, destination)
+    sync_dirs(root, {posixpath.dirname(p) for pair in journal['moves'] for p in pair})
+    os.remove(journal_path(root))
+
+def finish(root: str, journal: Dict):
+    """Sync folders, carry index rows over, record the moves in the change log and drop the journal"""
+    folders = {posixpath.dirname(p) for pair in journal['moves'] for p in pair}
+    # Drop shard folders the batch emptied before recording folder mtimes
+    for folder in {posixpath.dirname(old) for old, _ in journal['moves']}:
+        if folder.count('/') > 1:
+            try:
+                os.rmdir(os.path.join(root, folder))
+                folders.discard(folder)
+            except OSError:
+                pass
+    sync_dirs(root, folders)
+    conn = index.open_index(root)
+    try:
+        index.rename(conn, journal['moves'])
+    finally:
+        conn.close()
+    log = journal['log']
+    if log:
+        log[-1]['dirs'] = dir_mtimes(root, [p for pair in journal['moves'] for p in pair])
+    changelog.record_many(root, log)
+    os.remove(journal_path(root))
+
+def move_ideas(root: str, rows: List[Dict], target: str, dry_run: bool = False,
+               conn=None) -> Dict:
+    """Move index rows to ideas/<target>/ as one journaled batch and return the journal"""
+    if load_journal(root) is not None:
+        raise MoveError("an unfinished move batch exists, run with --resume or --rollback")
+    own = conn is None
+    conn = conn or index.open_index(root)
+    try:
+        journal = plan_moves(root, conn, rows, target)
+    finally:
+        if own:
+            conn.close()
+    if dry_run or not journal['moves']:
+        return journal
+    write_journal(root, journal)
+    apply_journal(root, journal)
+    return journal
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit move', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('patterns', nargs='*', help="Idea files or globs (e.g. 'ideas/active/2024*.md')")
+    parser.add_argument('--to', dest='target', choices=STATUS_FOLDERS, help="Destination status folder")
+    parser.add_argument('--query', help="Only ideas matching this keyword search")
+    parser.add_argument('--status', help="Only ideas currently in this folder")
+    parser.add_argument('--since', help="Only ideas captured on or after this date (YYYY-MM-DD)")
+    parser.add_argument('--until', help="Only ideas captured on or before this date (YYYY-MM-DD)")
+    parser.add_argument('--min-score', type=int, help="Only ideas scored at least this (out of 50)")
+    parser.add_argument('--max-score', type=int, help="Only ideas scored at most this (out of 50)")
+    parser.add_argument('--dry-run', action='store_true', help="Show the plan without moving anything")
+    parser.add_argument('--resume', action='store_true', help="Finish an interrupted batch from its journal")
+    parser.add_argument('--rollback', action='store_true', help="Undo an interrupted batch from its journal")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    if args.resume or args.rollback:
+        try:
+            journal = load_journal(root)
+        except MoveError as e:
+            print(f"❌ Error: {e}")
+            return 1
+        if journal is None:
+            print("ℹ️  No unfinished move batch")
+            return 0
+        if args.rollback:
+            roll_back_journal(root, journal)
+            print(f"✅ Rolled back move of {len(journal['moves'])} ideas to {destination(journal)}")
+        else:
+            apply_journal(root, journal)
+            print(f"✅ Finished move of {len(journal['moves'])} ideas to {destination(journal)}")
+        return 0
+
+    if not args.target:
+        parser.error("--to FOLDER is required")
+    if not (args.patterns or args.query or args.status or args.since or args.until
+            or args.min_score is not None or args.max_score is not None):
+        parser.error("select ideas with patterns, --query, --status, --since/--until or a score threshold")
+
+    started = time.perf_counter()
+    conn = index.open_index(root)
+    try:
+        index.refresh(root, conn)
+        rows = select(conn, root, args.patterns, args.query, args.status, args.since, args.until,
+                      args.min_score, args.max_score)
+        journal = move_ideas(root, rows, args.target, args.dry_run, conn)
+    except MoveError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    except OSError as e:
+        print(f"❌ Error: {e}")
+        print("ℹ️  Run 'python3 -m ideakit move --resume' or '--rollback' to settle the batch")
+        return 1
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - started
+
+    moved = dict(journal['moves'])
+    linked = sum(1 for r in journal['rewrites'] if r['path'] not in moved)
+    if args.dry_run:
+        for old, new in journal['moves']:
+            print(f"   {old} -> {new}")
+        print(f"ℹ️  Dry run: {len(journal['moves'])} ideas would move to {args.target}/, "
+              f"{linked} linking files would be updated")
+        return 0
+    if not journal['moves']:
+        print(f"ℹ️  No ideas to move to {args.target}/")
+        return 0
+    print(f"✅ Moved {len(journal['moves'])} ideas to {args.target}/ "
+          f"({linked} linking files updated) in {elapsed:.2f}s")
+    return 0
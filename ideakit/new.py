@@ -0,0 +1,260 @@
+"""
+IdeaKit idea capture
+Creates timestamped, collision-free idea files from the installed templates
+Run with: python3 -m ideakit new "Idea title" [OPTIONS] | --from seeds.jsonl
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from . import changelog
+from .parser import CRITERIA
+from .status import dir_mtimes
+from .templates import Template, load_template
+from .workspace import IDEAS_DIR, STATUS_FOLDERS, add_root_argument, find_root, idea_folder, load_layout
+
+DEFAULT_TEMPLATE = 'idea-seed'
+DEFAULT_STATUS = 'active'
+SLUG_LENGTH = 48
+# Change log entries are flushed in groups so huge batches use bounded memory
+LOG_BATCH = 1000
+
+# Seed field -> template key
+SEED_FIELDS = {
+    'title': 'TITLE',
+    'idea': 'section:Raw Idea',
+    'problem': 'section:Core Problem/Opportunity',
+    'vision': 'section:Initial Vision',
+    'recap': 'section:Original Concept Recap',
+    'based_on': 'field:Based on',
+}
+
+def slugify(title: str) -> str:
+    """Turn a title into a short file name component"""
+    slug = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+    return slug[:SLUG_LENGTH].rstrip('-') or 'idea'
+
+def seed_values(seed: Dict, today: str) -> Dict[str, str]:
+    """Map a seed record (title, idea, problem, vision, scores, reasons, questions) to template keys"""
+    values = {'DATE': seed.get('date') or today}
+    for field, key in SEED_FIELDS.items():
+        if seed.get(field):
+            values[key] = str(seed[field])
+    for name, body in (seed.get('sections') or {}).items():
+        values['section:' + name] = str(body)
+
+    scores = seed.get('scores') or {}
+    reasons = seed.get('reasons') or {}
+    for name in CRITERIA:
+        if scores.get(name) is not None:
+            values['score:' + name] = f"{int(scores[name])}/10"
+        if reasons.get(name):
+            values['reason:' + name] = str(reasons[name])
+    if all(scores.get(name) is not None for name in CRITERIA):
+        values['X/50'] = f"{sum(int(scores[name]) for name in CRITERIA)}/50"
+
+    for n, question in enumerate(seed.get('questions') or [], 1):
+        values[f'question:{n}'] = str(question)
+    for label, link in (seed.get('links') or {}).items():
+        values['link:' + label] = str(link)
+    return values
+
+def seed_score(seed: Dict) -> Optional[int]:
+    """Total constitution score of a seed, None unless all criteria are scored"""
+    scores = seed.get('scores') or {}
+    if all(scores.get(name) is not None for name in CRITERIA):
+        return sum(int(scores[name]) for name in CRITERIA)
+    return None
+
+def create_exclusive(path: str, data: bytes) -> bool:
+    """Create path with one write, False if it already exists"""
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return False
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    return True
+
+class IdeaWriter:
+    """Renders seeds into one status folder with unique '<timestamp>-<slug>.md' names"""
+
+    def __init__(self, root: str, template: Template, status: str = DEFAULT_STATUS,
+                 now: Optional[float] = None):
+        # The status becomes a path under ideas/; anything else could write outside the workspace
+        if status not in STATUS_FOLDERS:
+            raise ValueError(f"unknown status folder '{status}' "
+                             f"(expected one of {', '.join(STATUS_FOLDERS)})")
+        self.root = root
+        self.template = template
+        self.status = status
+        self.layout = load_layout(root)
+        os.makedirs(os.path.join(root, IDEAS_DIR, status), exist_ok=True)
+        now = time.time() if now is None else now
+        self.stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(now))
+        self.today = time.strftime('%Y-%m-%d', time.localtime(now))
+        # Names in use per folder; shard folders are listed the first time a name lands in them
+        self.taken = {}
+        self.pending_log = []
+
+    def folder(self, name: str) -> str:
+        """Return the folder a file name belongs in under the workspace layout"""
+        return idea_folder(self.status, name, self.layout)
+
+    def names(self, folder: str) -> set:
+        """Return the names taken in a folder, creating it on first use"""
+        taken = self.taken.get(folder)
+        if taken is None:
+            directory = os.path.join(self.root, folder)
+            os.makedirs(directory, exist_ok=True)
+            taken = self.taken.setdefault(folder, set(os.listdir(directory)))
+        return taken
+
+    def reserve(self, names: Iterable[str]):
+        """Mark names as taken, e.g. files of an interrupted batch"""
+        for name in names:
+            self.names(self.folder(name)).add(name)
+
+    def unique_name(self, title: str) -> str:
+        """Pick a file name not used in its folder or earlier in this batch"""
+        return self.claim(f"{self.stamp}-{slugify(title)}")
+
+    def claim(self, base: str) -> str:
+        """Reserve base.md, or base-2.md, base-3.md, ... if taken"""
+        name = base + '.md'
+        n = 2
+        while name in self.names(self.folder(name)):
+            name = f"{base}-{n}.md"
+            n += 1
+        self.taken[self.folder(name)].add(name)
+        return name
+
+    def prepare(self, seed: Dict, name: Optional[str] = None):
+        """Render a seed and pick its file name: (relpath, data, change log entry)"""
+        title = str(seed.get('title') or 'Untitled idea')
+        data = self.template.render(seed_values(seed, self.today)).encode('utf-8')
+        name = name or self.unique_name(title)
+        entry = changelog.entry('add', f"{self.folder(name)}/{name}", title=title,
+                                captured=seed.get('date') or self.today, score=seed_score(seed))
+        return entry['path'], data, entry
+
+    def create(self, relpath: str, data: bytes) -> str:
+        """Create a prepared file, renaming it if the name was taken meanwhile"""
+        name = relpath.rsplit('/', 1)[1]
+        while not create_exclusive(os.path.join(self.root, self.folder(name), name), data):
+            # Another process created the same name since the folder was listed
+            name = self.claim(name[:-len('.md')])
+        return f"{self.folder(name)}/{name}"
+
+    def log(self, entry: Dict):
+        """Queue a change log entry, flushing every LOG_BATCH entries"""
+        self.pending_log.append(entry)
+        if len(self.pending_log) >= LOG_BATCH:
+            self.flush()
+
+    def write(self, seed: Dict) -> str:
+        """Render and create one idea file, returning its workspace-relative path"""
+        relpath, data, entry = self.prepare(seed)
+        entry['path'] = self.create(relpath, data)
+        self.log(entry)
+        return entry['path']
+
+    def flush(self):
+        """Append pending change log entries with the current mtimes of their folders"""
+        if not self.pending_log:
+            return
+        dirs = dir_mtimes(self.root, [entry['path'] for entry in self.pending_log])
+        self.pending_log[-1]['dirs'] = dirs
+        changelog.record_many(self.root, self.pending_log)
+        self.pending_log = []
+
+def create_ideas(root: str, seeds: Iterable[Dict], template: str = DEFAULT_TEMPLATE,
+                 status: str = DEFAULT_STATUS, now: Optional[float] = None) -> List[str]:
+    """Render many seeds with one compiled template and return the created paths"""
+    writer = IdeaWriter(root, load_template(root, template), status, now)
+    try:
+        return [writer.write(seed) for seed in seeds]
+    finally:
+        writer.flush()
+
+def read_seeds(path: str) -> Iterator[Dict]:
+    """Yield seeds from a JSON-lines file ('-' for stdin) or a JSON list"""
+    stream = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        first = stream.read(1)
+        while first and first.isspace():
+            first = stream.read(1)
+        if first == '[':
+            yield from json.loads(first + stream.read())
+            return
+        buffer = first
+        for line in stream:
+            line = (buffer + line).strip()
+            buffer = ''
+            if line:
+                yield json.loads(line)
+        if buffer.strip():
+            yield json.loads(buffer)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def parse_score_option(text: str):
+    """Parse 'Criterion=N' for --score"""
+    name, _, value = text.partition('=')
+    if name.strip() not in CRITERIA or not value.strip().isdigit() or not 1 <= int(value) <= 10:
+        raise argparse.ArgumentTypeError(
+            f"invalid score '{text}' (expected e.g. 'Fun Factor=8', criteria: {', '.join(CRITERIA)})")
+    return name.strip(), int(value)
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit new', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('title', nargs='?', help="Idea title")
+    parser.add_argument('--idea', help="Raw idea text")
+    parser.add_argument('--problem', help="Core problem or opportunity")
+    parser.add_argument('--vision', help="Initial vision")
+    parser.add_argument('--score', type=parse_score_option, action='append', default=[],
+                        help="Criterion score such as 'Fun Factor=8' (repeatable)")
+    parser.add_argument('--question', action='append', default=[], help="Question to explore (repeatable)")
+    parser.add_argument('--from', dest='source', metavar='FILE',
+                        help="Create one idea per JSON line (or JSON list) in FILE, '-' for stdin")
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE,
+                        help="Template in .ideakit/templates (default: idea-seed)")
+    parser.add_argument('--status', default=DEFAULT_STATUS, choices=STATUS_FOLDERS,
+                        help="Status folder (default: active)")
+    args = parser.parse_args(argv)
+
+    if not args.title and not args.source:
+        parser.error("give an idea title or --from FILE")
+    root = find_root(args.root)
+    if args.source:
+        seeds = read_seeds(args.source)
+    else:
+        seeds = [{'title': args.title, 'idea': args.idea or args.title, 'problem': args.problem,
+                  'vision': args.vision, 'scores': dict(args.score), 'questions': args.question}]
+
+    started = time.perf_counter()
+    try:
+        created = create_ideas(root, seeds, args.template, args.status)
+    except OSError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    except ValueError as e:
+        print(f"❌ Error: invalid seed record: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if len(created) == 1:
+        print(f"✅ Created: {created[0]}")
+    else:
+        print(f"✅ Created {len(created)} ideas in {args.status}/ in {elapsed:.2f}s")
+    return 0
@@ -0,0 +1,241 @@
+"""
+IdeaKit idea file parser
+Extracts title, header fields and sections from idea markdown files
+"""
+
+import re
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .workspace import IDEAS_DIR
+
+CRITERIA = ('Fun Factor', 'Differentiation', 'Feasibility', 'Monetization', 'Scalability')
+ASSESSMENT_SECTION = 'Constitution Assessment'
+QUESTIONS_SECTION = 'Questions to Explore'
+RELATED_SECTION = 'Related Files'
+
+HEADER_RE = re.compile(r'^\*\*(?P<key>[^*]+?):\*\*\s*(?P<value>.*?)\s*$')
+SCORE_RE = re.compile(r'(\d+)\s*/\s*50')
+DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+CRITERION_SCORE_RE = re.compile(r'^\s*[-*]\s*\*\*(?P<name>[^*]+?):?\*\*:?\s*(?P<score>\d+)\s*/\s*10\b')
+CRITERION_WEIGHT_RE = re.compile(r'\*\*(?P<name>[^*]+?)\*\*\s*\((?P<points>\d+(?:\.\d+)?)\s*points?\)')
+FOOTER_RE = re.compile(r'\n*---\s*\n\*Created with IdeaKit[^\n]*\*\s*$')
+# Byte patterns run over whole sections of the raw file
+CRITERION_LINE_RE = re.compile(rb'^[ \t]*[-*][ \t]*\*\*([^*\n]+?):?\*\*:?[ \t]*(\d+)[ \t]*/[ \t]*10\b',
+                               re.MULTILINE)
+CHECKBOX_RE = re.compile(rb'^[ \t]*[-*][ \t]*\[([ xX])\][ \t]*([^\n]*)', re.MULTILINE)
+PLACEHOLDER_RE = re.compile(rb'^\[[^\]]*\]$')
+LINK_RE = re.compile(r'(?<![\w./-])((?:\.{1,2}/|' + IDEAS_DIR + r'/)?(?:[\w.-]+/)*[\w.-]+\.md)(?![\w/-])')
+TITLE_LABEL_RE = re.compile(r'^[^\w\[]*(?:(?:Idea Seed|Creative Expansion|Validation Report|'
+                            r'Project Proposal|Example)\s*:\s*)?', re.IGNORECASE)
+
+# Section names by raw heading bytes, and interned name tuples keyed by themselves
+MAX_HEADINGS = 4096
+HEADINGS = {}  # type: Dict[bytes, str]
+SECTION_NAMES = {}  # type: Dict[Tuple[str, ...], Tuple[str, ...]]
+
+def clean_title(heading: str) -> str:
+    """Strip the leading emoji and template label from a title heading"""
+    return TITLE_LABEL_RE.sub('', heading, count=1).strip()
+
+def parse_score(value: Optional[str]) -> Optional[int]:
+    """Parse a 'Constitution Score: X/50' value, None for placeholders"""
+    match = SCORE_RE.search(value or '')
+    return int(match.group(1)) if match else None
+
+def parse_date(value: Optional[str]) -> Optional[str]:
+    """Return the ISO date contained in a header value"""
+    match = DATE_RE.search(value or '')
+    return match.group(0) if match else None
+
+def parse_assessment(body: Optional[str]) -> Dict[str, int]:
+    """Parse '- **Criterion:** N/10' lines of a Constitution Assessment section"""
+    scores = {}
+    for line in (body or '').splitlines():
+        match = CRITERION_SCORE_RE.match(line)
+        if match and match.group('name').strip() in CRITERIA:
+            scores[match.group('name').strip()] = int(match.group('score'))
+    return scores
+
+def parse_criteria_weights(text: str) -> Dict[str, float]:
+    """Parse '**Criterion** (N points)' lines from the constitution's Evaluation Criteria"""
+    weights = {}
+    for match in CRITERION_WEIGHT_RE.finditer(text):
+        name = match.group('name').strip()
+        if name in CRITERIA:
+            weights[name] = float(match.group('points'))
+    return weights
+
+def parse_idea_text(text: str) -> Dict:
+    """Parse idea markdown into title, header fields and sections"""
+    title = ''
+    fields = {}
+    sections = {}
+    current = None
+    body = []
+
+    for line in text.splitlines():
+        if line.startswith('# ') and not title and current is None:
+            title = clean_title(line[2:])
+        elif line.startswith('## '):
+            if current is not None:
+                sections[current] = '\n'.join(body).strip()
+            current = line[3:].strip()
+            body = []
+        elif current is not None:
+            body.append(line)
+        else:
+            match = HEADER_RE.match(line)
+            if match:
+                fields[match.group('key').strip()] = match.group('value')
+    if current is not None:
+        sections[current] = FOOTER_RE.sub('', '\n'.join(body)).strip()
+
+    return {
+        'title': title,
+        'fields': fields,
+        'sections': sections,
+        'captured': parse_date(fields.get('Captured') or fields.get('Expanded')),
+        'stage': fields.get('Status', ''),
+        'score': parse_score(fields.get('Constitution Score')),
+    }
+
+def parse_idea_file(path: str) -> Dict:
+    """Parse an idea file from disk"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return parse_idea_text(f.read())
+
+def checkboxes(raw: bytes) -> List[Tuple[bytes, bool]]:
+    """Return the (text, ticked) '- [ ] item' checkboxes of a section, skipping template placeholders"""
+    items = ((text.rstrip(), mark) for mark, text in CHECKBOX_RE.findall(raw))
+    return [(text, mark != b' ') for text, mark in items if text and not PLACEHOLDER_RE.match(text)]
+
+class Idea:
+    """Compact idea record: header, scores, question counts and links, with section bodies read on demand"""
+    __slots__ = ('path', 'title', 'captured', 'stage', 'score', 'criteria', 'questions_open',
+                 'questions_answered', 'links', 'names', 'offsets')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.title = ''
+        self.captured = None
+        self.stage = ''
+        self.score = None
+        # Criterion scores in CRITERIA order, 0 where the assessment gives none
+        self.criteria = None
+        self.questions_open = 0
+        self.questions_answered = 0
+        self.links = ()
+        self.names = ()
+        # Body start and end byte offsets of each section in names
+        self.offsets = None
+
+    def __repr__(self) -> str:
+        return f"Idea({self.path!r}, title={self.title!r}, score={self.score!r})"
+
+    @property
+    def scores(self) -> Dict[str, int]:
+        """Criterion scores by name, as parse_assessment returns them"""
+        return {name: value for name, value in zip(CRITERIA, self.criteria or ()) if value}
+
+    def sections(self, data: Optional[bytes] = None) -> Dict[str, str]:
+        """Return every section body, reading the file unless its bytes are given"""
+        if not self.names:
+            return {}
+        if data is None:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        bodies = {}
+        for i, name in enumerate(self.names):
+            bodies[name] = self._body(data[self.offsets[2 * i]:self.offsets[2 * i + 1]], i)
+        return bodies
+
+    def section(self, name: str) -> Optional[str]:
+        """Return one section body, reading only its bytes from disk"""
+        raw = self._read(name)
+        return None if raw is None else self._body(raw, self.names.index(name))
+
+    def questions(self) -> List[Tuple[str, bool]]:
+        """Return the Questions to Explore checkboxes as (text, answered)"""
+        return [(text.decode('utf-8', 'replace'), answered)
+                for text, answered in checkboxes(self._read(QUESTIONS_SECTION) or b'')]
+
+    def _read(self, name: str) -> Optional[bytes]:
+        if name not in self.names:
+            return None
+        i = self.names.index(name)
+        start, end = self.offsets[2 * i], self.offsets[2 * i + 1]
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def _body(self, raw: bytes, i: int) -> str:
+        text = raw.decode('utf-8', 'replace')
+        if i == len(self.names) - 1:
+            text = FOOTER_RE.sub('', text)
+        return text.strip()
+
+def parse_idea_bytes(data: bytes, path: str) -> Idea:
+    """Parse idea markdown in one scan for section headings, keeping section offsets instead of bodies"""
+    idea = Idea(path)
+    # bytes.find skips from heading to heading much faster than a line loop or a multiline regex
+    starts = [0] if data.startswith(b'## ') else []
+    at = data.find(b'\n## ')
+    while at >= 0:
+        starts.append(at + 1)
+        at = data.find(b'\n## ', at + 1)
+    head = data[:starts[0] if starts else len(data)].decode('utf-8', 'replace')
+    fields = {}
+    for line in head.splitlines():
+        if line.startswith('# ') and not idea.title:
+            idea.title = clean_title(line[2:])
+        elif line.startswith('**'):
+            match = HEADER_RE.match(line)
+            if match:
+                fields[match.group('key').strip()] = match.group('value')
+    # Dates and stages repeat across thousands of ideas, so records share the strings
+    captured = parse_date(fields.get('Captured') or fields.get('Expanded'))
+    idea.captured = sys.intern(captured) if captured else None
+    idea.stage = sys.intern(fields.get('Status', ''))
+    idea.score = parse_score(fields.get('Constitution Score'))
+
+    names = []
+    offsets = array('I')
+    for i, heading in enumerate(starts):
+        start = data.find(b'\n', heading)
+        end = starts[i + 1] if i + 1 < len(starts) else len(data)
+        if start < 0:
+            start = end
+        raw = data[heading + 3:start]
+        name = HEADINGS.get(raw)
+        if name is None:
+            name = sys.intern(raw.decode('utf-8', 'replace').strip())
+            if len(HEADINGS) < MAX_HEADINGS:
+                HEADINGS[raw] = name
+        names.append(name)
+        offsets.append(start)
+        offsets.append(end)
+        # Only the few short sections behind the eager fields are decoded
+        if name == ASSESSMENT_SECTION:
+            scores = {}
+            for criterion, score in CRITERION_LINE_RE.findall(data, start, end):
+                criterion = criterion.strip().decode('utf-8', 'replace')
+                if criterion in CRITERIA:
+                    scores[criterion] = int(score)
+            idea.criteria = tuple(scores.get(criterion, 0) for criterion in CRITERIA) if scores else None
+        elif name == QUESTIONS_SECTION:
+            ticked = [answered for _, answered in checkboxes(data[start:end])]
+            idea.questions_answered = sum(ticked)
+            idea.questions_open = len(ticked) - idea.questions_answered
+        elif name == RELATED_SECTION and data.find(b'.md', start, end) >= 0:
+            idea.links = tuple(LINK_RE.findall(data[start:end].decode('utf-8', 'replace')))
+    # Ideas made from the same template share one tuple of section names
+    idea.names = SECTION_NAMES.setdefault(tuple(names), tuple(names))
+    idea.offsets = offsets
+    return idea
+
+def read_idea(path: str) -> Idea:
+    """Parse an idea file from disk into a compact Idea record"""
+    with open(path, 'rb') as f:
+        return parse_idea_bytes(f.read(), path)
@@ -0,0 +1,117 @@
+"""
+IdeaKit layout migration
+Reshards ideas/ in place into the flat, date or hash layout, rewriting Related Files links
+Run with: python3 -m ideakit reshard --layout LAYOUT [OPTIONS]
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List
+
+from . import index
+from .move import (MoveError, apply_journal, load_journal, plan_moves, roll_back_journal,
+                   write_journal)
+from .workspace import (IDEAS_DIR, LAYOUTS, UNSORTED, add_root_argument, find_root, load_layout,
+                        save_layout)
+
+def remove_empty_shards(root: str) -> int:
+    """Delete shard folders left empty, e.g. by a rolled back migration"""
+    removed = 0
+    top = os.path.join(root, IDEAS_DIR)
+    for folder in os.listdir(top) if os.path.isdir(top) else []:
+        directory = os.path.join(top, folder)
+        if not os.path.isdir(directory):
+            continue
+        with os.scandir(directory) as entries:
+            shards = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)
+                      and not entry.name.startswith('.')]
+        for shard in shards:
+            try:
+                os.rmdir(shard)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+def reshard(root: str, layout: str, dry_run: bool = False) -> Dict:
+    """Move every idea to where layout places it as one journaled batch and return the journal"""
+    if load_journal(root) is not None:
+        raise MoveError("an unfinished move batch exists, run with --resume or --rollback")
+    conn = index.open_index(root)
+    try:
+        index.refresh(root, conn)
+        rows = [row for row in index.search(conn, limit=-1) if row['status'] != UNSORTED]
+        journal = plan_moves(root, conn, rows, None, layout)
+    finally:
+        conn.close()
+    journal['previous_layout'] = load_layout(root)
+    if dry_run:
+        return journal
+    # Switch first so ideas created while the batch runs already land in the new layout
+    save_layout(root, layout)
+    if journal['moves']:
+        write_journal(root, journal)
+        apply_journal(root, journal)
+    return journal
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit reshard', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('--layout', choices=LAYOUTS,
+                        help="flat (ideas/<status>/), date (<status>/<YYYY-MM>/) or hash (<status>/<xx>/)")
+    parser.add_argument('--dry-run', action='store_true', help="Show the plan without moving anything")
+    parser.add_argument('--resume', action='store_true', help="Finish an interrupted migration from its journal")
+    parser.add_argument('--rollback', action='store_true', help="Undo an interrupted migration from its journal")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    if args.resume or args.rollback:
+        try:
+            journal = load_journal(root)
+        except MoveError as e:
+            print(f"❌ Error: {e}")
+            return 1
+        if journal is None:
+            print("ℹ️  No unfinished migration")
+            return 0
+        if args.rollback:
+            roll_back_journal(root, journal)
+            if journal.get('previous_layout'):
+                save_layout(root, journal['previous_layout'])
+            remove_empty_shards(root)
+            print(f"✅ Rolled back {len(journal['moves'])} moves, layout is {load_layout(root)}")
+        else:
+            apply_journal(root, journal)
+            print(f"✅ Finished {len(journal['moves'])} moves, layout is {load_layout(root)}")
+        return 0
+
+    if not args.layout:
+        parser.error("--layout is required")
+    started = time.perf_counter()
+    try:
+        journal = reshard(root, args.layout, args.dry_run)
+    except MoveError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    except OSError as e:
+        print(f"❌ Error: {e}")
+        print("ℹ️  Run 'python3 -m ideakit reshard --resume' or '--rollback' to settle the migration")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    moved = dict(journal['moves'])
+    linked = sum(1 for r in journal['rewrites'] if r['path'] not in moved)
+    relinked = len(journal['rewrites']) - linked
+    if args.dry_run:
+        for old, new in journal['moves'][:20]:
+            print(f"   {old} -> {new}")
+        if len(moved) > 20:
+            print(f"   ... and {len(moved) - 20} more")
+        print(f"ℹ️  Dry run: {len(moved)} ideas would move into the {args.layout} layout, "
+              f"{len(journal['rewrites'])} files would get updated links")
+        return 0
+    print(f"✅ Resharded {len(moved)} ideas into the {args.layout} layout "
+          f"({relinked} moved and {linked} other files relinked) in {elapsed:.2f}s")
+    return 0
@@ -0,0 +1,55 @@
+"""
+IdeaKit snapshot restore
+Returns the workspace to a snapshot, rewriting only the files that differ from it
+Run with: python3 -m ideakit restore [SNAPSHOT] [OPTIONS]
+"""
+
+import argparse
+import json
+from typing import List
+
+from .snapshot import SnapshotError, Store, add_store_arguments, restore, snapshot, store_path
+from .workspace import find_root
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit restore', description=__doc__.strip().splitlines()[1])
+    add_store_arguments(parser)
+    parser.add_argument('snapshot', nargs='?',
+                        help="Snapshot id or unique prefix (default: the latest non-backup snapshot)")
+    parser.add_argument('--dry-run', action='store_true', help="Show what would change without touching files")
+    parser.add_argument('--no-backup', action='store_true',
+                        help="Do not snapshot the current state before restoring")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    try:
+        record = Store(store_path(root, args.store)).record(args.snapshot)
+        backup = None
+        if not args.dry_run and not args.no_backup:
+            # Cheap, since only files changed since the last snapshot are stored
+            backup = snapshot(root, args.store, f"before restoring {record['id']}", args.workers,
+                              backup=True)
+        # The record resolved above: the backup just taken may have made its id prefix ambiguous
+        stats = restore(root, record['id'], args.store, args.dry_run, args.workers, record=record)
+    except (OSError, SnapshotError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(dict(stats, snapshot=record['id'], backup=backup and backup['id']), indent=2))
+        return 0
+    if args.dry_run:
+        for relpath in stats['writes']:
+            print(f"   write   {relpath}")
+        for relpath in stats['removals']:
+            print(f"   remove  {relpath}")
+        print(f"🔎 Restoring {record['id']} would write {stats['written']} files and remove "
+              f"{stats['removed']} ({stats['unchanged']} unchanged)")
+        return 0
+    if backup:
+        print(f"ℹ️  Current state saved as snapshot {backup['id']}")
+    print(f"✅ Restored {record['id']}: {stats['written']} files written, {stats['removed']} removed, "
+          f"{stats['unchanged']} unchanged")
+    return 0
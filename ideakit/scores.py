@@ -0,0 +1,225 @@
+"""
+IdeaKit score engine
+Column-oriented table of Constitution Assessment scores, re-weighted from the constitution
+Run with: python3 -m ideakit scores [OPTIONS]
+"""
+
+import argparse
+import heapq
+import json
+import operator
+import os
+import re
+import struct
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import index
+from .parser import ASSESSMENT_SECTION, CRITERIA, parse_assessment, parse_criteria_weights
+from .workspace import CONSTITUTION, add_root_argument, cache_path, find_root
+
+TABLE_FILE = 'scores.bin'
+TABLE_MAGIC = b'IKS1'
+HEADER = struct.Struct('<4sQI')  # magic, index generation, row count
+
+OPERATORS = {'>=': operator.ge, '<=': operator.le, '>': operator.gt,
+             '<': operator.lt, '==': operator.eq, '=': operator.eq, '!=': operator.ne}
+CONDITION_RE = re.compile(r'^\s*(?P<name>[A-Za-z ]+?)\s*(?P<op>>=|<=|==|!=|=|>|<)\s*(?P<value>\d+)\s*$')
+
+class ScoreTable:
+    """Criterion scores stored as one byte column per criterion (0 = unscored)"""
+
+    def __init__(self, paths: List[str], statuses: List[str], status_codes: array,
+                 columns: Dict[str, array], generation: int = 0):
+        self.paths = paths
+        self.statuses = statuses
+        self.status_codes = status_codes
+        self.columns = columns
+        self.generation = generation
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def weighted(self, weights: Dict[str, float]) -> List[float]:
+        """Weighted score out of 100 for every row in one pass over the columns"""
+        w = [weights.get(name, 0.0) for name in CRITERIA]
+        scale = 100.0 / (10.0 * (sum(w) or 1.0))
+        w0, w1, w2, w3, w4 = (x * scale for x in w)
+        return [a * w0 + b * w1 + c * w2 + d * w3 + e * w4
+                for a, b, c, d, e in zip(*(self.columns[name] for name in CRITERIA))]
+
+    def select(self, status: Optional[str] = None,
+               conditions: Sequence[Tuple[str, str, int]] = ()) -> Optional[List[bool]]:
+        """Row mask for a status folder and criterion conditions, None when unfiltered"""
+        mask = None
+        if status is not None:
+            code = self.statuses.index(status) if status in self.statuses else -1
+            mask = [c == code for c in self.status_codes]
+        for name, op, value in conditions:
+            compare = OPERATORS[op]
+            hits = [compare(v, value) for v in self.columns[name]]
+            mask = hits if mask is None else [m and h for m, h in zip(mask, hits)]
+        return mask
+
+    def rank(self, weights: Dict[str, float], top: int = 20, status: Optional[str] = None,
+             conditions: Sequence[Tuple[str, str, int]] = (),
+             minimum: Optional[float] = None) -> List[Tuple[int, float]]:
+        """Return (row, weighted score) of the best rows matching the filters"""
+        totals = self.weighted(weights)
+        mask = self.select(status, conditions)
+        rows = range(len(totals)) if mask is None else [i for i, keep in enumerate(mask) if keep]
+        if minimum is not None:
+            rows = [i for i in rows if totals[i] >= minimum]
+        best = heapq.nlargest(top, rows, key=totals.__getitem__)
+        return [(i, totals[i]) for i in best]
+
+    def row(self, i: int) -> Dict:
+        """Return one row as a dictionary"""
+        scores = {name: self.columns[name][i] for name in CRITERIA}
+        return {'path': self.paths[i], 'status': self.statuses[self.status_codes[i]],
+                'scores': scores, 'total': sum(scores.values())}
+
+def build_table(conn) -> ScoreTable:
+    """Build the score table from assessment sections stored in the index"""
+    paths = []
+    statuses = []
+    codes = array('B')
+    columns = {name: array('B') for name in CRITERIA}
+    rows = conn.execute("SELECT i.path, i.status, s.body FROM ideas i "
+                        "JOIN sections s ON s.path = i.path AND s.name = ? "
+                        "ORDER BY i.path", (ASSESSMENT_SECTION,))
+    for path, status, body in rows:
+        scores = parse_assessment(body)
+        if not scores:
+            continue
+        if status not in statuses:
+            statuses.append(status)
+        paths.append(path)
+        codes.append(statuses.index(status))
+        for name in CRITERIA:
+            columns[name].append(min(scores.get(name, 0), 255))
+    return ScoreTable(paths, statuses, codes, columns, index.generation(conn))
+
+def save_table(table: ScoreTable, path: str):
+    """Write the table as a header, status names, byte columns and a path blob"""
+    meta = json.dumps(table.statuses).encode('utf-8')
+    blob = '\n'.join(table.paths).encode('utf-8')
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(TABLE_MAGIC, table.generation, len(table)))
+        f.write(struct.pack('<I', len(meta)) + meta)
+        table.status_codes.tofile(f)
+        for name in CRITERIA:
+            table.columns[name].tofile(f)
+        f.write(blob)
+    os.replace(tmp, path)
+
+def load_saved_table(path: str) -> Optional[ScoreTable]:
+    """Read a table written by save_table, None if missing or unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            magic, generation, count = HEADER.unpack(f.read(HEADER.size))
+            if magic != TABLE_MAGIC:
+                return None
+            (size,) = struct.unpack('<I', f.read(4))
+            statuses = json.loads(f.read(size).decode('utf-8'))
+            codes = array('B')
+            codes.fromfile(f, count)
+            columns = {}
+            for name in CRITERIA:
+                columns[name] = array('B')
+                columns[name].fromfile(f, count)
+            blob = f.read().decode('utf-8')
+    except (OSError, EOFError, ValueError, struct.error):
+        return None
+    paths = blob.split('\n') if count else []
+    return ScoreTable(paths, statuses, codes, columns, generation)
+
+def load_table(root: str, refresh: bool = True) -> ScoreTable:
+    """Load the cached score table, rebuilding it only when the index changed"""
+    conn = index.open_index(root)
+    try:
+        if refresh:
+            index.refresh(root, conn)
+        path = cache_path(root, TABLE_FILE)
+        table = load_saved_table(path)
+        if table is None or table.generation != index.generation(conn):
+            table = build_table(conn)
+            save_table(table, path)
+        return table
+    finally:
+        conn.close()
+
+def load_weights(root: str) -> Dict[str, float]:
+    """Read criterion weights from the constitution, equal weights if none are listed"""
+    try:
+        with open(os.path.join(root, CONSTITUTION), 'r', encoding='utf-8') as f:
+            weights = parse_criteria_weights(f.read())
+    except OSError:
+        weights = {}
+    return weights or {name: 1.0 for name in CRITERIA}
+
+def parse_condition(text: str) -> Tuple[str, str, int]:
+    """Parse a filter such as 'Feasibility>=7'"""
+    match = CONDITION_RE.match(text)
+    if not match or match.group('name').strip() not in CRITERIA:
+        raise argparse.ArgumentTypeError(
+            f"invalid condition '{text}' (expected e.g. 'Feasibility>=7', criteria: {', '.join(CRITERIA)})")
+    return match.group('name').strip(), match.group('op'), int(match.group('value'))
+
+def parse_weights(text: str) -> Dict[str, float]:
+    """Parse a weight override such as 'Fun Factor=10,Feasibility=4'"""
+    weights = {}
+    for part in text.split(','):
+        name, _, value = part.partition('=')
+        if name.strip() not in CRITERIA:
+            raise argparse.ArgumentTypeError(f"unknown criterion '{name.strip()}'")
+        try:
+            weights[name.strip()] = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight '{part}'")
+    return weights
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit scores', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('--top', type=int, default=20, help="Number of ideas to show (default: 20)")
+    parser.add_argument('--status', help="Only rank ideas in this status folder")
+    parser.add_argument('--where', type=parse_condition, action='append', default=[],
+                        help="Criterion filter such as 'Feasibility>=7' (repeatable)")
+    parser.add_argument('--min', type=float, help="Minimum weighted score (0-100)")
+    parser.add_argument('--weights', type=parse_weights,
+                        help="Override some constitution weights, e.g. 'Fun Factor=10,Feasibility=4'")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--no-refresh', action='store_true',
+                        help="Rank the cached table without checking files for changes")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    table = load_table(root, refresh=not args.no_refresh)
+    # Criteria the override does not name keep their constitution weight
+    weights = dict(load_weights(root), **(args.weights or {}))
+
+    started = time.perf_counter()
+    ranked = table.rank(weights, args.top, args.status, args.where, args.min)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        results = []
+        for i, score in ranked:
+            row = table.row(i)
+            row['weighted'] = round(score, 2)
+            results.append(row)
+        print(json.dumps({'weights': weights, 'ranked': len(table), 'results': results},
+                         ensure_ascii=False, indent=2))
+        return 0
+
+    for position, (i, score) in enumerate(ranked, 1):
+        row = table.row(i)
+        scores = ' '.join(f"{v:>2}" for v in row['scores'].values())
+        print(f"{position:>3}. {score:5.1f}  [{scores}]  {row['path']}")
+    print(f"ℹ️  Ranked {len(table)} scored ideas in {elapsed:.1f} ms "
+          f"(weights: {', '.join(f'{k} {v:g}' for k, v in weights.items())})")
+    return 0
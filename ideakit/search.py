@@ -0,0 +1,566 @@
+"""
+IdeaKit ranked search
+BM25F full-text search over ideas/ and research/ with memory-mapped postings
+Run with: python3 -m ideakit search QUERY [OPTIONS]
+"""
+
+import argparse
+import bisect
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import struct
+import time
+from array import array
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .dedupe import STOPWORDS
+from .workspace import CACHE_DIR, IDEAS_DIR, add_root_argument, find_root, iter_idea_files, status_of
+
+SEARCH_DIR = 'search'
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+SEARCH_TREES = (IDEAS_DIR, 'research')
+
+# Fields scored separately; each section of a document is counted in exactly one
+FIELDS = ('title', 'idea', 'variations', 'body')
+FIELD_SECTIONS = {'Raw Idea': 1, 'Creative Variations': 2}
+DEFAULT_BOOSTS = {'title': 3.0, 'idea': 2.0, 'variations': 1.5, 'body': 1.0}
+K1 = 1.2
+B = 0.75
+
+# A posting is two uint32s: document id and four per-field term counts packed one byte each
+MAX_TF = 255
+# Postings buffered in memory before a segment is written; bounds memory while indexing
+FLUSH_POSTINGS = 2_000_000
+MAX_SEGMENTS = 8
+
+DOCS_HEADER = struct.Struct('<4sI4Q')  # magic, doc count, total length of each field
+TERMS_HEADER = struct.Struct('<4sI')   # magic, term count
+TERM_ENTRY = struct.Struct('<QIQI')    # term offset, term length, first posting, posting count
+DOCS_MAGIC = b'IKD1'
+TERMS_MAGIC = b'IKT1'
+TOKEN_RE = re.compile(r'\w{2,40}')
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens without stopwords, plural 's' stripped"""
+    return [w[:-1] if len(w) > 3 and w.endswith('s') else w
+            for w in TOKEN_RE.findall(text.lower()) if w not in STOPWORDS]
+
+def split_fields(text: str, fallback_title: str) -> List[str]:
+    """Split markdown into the text of each field"""
+    parts = [[], [], [], []]
+    title = None
+    field = 3
+    for line in text.splitlines():
+        if line.startswith('# ') and title is None:
+            title = line[2:]
+        elif line.startswith('[') and line.rstrip().endswith(']'):
+            continue  # unfilled template placeholder
+        elif line.startswith('## '):
+            field = FIELD_SECTIONS.get(line[3:].strip(), 3)
+            parts[3].append(line[3:])
+        else:
+            parts[field].append(line)
+    parts[0] = [title if title is not None else fallback_title]
+    return ['\n'.join(part) for part in parts]
+
+def iter_documents(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (relative path, stat) of every searchable markdown file"""
+    for top in SEARCH_TREES:
+        yield from iter_idea_files(root, top)
+
+class SegmentWriter:
+    """Accumulates postings in memory (SPIMI) and writes one immutable segment"""
+
+    def __init__(self):
+        self.postings = {}
+        self.buffered = 0
+        self.paths = []
+        self.stamps = []
+        self.lengths = array('I')
+        self.totals = [0, 0, 0, 0]
+
+    def add(self, relpath: str, st: os.stat_result, text: str):
+        """Index one document"""
+        doc = len(self.paths)
+        counts = {}
+        for field, part in enumerate(split_fields(text, os.path.basename(relpath)[:-len('.md')])):
+            tokens = tokenize(part)
+            self.lengths.append(len(tokens))
+            self.totals[field] += len(tokens)
+            shift = 8 * field
+            for term, tf in Counter(tokens).items():
+                counts[term] = counts.get(term, 0) | (min(tf, MAX_TF) << shift)
+        for term, packed in counts.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = array('I')
+            postings.append(doc)
+            postings.append(packed)
+        self.buffered += len(counts)
+        self.paths.append(relpath)
+        self.stamps.append((st.st_mtime_ns, st.st_size))
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def write(self, directory: str, name: str):
+        """Write <name>.docs, <name>.terms, <name>.post and an empty <name>.del"""
+        base = os.path.join(directory, name)
+        write_docs(base + '.docs', self.paths, self.stamps, self.lengths, self.totals)
+        terms = []
+        with open(base + '.post', 'wb') as post:
+            first = 0
+            for term in sorted(self.postings):
+                postings = self.postings[term]
+                postings.tofile(post)
+                terms.append((term.encode('utf-8'), first, len(postings) // 2))
+                first += len(postings) // 2
+        write_terms(base + '.terms', terms)
+        with open(base + '.del', 'wb') as f:
+            f.write(bytes((len(self.paths) + 7) // 8))
+
+def write_docs(path: str, paths: List[str], stamps: List[Tuple[int, int]], lengths: array, totals: List[int]):
+    """Docs file: header, field lengths, mtimes, sizes, path offsets, path blob"""
+    blob = '\n'.join(paths).encode('utf-8')
+    offsets = array('Q', [0])
+    for relpath in paths:
+        offsets.append(offsets[-1] + len(relpath.encode('utf-8')) + 1)
+    with open(path, 'wb') as f:
+        f.write(DOCS_HEADER.pack(DOCS_MAGIC, len(paths), *totals))
+        lengths.tofile(f)
+        array('q', [mtime for mtime, _ in stamps]).tofile(f)
+        array('q', [size for _, size in stamps]).tofile(f)
+        offsets.tofile(f)
+        f.write(blob)
+
+def write_terms(path: str, terms: List[Tuple[bytes, int, int]]):
+    """Terms file: header, fixed-size sorted entries, term blob"""
+    offset = 0
+    with open(path, 'wb') as f:
+        f.write(TERMS_HEADER.pack(TERMS_MAGIC, len(terms)))
+        for term, first, count in terms:
+            f.write(TERM_ENTRY.pack(offset, len(term), first, count))
+            offset += len(term)
+        for term, _, _ in terms:
+            f.write(term)
+
+def map_file(path: str):
+    """Memory-map a file read-only (empty files map to b'')"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+class Segment:
+    """Read-only view of one segment; postings and terms stay on disk behind mmap"""
+
+    def __init__(self, directory: str, name: str):
+        base = os.path.join(directory, name)
+        self.name = name
+        self.docs_map = map_file(base + '.docs')
+        magic, self.count, *totals = DOCS_HEADER.unpack_from(self.docs_map, 0)
+        if magic != DOCS_MAGIC:
+            raise ValueError(f"bad docs file {base}.docs")
+        self.totals = totals
+        n = self.count
+        start = DOCS_HEADER.size
+        view = memoryview(self.docs_map)
+        self.lengths = view[start:start + 16 * n].cast('I')
+        start += 16 * n
+        self.mtimes = view[start:start + 8 * n].cast('q')
+        start += 8 * n
+        self.sizes = view[start:start + 8 * n].cast('q')
+        start += 8 * n
+        self.offsets = view[start:start + 8 * (n + 1)].cast('Q')
+        self.blob_start = start + 8 * (n + 1)
+
+        self.terms_map = map_file(base + '.terms')
+        magic, self.term_count = TERMS_HEADER.unpack_from(self.terms_map, 0)
+        if magic != TERMS_MAGIC:
+            raise ValueError(f"bad terms file {base}.terms")
+        self.term_blob = TERMS_HEADER.size + TERM_ENTRY.size * self.term_count
+        self.post_map = map_file(base + '.post')
+        self.postings = memoryview(self.post_map).cast('I') if self.post_map else memoryview(b'').cast('I')
+        with open(base + '.del', 'rb') as f:
+            self.deleted = bytearray(f.read())
+        self.del_path = base + '.del'
+
+    def path(self, doc: int) -> str:
+        """Return the relative path of a document"""
+        start, end = self.offsets[doc], self.offsets[doc + 1] - 1
+        return bytes(self.docs_map[self.blob_start + start:self.blob_start + end]).decode('utf-8')
+
+    def is_deleted(self, doc: int) -> bool:
+        return bool(self.deleted[doc >> 3] & (1 << (doc & 7)))
+
+    def delete(self, doc: int):
+        self.deleted[doc >> 3] |= 1 << (doc & 7)
+
+    @property
+    def live(self) -> int:
+        return self.count - sum(bin(byte).count('1') for byte in self.deleted)
+
+    def deleted_docs(self) -> List[int]:
+        """Return the deleted document ids in ascending order"""
+        return [8 * i + bit for i, byte in enumerate(self.deleted) if byte
+                for bit in range(8) if byte & (1 << bit)]
+
+    def live_postings(self, first: int, n: int, gone: List[int]) -> int:
+        """Count the postings of a term that belong to live documents, given deleted_docs()"""
+        if not gone:
+            return n
+        if len(gone) > n:
+            postings = self.postings
+            return sum(1 for i in range(2 * first, 2 * (first + n), 2) if not self.is_deleted(postings[i]))
+        docs = self.postings[2 * first:2 * (first + n):2]
+        dead = 0
+        for doc in gone:
+            i = bisect.bisect_left(docs, doc)
+            if i < n and docs[i] == doc:
+                dead += 1
+        docs.release()
+        return n - dead
+
+    def entry(self, i: int) -> Tuple[bytes, int, int]:
+        """Return (term, first posting, posting count) of the i-th term"""
+        offset, length, first, count = TERM_ENTRY.unpack_from(self.terms_map, TERMS_HEADER.size + TERM_ENTRY.size * i)
+        start = self.term_blob + offset
+        return self.terms_map[start:start + length], first, count
+
+    def lookup(self, term: bytes) -> Optional[Tuple[int, int]]:
+        """Binary search the mmapped term table"""
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            found, first, count = self.entry(mid)
+            if found < term:
+                lo = mid + 1
+            elif found > term:
+                hi = mid
+            else:
+                return first, count
+        return None
+
+    def terms(self, number: int) -> Iterator[Tuple[bytes, int, int, int]]:
+        """Iterate (term, segment number, first posting, posting count) in term order"""
+        for i in range(self.term_count):
+            term, first, count = self.entry(i)
+            yield term, number, first, count
+
+    def close(self):
+        """Release the maps"""
+        self.lengths.release()
+        self.mtimes.release()
+        self.sizes.release()
+        self.offsets.release()
+        self.postings.release()
+        for mapped in (self.docs_map, self.terms_map, self.post_map):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+class SearchIndex:
+    """The segments listed in the manifest"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.directory = os.path.join(root, CACHE_DIR, SEARCH_DIR)
+        os.makedirs(self.directory, exist_ok=True)
+        self.manifest = self.load_manifest()
+        self.segments = [Segment(self.directory, name) for name in self.manifest['segments']]
+
+    def load_manifest(self) -> Dict:
+        """Read the manifest, starting empty if missing or from another version"""
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': MANIFEST_VERSION, 'next': 0, 'segments': []}
+
+    def save_manifest(self):
+        """Atomically publish the segment list, then drop files of unlisted segments"""
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f)
+        os.replace(path + '.tmp', path)
+        listed = set(self.manifest['segments'])
+        for name in os.listdir(self.directory):
+            stem = name.split('.', 1)[0]
+            if name != MANIFEST_FILE and stem not in listed and not name.endswith('.tmp'):
+                os.remove(os.path.join(self.directory, name))
+
+    def new_name(self) -> str:
+        """Reserve a segment name"""
+        name = f"seg{self.manifest['next']:06d}"
+        self.manifest['next'] += 1
+        return name
+
+    def refresh(self) -> Dict[str, int]:
+        """Tombstone changed/deleted documents and index new or changed files into new segments"""
+        stats = {'scanned': 0, 'updated': 0, 'removed': 0}
+        known = {}
+        for number, segment in enumerate(self.segments):
+            for doc in range(segment.count):
+                if not segment.is_deleted(doc):
+                    known[segment.path(doc)] = (number, doc)
+
+        changed = set()
+        writer = SegmentWriter()
+        for relpath, st in iter_documents(self.root):
+            stats['scanned'] += 1
+            location = known.pop(relpath, None)
+            if location is not None:
+                segment = self.segments[location[0]]
+                if (segment.mtimes[location[1]], segment.sizes[location[1]]) == (st.st_mtime_ns, st.st_size):
+                    continue
+                segment.delete(location[1])
+                changed.add(location[0])
+            try:
+                with open(os.path.join(self.root, relpath), 'r', encoding='utf-8', errors='replace') as f:
+                    writer.add(relpath, st, f.read())
+            except OSError:
+                continue
+            stats['updated'] += 1
+            if writer.buffered >= FLUSH_POSTINGS:
+                self.add_segment(writer)
+                writer = SegmentWriter()
+        for number, doc in known.values():
+            self.segments[number].delete(doc)
+            changed.add(number)
+            stats['removed'] += 1
+
+        for number in changed:
+            segment = self.segments[number]
+            with open(segment.del_path, 'wb') as f:
+                f.write(segment.deleted)
+        if len(writer):
+            self.add_segment(writer)
+        if stats['updated'] or stats['removed']:
+            if len(self.segments) > MAX_SEGMENTS or any(s.live < s.count // 2 for s in self.segments):
+                self.merge()
+            self.save_manifest()
+        return stats
+
+    def add_segment(self, writer: SegmentWriter):
+        """Write a buffered segment and list it"""
+        name = self.new_name()
+        writer.write(self.directory, name)
+        self.manifest['segments'].append(name)
+        self.segments.append(Segment(self.directory, name))
+
+    def merge(self):
+        """Merge all segments into one, dropping deleted documents, with a streaming k-way term merge"""
+        name = self.new_name()
+        base = os.path.join(self.directory, name)
+        remaps, paths, stamps, lengths, totals = [], [], [], array('I'), [0, 0, 0, 0]
+        for segment in self.segments:
+            remap = array('i', [-1]) * segment.count
+            for doc in range(segment.count):
+                if segment.is_deleted(doc):
+                    continue
+                remap[doc] = len(paths)
+                paths.append(segment.path(doc))
+                stamps.append((segment.mtimes[doc], segment.sizes[doc]))
+                doc_lengths = segment.lengths[4 * doc:4 * doc + 4].tolist()
+                lengths.extend(doc_lengths)
+                for field in range(4):
+                    totals[field] += doc_lengths[field]
+            remaps.append(remap)
+        write_docs(base + '.docs', paths, stamps, lengths, totals)
+
+        streams = [segment.terms(number) for number, segment in enumerate(self.segments)]
+        terms = []
+        written = 0
+        with open(base + '.post', 'wb') as post:
+            current, merged = None, array('I')
+            for term, number, first, count in heapq.merge(*streams):
+                if term != current:
+                    if merged:
+                        merged.tofile(post)
+                        terms.append((current, written, len(merged) // 2))
+                        written += len(merged) // 2
+                    current, merged = bytes(term), array('I')
+                postings, remap = self.segments[number].postings, remaps[number]
+                for i in range(2 * first, 2 * (first + count), 2):
+                    doc = remap[postings[i]]
+                    if doc >= 0:
+                        merged.append(doc)
+                        merged.append(postings[i + 1])
+            if merged:
+                merged.tofile(post)
+                terms.append((current, written, len(merged) // 2))
+        write_terms(base + '.terms', terms)
+        with open(base + '.del', 'wb') as f:
+            f.write(bytes((len(paths) + 7) // 8))
+
+        for segment in self.segments:
+            segment.close()
+        self.manifest['segments'] = [name]
+        self.segments = [Segment(self.directory, name)]
+
+    def search(self, query: str, boosts: Dict[str, float], limit: int = 10,
+               status: Optional[str] = None) -> List[Tuple[float, str]]:
+        """Rank documents by BM25F over the query terms"""
+        terms = sorted(set(tokenize(query)))
+        # Document counts, frequencies and length averages leave out deleted documents, so a
+        # document scores the same before and after a merge drops them
+        gone = [segment.deleted_docs() for segment in self.segments]
+        live = sum(segment.count - len(docs) for segment, docs in zip(self.segments, gone))
+        if not terms or not live:
+            return []
+        average = [max((sum(s.totals[f] for s in self.segments)
+                        - sum(s.lengths[4 * doc + f] for s, docs in zip(self.segments, gone) for doc in docs))
+                       / live, 1.0) for f in range(4)]
+        weights = [boosts.get(name, DEFAULT_BOOSTS[name]) for name in FIELDS]
+
+        found = []
+        for term in terms:
+            key = term.encode('utf-8')
+            hits = [(number, segment.lookup(key)) for number, segment in enumerate(self.segments)]
+            hits = [(number, hit) for number, hit in hits if hit]
+            df = sum(self.segments[number].live_postings(first, n, gone[number])
+                     for number, (first, n) in hits)
+            if df:
+                found.append((df, math.log(1 + (live - df + 0.5) / (df + 0.5)), hits))
+        found.sort(key=lambda item: item[0])
+
+        def filled(bound: float) -> bool:
+            """Whether limit results already score at least bound"""
+            filling = 0
+            for segment, doc_scores in zip(self.segments, scores):
+                for doc, score in doc_scores.items():
+                    if score >= bound and not segment.is_deleted(doc) and \
+                            (not status or status_of(segment.path(doc)) == status):
+                        filling += 1
+                        if filling >= limit:
+                            return True
+            return False
+
+        scores = [{} for _ in self.segments]
+        for position, (df, idf, hits) in enumerate(found):
+            # Terms in most documents barely move the ranking: once rarer terms have picked the
+            # candidates, look them up per candidate instead of walking their whole postings list.
+            # A document matching only this and later terms scores below the sum of their idfs, so
+            # this is safe once limit candidates score at least that much.
+            rescore_only = position > 0 and df > live // 2 and \
+                filled(sum(later[1] for later in found[position:]))
+            for number, (first, n) in hits:
+                segment, doc_scores = self.segments[number], scores[number]
+                postings, lengths = segment.postings, segment.lengths
+                if rescore_only:
+                    docs = postings[2 * first:2 * (first + n):2]
+                    matches = []
+                    for doc in doc_scores:
+                        i = bisect.bisect_left(docs, doc)
+                        if i < n and docs[i] == doc:
+                            matches.append(2 * (first + i))
+                    docs.release()
+                else:
+                    matches = range(2 * first, 2 * (first + n), 2)
+                for i in matches:
+                    doc, packed = postings[i], postings[i + 1]
+                    base = 4 * doc
+                    tf = 0.0
+                    for field in range(4):
+                        freq = (packed >> (8 * field)) & 0xFF
+                        if freq:
+                            norm = 1 - B + B * lengths[base + field] / average[field]
+                            tf += weights[field] * freq / norm
+                    doc_scores[doc] = doc_scores.get(doc, 0.0) + idf * tf / (K1 + tf)
+
+        ranked = ((score, segment, doc) for segment, doc_scores in zip(self.segments, scores)
+                  for doc, score in doc_scores.items() if not segment.is_deleted(doc))
+        if status:
+            ranked = ((score, segment, doc) for score, segment, doc in ranked
+                      if status_of(segment.path(doc)) == status)
+        best = heapq.nlargest(limit, ranked, key=lambda item: item[0])
+        return [(score, segment.path(doc)) for score, segment, doc in best]
+
+    def close(self):
+        """Release all segment maps"""
+        for segment in self.segments:
+            segment.close()
+
+def read_title(path: str) -> str:
+    """Return the first '# ' heading of a file for display"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f.read(8192).splitlines():
+                if line.startswith('# '):
+                    return line[2:].strip()
+    except OSError:
+        pass
+    return ''
+
+def parse_boosts(items: List[str]) -> Dict[str, float]:
+    """Parse --boost 'field=weight' options"""
+    boosts = {}
+    for item in items:
+        name, _, value = item.partition('=')
+        try:
+            boosts[FIELDS[FIELDS.index(name.strip())]] = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"invalid boost '{item}' (expected FIELD=WEIGHT, fields: {', '.join(FIELDS)})")
+    return boosts
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit search', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('query', nargs='?', help="Search words (any may match; rarer words weigh more)")
+    parser.add_argument('--limit', type=int, default=10, help="Number of results (default: 10)")
+    parser.add_argument('--status', help="Only ideas in this status folder")
+    parser.add_argument('--boost', action='append', default=[], metavar='FIELD=WEIGHT',
+                        help="Field weight: title, idea (Raw Idea), variations (Creative Variations), body")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--no-refresh', action='store_true', help="Search without indexing changed files")
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild the search index from scratch")
+    args = parser.parse_args(argv)
+
+    try:
+        boosts = parse_boosts(args.boost)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    root = find_root(args.root)
+    if args.rebuild:
+        shutil.rmtree(os.path.join(root, CACHE_DIR, SEARCH_DIR), ignore_errors=True)
+
+    started = time.perf_counter()
+    engine = SearchIndex(root)
+    try:
+        if not args.no_refresh or args.rebuild:
+            stats = engine.refresh()
+            if not args.query:
+                print(f"✅ Search index: {stats['scanned']} files ({stats['updated']} indexed, "
+                      f"{stats['removed']} removed) in {time.perf_counter() - started:.2f}s")
+                return 0
+        if not args.query:
+            parser.error("give a search query")
+        searched = time.perf_counter()
+        results = engine.search(args.query, boosts, args.limit, args.status)
+        elapsed = (time.perf_counter() - searched) * 1000
+    finally:
+        engine.close()
+
+    rows = [{'path': path, 'score': round(score, 3), 'title': read_title(os.path.join(root, path))}
+            for score, path in results]
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return 0
+    if not rows:
+        print(f"ℹ️  No matches for '{args.query}'")
+        return 0
+    print(f"🔎 {len(rows)} results for '{args.query}' ({elapsed:.1f} ms)")
+    for row in rows:
+        print(f"   {row['score']:6.2f}  {row['path']}  {row['title']}")
+    return 0
@@ -0,0 +1,350 @@
+"""
+IdeaKit workspace snapshots
+Stores the workspace in a local content-addressed, compressed chunk store; only changed files are read
+Run with: python3 -m ideakit snapshot [OPTIONS]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import stat
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .workspace import CACHE_DIR, add_root_argument, find_root
+
+STORE_DIR = '.ideakit/snapshots'
+OBJECTS_DIR = 'objects'
+RECORDS_DIR = 'records'
+# Files up to this size are one chunk; larger ones are split at fixed offsets
+CHUNK_SIZE = 1 << 20
+COMPRESS_LEVEL = 3
+# Never captured or touched by restore
+EXCLUDED = ('.git', CACHE_DIR, STORE_DIR, 'node_modules')
+
+# Tree entries: ['f', mode, size, mtime_ns, [chunk ids]], ['l', link target] or ['d', tree id]
+Tree = Dict[str, list]
+
+class SnapshotError(Exception):
+    """Raised for unknown snapshots or a damaged store"""
+
+class Store:
+    """Chunks and directory trees addressed by the SHA-256 of their content, zlib-compressed on disk"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.objects = os.path.join(path, OBJECTS_DIR)
+        self.records = os.path.join(path, RECORDS_DIR)
+        os.makedirs(self.objects, exist_ok=True)
+        os.makedirs(self.records, exist_ok=True)
+
+    def object_path(self, oid: str) -> str:
+        return os.path.join(self.objects, oid[:2], oid[2:])
+
+    def put(self, data: bytes) -> Tuple[str, int]:
+        """Store data once; return its id and the compressed bytes written (0 if already stored)"""
+        oid = hashlib.sha256(data).hexdigest()
+        path = self.object_path(oid)
+        if os.path.exists(path):
+            return oid, 0
+        packed = zlib.compress(data, COMPRESS_LEVEL)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{id(data)}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(packed)
+        os.replace(tmp, path)
+        return oid, len(packed)
+
+    def get(self, oid: str) -> bytes:
+        """Read and verify an object"""
+        try:
+            with open(self.object_path(oid), 'rb') as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error) as e:
+            raise SnapshotError(f"object {oid[:12]} is missing or damaged: {e}")
+        if hashlib.sha256(data).hexdigest() != oid:
+            raise SnapshotError(f"object {oid[:12]} is damaged")
+        return data
+
+    def put_tree(self, tree: Tree) -> Tuple[str, int]:
+        return self.put(json.dumps(tree, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+    def get_tree(self, oid: str) -> Tree:
+        return json.loads(self.get(oid).decode('utf-8'))
+
+    def list_records(self) -> List[Dict]:
+        """Snapshot records, oldest first"""
+        records = []
+        # Ids are timestamps, with a -N suffix for snapshots taken within the same second
+        for name in sorted(os.listdir(self.records), key=lambda name: (name[:15], len(name), name)):
+            if name.endswith('.json'):
+                with open(os.path.join(self.records, name), 'r', encoding='utf-8') as f:
+                    records.append(json.load(f))
+        return records
+
+    def record(self, snapshot_id: Optional[str] = None) -> Dict:
+        """Return a snapshot record by exact id or unique id prefix, the latest non-backup one when None"""
+        records = self.list_records()
+        if snapshot_id is None:
+            # Restoring the backup taken by the previous restore would undo that restore
+            taken = [r for r in records if not r.get('backup')]
+            if not taken:
+                raise SnapshotError("no snapshots yet" if not records else
+                                    "only restore backups so far: name the snapshot to restore")
+            return taken[-1]
+        # A full id always wins: X is a prefix of the X-2 taken in the same second
+        matches = [r for r in records if r['id'] == snapshot_id] or \
+            [r for r in records if r['id'].startswith(snapshot_id)]
+        if len(matches) != 1:
+            raise SnapshotError(f"{'ambiguous' if matches else 'unknown'} snapshot '{snapshot_id}'")
+        return matches[0]
+
+    def save_record(self, record: Dict):
+        path = os.path.join(self.records, record['id'] + '.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+def store_path(root: str, store: Optional[str] = None) -> str:
+    """Snapshot store location (default: .ideakit/snapshots in the workspace)"""
+    return os.path.abspath(store) if store else os.path.join(root, STORE_DIR)
+
+def excluded(relpath: str, store: str, root: str) -> bool:
+    """Check whether a workspace path is left out of snapshots"""
+    return relpath in EXCLUDED or os.path.join(root, relpath) == store
+
+def store_file(store: Store, path: str) -> Tuple[List[str], int]:
+    """Chunk, hash and store one file; return its chunk ids and the bytes newly written"""
+    chunks, written = [], 0
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data and chunks:
+                break
+            oid, size = store.put(data)
+            chunks.append(oid)
+            written += size
+            if len(data) < CHUNK_SIZE:
+                break
+    return chunks, written
+
+class Scan:
+    """One directory of the workspace, with unchanged entries copied from the previous snapshot"""
+
+    def __init__(self, relpath: str):
+        self.relpath = relpath
+        self.entries = {}  # type: Tree
+        self.children = {}  # type: Dict[str, Scan]
+
+def scan(root: str, store: Store, relpath: str, previous: Optional[Tree], pending: List, stats: Dict) -> Scan:
+    """Walk a directory; files whose size and mtime match the previous snapshot are not read"""
+    node = Scan(relpath)
+    previous = previous or {}
+    with os.scandir(os.path.join(root, relpath)) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            child = f"{relpath}/{entry.name}" if relpath else entry.name
+            if excluded(child, store.path, root):
+                continue
+            old = previous.get(entry.name)
+            if entry.is_symlink():
+                node.entries[entry.name] = ['l', os.readlink(entry.path)]
+            elif entry.is_dir():
+                sub = store.get_tree(old[1]) if old and old[0] == 'd' else None
+                node.children[entry.name] = scan(root, store, child, sub, pending, stats)
+            elif entry.is_file():
+                st = entry.stat()
+                stats['files'] += 1
+                stats['bytes'] += st.st_size
+                mode = stat.S_IMODE(st.st_mode)
+                if old and old[0] == 'f' and old[2:4] == [st.st_size, st.st_mtime_ns]:
+                    node.entries[entry.name] = ['f', mode, st.st_size, st.st_mtime_ns, old[4]]
+                else:
+                    node.entries[entry.name] = ['f', mode, st.st_size, st.st_mtime_ns, None]
+                    pending.append((node, entry.name, entry.path))
+    return node
+
+def write_trees(store: Store, node: Scan, stats: Dict) -> str:
+    """Store the trees bottom-up; unchanged directories hash to objects already stored"""
+    for name, child in node.children.items():
+        node.entries[name] = ['d', write_trees(store, child, stats)]
+    oid, written = store.put_tree(node.entries)
+    stats['stored'] += written
+    return oid
+
+def snapshot(root: str, store_dir: Optional[str] = None, message: str = '',
+             workers: Optional[int] = None, backup: bool = False) -> Dict:
+    """Capture the workspace, reading only files changed since the last snapshot"""
+    store = Store(store_path(root, store_dir))
+    records = store.list_records()
+    parent = records[-1] if records else None
+    stats = {'files': 0, 'bytes': 0, 'changed': 0, 'stored': 0}
+    pending = []
+    started = time.perf_counter()
+    tree = scan(root, store, '', store.get_tree(parent['tree']) if parent else None, pending, stats)
+
+    # zlib and hashlib release the GIL on large buffers, so threads overlap reading, hashing and compression
+    def work(item):
+        node, name, path = item
+        try:
+            return item, store_file(store, path)
+        except OSError:
+            return item, None
+
+    with ThreadPoolExecutor(max_workers=workers or min(8, (os.cpu_count() or 1) + 2)) as pool:
+        for (node, name, _), result in pool.map(work, pending):
+            if result is None:
+                # Vanished or unreadable since the scan
+                del node.entries[name]
+                continue
+            node.entries[name][4] = result[0]
+            stats['changed'] += 1
+            stats['stored'] += result[1]
+    tree_id = write_trees(store, tree, stats)
+
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    taken = {r['id'] for r in records}
+    snapshot_id, number = stamp, 1
+    while snapshot_id in taken:
+        number += 1
+        snapshot_id = f"{stamp}-{number}"
+    record = {'id': snapshot_id, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'message': message,
+              'tree': tree_id, 'parent': parent['id'] if parent else None, 'files': stats['files'],
+              'bytes': stats['bytes'], 'changed': stats['changed'], 'stored': stats['stored'],
+              'seconds': round(time.perf_counter() - started, 3)}
+    if parent and parent['tree'] == tree_id:
+        record['unchanged'] = True
+    if backup:
+        record['backup'] = True
+    store.save_record(record)
+    return record
+
+def restore(root: str, snapshot_id: Optional[str] = None, store_dir: Optional[str] = None,
+            dry_run: bool = False, workers: Optional[int] = None,
+            record: Optional[Dict] = None) -> Dict[str, int]:
+    """Make the workspace match a snapshot (or a record already resolved), writing only files that differ"""
+    store = Store(store_path(root, store_dir))
+    record = record or store.record(snapshot_id)
+    stats = {'written': 0, 'removed': 0, 'unchanged': 0}
+    writes, removals, directories = [], [], []
+
+    def plan(tree_id: str, relpath: str):
+        directory = os.path.join(root, relpath)
+        target = store.get_tree(tree_id)
+        try:
+            current = {entry.name: entry for entry in os.scandir(directory)}
+        except FileNotFoundError:
+            current = {}
+        for name in sorted(set(current) - set(target)):
+            child = f"{relpath}/{name}" if relpath else name
+            if not excluded(child, store.path, root):
+                removals.append(child)
+        for name, entry in sorted(target.items()):
+            child = f"{relpath}/{name}" if relpath else name
+            existing = current.get(name)
+            if entry[0] == 'd':
+                if existing is None or existing.is_symlink() or not existing.is_dir():
+                    if existing is not None:
+                        removals.append(child)
+                    directories.append(child)
+                plan(entry[1], child)
+            elif entry[0] == 'l':
+                if existing is None or not existing.is_symlink() or os.readlink(existing.path) != entry[1]:
+                    writes.append((child, entry))
+                else:
+                    stats['unchanged'] += 1
+            else:
+                st = existing.stat(follow_symlinks=False) if existing is not None else None
+                if st is not None and stat.S_ISREG(st.st_mode) and (st.st_size, st.st_mtime_ns) == \
+                        (entry[2], entry[3]) and stat.S_IMODE(st.st_mode) == entry[1]:
+                    stats['unchanged'] += 1
+                else:
+                    if existing is not None and existing.is_dir(follow_symlinks=False):
+                        removals.append(child)
+                    writes.append((child, entry))
+
+    plan(record['tree'], '')
+    stats['written'], stats['removed'] = len(writes), len(removals)
+    if dry_run:
+        return dict(stats, writes=[path for path, _ in writes], removals=removals)
+
+    for relpath in removals:
+        path = os.path.join(root, relpath)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    for relpath in directories:
+        os.makedirs(os.path.join(root, relpath), exist_ok=True)
+
+    def write(item):
+        relpath, entry = item
+        path = os.path.join(root, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.ikrestore.tmp"
+        if entry[0] == 'l':
+            os.symlink(entry[1], tmp)
+        else:
+            with open(tmp, 'wb') as f:
+                for oid in entry[4]:
+                    f.write(store.get(oid))
+            os.chmod(tmp, entry[1])
+            os.utime(tmp, ns=(entry[3], entry[3]))
+        os.replace(tmp, path)
+
+    with ThreadPoolExecutor(max_workers=workers or min(8, (os.cpu_count() or 1) + 2)) as pool:
+        list(pool.map(write, writes))
+    return stats
+
+def format_size(size: float) -> str:
+    """Human-readable byte count"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def add_store_arguments(parser: argparse.ArgumentParser):
+    """Options shared by snapshot and restore"""
+    add_root_argument(parser)
+    parser.add_argument('--store', help=f"Snapshot store directory (default: {STORE_DIR})")
+    parser.add_argument('--workers', type=int, help="Threads reading and writing files")
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit snapshot', description=__doc__.strip().splitlines()[1])
+    add_store_arguments(parser)
+    parser.add_argument('-m', '--message', default='', help="Note stored with the snapshot")
+    parser.add_argument('--list', action='store_true', help="List snapshots instead of taking one")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    if args.list:
+        records = Store(store_path(root, args.store)).list_records()
+        if args.json:
+            print(json.dumps(records, indent=2))
+            return 0
+        if not records:
+            print("ℹ️  No snapshots yet")
+        for record in records:
+            print(f"{record['id']}  {record['files']:8d} files  {format_size(record['bytes']):>9}  "
+                  f"+{format_size(record['stored']):>9}  {record['message']}"
+                  + ("  (backup)" if record.get('backup') else ''))
+        return 0
+
+    try:
+        record = snapshot(root, args.store, args.message, args.workers)
+    except (OSError, SnapshotError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    if args.json:
+        print(json.dumps(record, indent=2))
+        return 0
+    print(f"✅ Snapshot {record['id']}: {record['files']} files ({format_size(record['bytes'])}), "
+          f"{record['changed']} read, {format_size(record['stored'])} stored in {record['seconds']:.2f}s")
+    if record.get('unchanged'):
+        print(f"ℹ️  Nothing changed since {record['parent']}")
+    return 0
@@ -0,0 +1,232 @@
+"""
+IdeaKit project status
+Cached status snapshot (.ideakit/cache/status.json) maintained from the change log
+Run with: python3 -m ideakit status [OPTIONS]
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from . import changelog, index
+from .workspace import (IDEAS_DIR, STATUS_FOLDERS, add_root_argument, cache_path,
+                        find_root, load_layout, status_of)
+
+STATUS_FILE = 'status.json'
+SNAPSHOT_VERSION = 1
+MAX_SCORE = 50
+RECENT_SHOWN = 10
+RECENT_KEPT = 25
+# Rescans truncate the change log once it grows past this size
+LOG_COMPACT_BYTES = 1 << 20
+
+def watched_dirs(root: str) -> Dict[str, int]:
+    """Return mtimes of ideas/, its folders and their shards; adding or removing a file changes them"""
+    dirs = {}
+    sharded = load_layout(root) != 'flat'
+    top = os.path.join(root, IDEAS_DIR)
+    try:
+        dirs[IDEAS_DIR] = os.stat(top).st_mtime_ns
+        with os.scandir(top) as entries:
+            folders = [entry for entry in entries
+                       if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.')]
+    except OSError:
+        return dirs
+    for folder in folders:
+        relpath = IDEAS_DIR + '/' + folder.name
+        try:
+            dirs[relpath] = folder.stat().st_mtime_ns
+            if not sharded:
+                continue
+            # Shard folders hold the files; status folders only hold shards, so listing them is cheap
+            with os.scandir(folder.path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.'):
+                        dirs[relpath + '/' + entry.name] = entry.stat().st_mtime_ns
+        except OSError:
+            pass
+    return dirs
+
+def empty_state() -> Dict:
+    """Return bookkeeping for a workspace without ideas"""
+    return {'log_offset': 0, 'dirs': {}, 'counts': {}, 'histograms': {}, 'recent': []}
+
+def add_score(state: Dict, status: str, score: Optional[int], delta: int):
+    """Adjust the per-folder score histogram"""
+    if score is None:
+        return
+    histogram = state['histograms'].setdefault(status, [0] * (MAX_SCORE + 1))
+    score = max(0, min(MAX_SCORE, int(score)))
+    histogram[score] = max(0, histogram[score] + delta)
+
+def add_recent(state: Dict, idea: Dict):
+    """Insert an idea into the recent list, newest capture date first"""
+    recent = [r for r in state['recent'] if r['path'] != idea['path']]
+    recent.append(idea)
+    recent.sort(key=lambda r: (r.get('captured') or '', r['path']), reverse=True)
+    state['recent'] = recent[:RECENT_KEPT]
+
+def apply_change(state: Dict, change: Dict):
+    """Apply one change log entry to the snapshot state"""
+    path = change.get('path', '')
+    status = status_of(path)
+    counts = state['counts']
+    op = change.get('op')
+    if op == 'add':
+        counts[status] = counts.get(status, 0) + 1
+        add_score(state, status, change.get('score'), 1)
+        add_recent(state, {'path': path, 'status': status, 'title': change.get('title', ''),
+                           'captured': change.get('captured'), 'score': change.get('score')})
+    elif op == 'remove':
+        counts[status] = max(0, counts.get(status, 0) - 1)
+        add_score(state, status, change.get('score'), -1)
+        state['recent'] = [r for r in state['recent'] if r['path'] != path]
+    elif op == 'update':
+        add_score(state, status, change.get('old_score'), -1)
+        add_score(state, status, change.get('score'), 1)
+        if any(r['path'] == path for r in state['recent']):
+            add_recent(state, {'path': path, 'status': status, 'title': change.get('title', ''),
+                               'captured': change.get('captured'), 'score': change.get('score')})
+
+def rebuild_state(root: str) -> Dict:
+    """Rebuild the snapshot state from the idea index"""
+    if changelog.size(root) > LOG_COMPACT_BYTES:
+        changelog.truncate(root)
+    state = empty_state()
+    state['log_offset'] = changelog.size(root)
+    state['dirs'] = watched_dirs(root)
+
+    conn = index.open_index(root)
+    try:
+        index.refresh(root, conn)
+        for status, count in conn.execute("SELECT status, COUNT(*) FROM ideas GROUP BY status"):
+            state['counts'][status] = count
+        for status, score in conn.execute("SELECT status, score FROM ideas WHERE score IS NOT NULL"):
+            add_score(state, status, score, 1)
+        columns = ('path', 'status', 'title', 'captured', 'score')
+        state['recent'] = [dict(zip(columns, row)) for row in conn.execute(
+            "SELECT path, status, title, captured, score FROM ideas "
+            "ORDER BY captured DESC, path DESC LIMIT ?", (RECENT_KEPT,))]
+    finally:
+        conn.close()
+    return state
+
+def summarize(histogram: List[int]) -> Dict:
+    """Return scored count, average and best score of a histogram"""
+    scored = sum(histogram)
+    total = sum(score * n for score, n in enumerate(histogram))
+    best = max((score for score, n in enumerate(histogram) if n), default=None)
+    return {'scored': scored, 'average': round(total / scored, 1) if scored else None, 'best': best}
+
+def render(state: Dict) -> Dict:
+    """Build the JSON document read by ik-status from the snapshot state"""
+    folders = {}
+    combined = [0] * (MAX_SCORE + 1)
+    names = list(STATUS_FOLDERS) + sorted(set(state['counts']) - set(STATUS_FOLDERS))
+    for name in names:
+        histogram = state['histograms'].get(name, [0] * (MAX_SCORE + 1))
+        combined = [a + b for a, b in zip(combined, histogram)]
+        folders[name] = dict(count=state['counts'].get(name, 0), **summarize(histogram))
+    return {
+        'version': SNAPSHOT_VERSION,
+        'updated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'total': sum(state['counts'].values()),
+        'folders': folders,
+        'scores': summarize(combined),
+        'recent': state['recent'][:RECENT_SHOWN],
+        '_state': state,
+    }
+
+def load_snapshot(root: str) -> Optional[Dict]:
+    """Read the cached snapshot, None if missing or from another version"""
+    try:
+        with open(cache_path(root, STATUS_FILE), 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get('version') != SNAPSHOT_VERSION or '_state' not in snapshot:
+        return None
+    return snapshot
+
+def save_snapshot(root: str, snapshot: Dict):
+    """Atomically replace the snapshot file"""
+    path = cache_path(root, STATUS_FILE)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+def update_status(root: str, rescan: bool = False) -> Dict:
+    """Update the snapshot from the change log, rescanning only when a folder changed outside IdeaKit"""
+    snapshot = None if rescan else load_snapshot(root)
+    if snapshot is None:
+        state = rebuild_state(root)
+    else:
+        state = snapshot['_state']
+        entries, state['log_offset'] = changelog.read_since(root, state['log_offset'])
+        for change in entries:
+            apply_change(state, change)
+        for change in entries:
+            # IdeaKit tools record folder mtimes after their own writes (None: folder removed)
+            for folder, mtime in change.get('dirs', {}).items():
+                if mtime is None:
+                    state['dirs'].pop(folder, None)
+                else:
+                    state['dirs'][folder] = mtime
+        # Only a changed folder mtime (a file added, removed or renamed outside IdeaKit) costs a per-file
+        # stat pass; ideas edited in place are picked up by `ideakit watch` or `status --rescan`
+        if watched_dirs(root) != state['dirs']:
+            state = rebuild_state(root)
+        elif not entries:
+            return snapshot
+
+    snapshot = render(state)
+    save_snapshot(root, snapshot)
+    return snapshot
+
+def dir_mtimes(root: str, paths: List[str]) -> Dict[str, Optional[int]]:
+    """Return current mtimes of the folders containing paths and their parents (None if removed)"""
+    dirs = {}
+    for path in paths:
+        folder = os.path.dirname(path)
+        # Creating or removing a shard folder changes its status folder too
+        while folder and folder not in dirs:
+            try:
+                dirs[folder] = os.stat(os.path.join(root, folder)).st_mtime_ns
+            except OSError:
+                dirs[folder] = None
+            folder = os.path.dirname(folder)
+    return dirs
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit status', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('--json', action='store_true', help="Print the snapshot as JSON")
+    parser.add_argument('--rescan', action='store_true', help="Rebuild the snapshot from a full scan")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    started = time.perf_counter()
+    snapshot = update_status(root, args.rescan)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        public = {k: v for k, v in snapshot.items() if not k.startswith('_')}
+        print(json.dumps(public, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"📊 IdeaKit status: {snapshot['total']} ideas")
+    for name, folder in snapshot['folders'].items():
+        average = f"avg {folder['average']}/50" if folder['average'] is not None else "no scores"
+        print(f"   {name + '/':<14} {folder['count']:>7}  {average}")
+    if snapshot['recent']:
+        print()
+        print("🕒 Recent ideas:")
+        for idea in snapshot['recent']:
+            score = f"{idea['score']}/50" if idea.get('score') is not None else "-"
+            print(f"   {idea.get('captured') or '----------'}  {score:>5}  {idea['path']}")
+    print(f"ℹ️  Snapshot updated in {elapsed:.1f} ms")
+    return 0
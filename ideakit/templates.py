@@ -0,0 +1,109 @@
+"""
+IdeaKit template renderer
+Compiles installed templates (.ideakit/templates/*.md) once into literal and placeholder parts
+"""
+
+import os
+import re
+from typing import Dict, List, Tuple, Union
+
+from .parser import CRITERIA
+
+TEMPLATES_DIR = '.ideakit/templates'
+
+KEY_RE = re.compile(r'\[([A-Z][A-Z0-9_/]*)\]')
+FIELD_RE = re.compile(r'^(\*\*(?P<label>[^*]+):\*\*\s*)\[(?P<default>[^\]]*)\]\s*$')
+SCORE_RE = re.compile(r'^(?P<prefix>\s*[-*]\s*\*\*(?P<name>[^*]+?):\*\*\s*)\[(?P<score>[^\]]*)\]'
+                      r'(?P<sep>\s*-\s*)\[(?P<reason>[^\]]*)\](?P<rest>.*)$')
+QUESTION_RE = re.compile(r'^(?P<prefix>\s*-\s*\[ \]\s*)\[(?P<default>Question (?P<n>\d+))\]\s*$')
+LINK_RE = re.compile(r'^(?P<prefix>\s*-\s*(?P<label>[A-Za-z ]+):\s*)\[(?P<default>[^\]]*)\]\s*$')
+SECTION_BODY_RE = re.compile(r'^\[(?P<default>[^\]]*)\]\s*$')
+
+Part = Union[str, Tuple[str, str]]
+
+class Template:
+    """A template compiled into literal strings and (key, default) placeholders
+
+    Keys: 'TITLE', 'DATE', 'X/50' and other [UPPERCASE] markers; 'field:<Label>'
+    for '**Label:** [..]' header lines; 'section:<Name>' for sections whose
+    body is a single placeholder; 'score:<Criterion>' / 'reason:<Criterion>'
+    for assessment lines; 'question:<N>' and 'link:<Label>' for list items.
+    Missing values render as the original placeholder text.
+    """
+
+    __slots__ = ('name', 'parts', 'keys')
+
+    def __init__(self, text: str, name: str = ''):
+        self.name = name
+        self.parts = compile_parts(text)
+        self.keys = [part[0] for part in self.parts if isinstance(part, tuple)]
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill placeholders from values in one pass over the compiled parts"""
+        get = values.get
+        return ''.join(part if part.__class__ is str else (get(part[0]) or part[1])
+                       for part in self.parts)
+
+def compile_inline(line: str, parts: List[Part]):
+    """Split [UPPERCASE] markers out of a literal line"""
+    last = 0
+    for match in KEY_RE.finditer(line):
+        parts.append(line[last:match.start()])
+        parts.append((match.group(1), match.group(0)))
+        last = match.end()
+    parts.append(line[last:])
+
+def compile_parts(text: str) -> List[Part]:
+    """Compile template text into literal strings and (key, default) placeholders"""
+    parts = []
+    section = None
+    for line in text.splitlines(True):
+        body = line.rstrip('\n')
+        newline = line[len(body):]
+        if body.startswith('## '):
+            section = body[3:].strip()
+            parts.append(line)
+            continue
+
+        match = SCORE_RE.match(body)
+        if match and match.group('name').strip() in CRITERIA:
+            name = match.group('name').strip()
+            parts.extend([match.group('prefix'), ('score:' + name, '[' + match.group('score') + ']'),
+                          match.group('sep'), ('reason:' + name, '[' + match.group('reason') + ']'),
+                          match.group('rest') + newline])
+            continue
+        match = QUESTION_RE.match(body)
+        if match:
+            parts.extend([match.group('prefix'),
+                          ('question:' + match.group('n'), '[' + match.group('default') + ']'), newline])
+            continue
+        match = FIELD_RE.match(body)
+        if match and not KEY_RE.fullmatch('[' + match.group('default') + ']'):
+            parts.extend([match.group(1), ('field:' + match.group('label').strip(),
+                                           '[' + match.group('default') + ']'), newline])
+            continue
+        match = LINK_RE.match(body)
+        if match:
+            parts.extend([match.group('prefix'), ('link:' + match.group('label').strip(),
+                                                  '[' + match.group('default') + ']'), newline])
+            continue
+        match = SECTION_BODY_RE.match(body)
+        if match and section is not None and not KEY_RE.fullmatch(body.strip()):
+            parts.extend([('section:' + section, body), newline])
+            continue
+        compile_inline(line, parts)
+
+    # Merge adjacent literals so rendering joins as few strings as possible
+    merged = []
+    for part in parts:
+        if isinstance(part, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += part
+        elif part != '':
+            merged.append(part)
+    return merged
+
+def load_template(root: str, name: str) -> Template:
+    """Compile an installed template such as 'idea-seed' or 'creative-expansion'"""
+    filename = name if name.endswith('.md') else name + '.md'
+    with open(os.path.join(root, TEMPLATES_DIR, filename), 'r', encoding='utf-8') as f:
+        return Template(f.read(), name)
@@ -0,0 +1,422 @@
+"""
+IdeaKit watch daemon
+Keeps an in-memory model of the workspace current via inotify (or polling) and publishes
+it to .ideakit/cache/workspace.json, keeping the status snapshot and index warm as well
+Run with: python3 -m ideakit watch [OPTIONS]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import select
+import signal
+import struct
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from . import changelog, domains, index
+from .parser import parse_criteria_weights, read_idea
+from .status import RECENT_KEPT, add_score, render, save_snapshot, watched_dirs
+from .workspace import CONSTITUTION, IDEAS_DIR, add_root_argument, cache_path, find_root, status_of
+
+SNAPSHOT_FILE = 'workspace.json'
+SNAPSHOT_VERSION = 1
+# Folders whose files are listed in the snapshot next to the ideas
+FILE_TREES = ('research', 'prototypes')
+TREES = (IDEAS_DIR,) + FILE_TREES
+# Idea fields published in workspace.json
+PUBLIC = ('path', 'status', 'title', 'captured', 'stage', 'score', 'scores', 'links')
+DEBOUNCE = 0.2
+MAX_DELAY = 2.0
+POLL_INTERVAL = 1.0
+
+# inotify(7) constants
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT = struct.Struct('iIII')
+
+def walk_files(root: str, top: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (relative path, stat) for every non-hidden file under top"""
+    stack = [(os.path.join(root, top), top.rstrip('/') + '/')]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, prefix + entry.name + '/'))
+                elif entry.is_file():
+                    yield prefix + entry.name, entry.stat()
+
+def idea_record(root: str, relpath: str, st: os.stat_result) -> Dict:
+    """Parse one idea into its snapshot record"""
+    idea = read_idea(os.path.join(root, relpath))
+    record = {
+        'path': relpath, 'status': status_of(relpath), 'title': idea.title,
+        'captured': idea.captured, 'stage': idea.stage, 'score': idea.score,
+        'scores': idea.scores, 'links': list(idea.links),
+        'mtime_ns': st.st_mtime_ns, 'size': st.st_size,
+    }
+    # Serialized once per parse, so publishing does not re-encode every idea
+    record['json'] = json.dumps({key: record[key] for key in PUBLIC}, ensure_ascii=False,
+                                separators=(',', ':'))
+    return record
+
+class WorkspaceModel:
+    """Ideas, research/prototype listings and constitution weights, updated incrementally"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.ideas = {}
+        self.files = {}
+        self.constitution = {}
+
+    def scan(self) -> bool:
+        """Re-stat the whole workspace, parsing only files whose mtime or size changed"""
+        changed = self.load_constitution()
+        seen = set()
+        for relpath, st in walk_files(self.root, IDEAS_DIR):
+            if relpath.endswith('.md'):
+                seen.add(relpath)
+                changed |= self.update_idea(relpath, st)
+        for relpath in set(self.ideas) - seen:
+            del self.ideas[relpath]
+            changed = True
+        listing = {relpath: (st.st_mtime_ns, st.st_size) for top in FILE_TREES for relpath, st in walk_files(self.root, top)}
+        changed |= listing != self.files
+        self.files = listing
+        return changed
+
+    def update(self, paths: Set[str]) -> bool:
+        """Refresh the given workspace-relative files or folders"""
+        changed = False
+        for relpath in paths:
+            if relpath == CONSTITUTION:
+                changed |= self.load_constitution()
+                continue
+            full = os.path.join(self.root, relpath)
+            if os.path.isdir(full):
+                for top_path, st in walk_files(self.root, relpath):
+                    changed |= self.update_file(top_path, st)
+                continue
+            try:
+                st = os.stat(full)
+            except OSError:
+                changed |= self.remove(relpath)
+                continue
+            changed |= self.update_file(relpath, st)
+        return changed
+
+    def update_file(self, relpath: str, st: os.stat_result) -> bool:
+        """Refresh one file of any tracked tree"""
+        if relpath.startswith(IDEAS_DIR + '/'):
+            return relpath.endswith('.md') and self.update_idea(relpath, st)
+        if self.files.get(relpath) == (st.st_mtime_ns, st.st_size):
+            return False
+        self.files[relpath] = (st.st_mtime_ns, st.st_size)
+        return True
+
+    def update_idea(self, relpath: str, st: os.stat_result) -> bool:
+        """Re-parse an idea if it changed since it was last parsed"""
+        known = self.ideas.get(relpath)
+        if known and (known['mtime_ns'], known['size']) == (st.st_mtime_ns, st.st_size):
+            return False
+        try:
+            self.ideas[relpath] = idea_record(self.root, relpath, st)
+        except OSError:
+            return self.remove(relpath)
+        return True
+
+    def remove(self, relpath: str) -> bool:
+        """Forget a deleted file or every file under a deleted folder"""
+        prefix = relpath.rstrip('/') + '/'
+        gone = [p for p in self.ideas if p == relpath or p.startswith(prefix)]
+        for p in gone:
+            del self.ideas[p]
+        files = [p for p in self.files if p == relpath or p.startswith(prefix)]
+        for p in files:
+            del self.files[p]
+        return bool(gone or files)
+
+    def load_constitution(self) -> bool:
+        """Reload criterion weights when the constitution changed"""
+        path = os.path.join(self.root, CONSTITUTION)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if mtime == self.constitution.get('mtime_ns'):
+                return False
+            with open(path, 'r', encoding='utf-8') as f:
+                weights = parse_criteria_weights(f.read())
+        except OSError:
+            changed = bool(self.constitution)
+            self.constitution = {}
+            return changed
+        self.constitution = {'mtime_ns': mtime, 'weights': weights}
+        return True
+
+    def snapshot(self) -> str:
+        """Serialize the published workspace document"""
+        counts = {}
+        for idea in self.ideas.values():
+            counts[idea['status']] = counts.get(idea['status'], 0) + 1
+        head = json.dumps({
+            'version': SNAPSHOT_VERSION,
+            'updated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'watcher': os.getpid(),
+            'constitution': {'weights': self.constitution.get('weights', {})},
+            'counts': counts,
+        }, ensure_ascii=False, separators=(',', ':'))
+        ideas = ','.join(self.ideas[p]['json'] for p in sorted(self.ideas))
+        files = json.dumps(sorted(self.files), ensure_ascii=False, separators=(',', ':'))
+        return f'{head[:-1]},"ideas":[{ideas}],"files":{files}}}'
+
+    def status_state(self) -> Dict:
+        """Build the status snapshot state directly from the model"""
+        state = {'log_offset': changelog.size(self.root), 'dirs': watched_dirs(self.root),
+                 'counts': {}, 'histograms': {}, 'recent': []}
+        for idea in self.ideas.values():
+            state['counts'][idea['status']] = state['counts'].get(idea['status'], 0) + 1
+            add_score(state, idea['status'], idea['score'], 1)
+        newest = heapq.nlargest(RECENT_KEPT, self.ideas.values(),
+                                key=lambda i: (i['captured'] or '', i['path']))
+        state['recent'] = [{key: idea[key] for key in ('path', 'status', 'title', 'captured', 'score')}
+                           for idea in newest]
+        return state
+
+class Inotify:
+    """Recursive inotify watches on the workspace trees (Linux only)"""
+
+    def __init__(self, root: str):
+        import ctypes
+        import ctypes.util
+        self.root = root
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        self.watch_all()
+
+    def add(self, relpath: str):
+        """Watch one folder ('' is the workspace root)"""
+        path = os.path.join(self.root, relpath) if relpath else self.root
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.dirs[wd] = relpath
+
+    def watch_tree(self, relpath: str):
+        """Watch a folder and all its subfolders"""
+        for directory, subdirs, _ in os.walk(os.path.join(self.root, relpath)):
+            subdirs[:] = [d for d in subdirs if not d.startswith('.')]
+            self.add(os.path.relpath(directory, self.root).replace(os.sep, '/'))
+
+    def watch_all(self):
+        """(Re)create watches for the root, .ideakit/ and every tracked tree"""
+        self.dirs = {}
+        self.add('')
+        self.add(os.path.dirname(CONSTITUTION))
+        for top in TREES:
+            self.watch_tree(top)
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """Return changed relative paths, an empty set on timeout, None when a full rescan is needed"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self.fd, 1 << 16)
+        changed, rescan = set(), False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT.unpack_from(data, offset)
+            name = data[offset + EVENT.size:offset + EVENT.size + length].rstrip(b'\0')
+            offset += EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            relpath = '/'.join(filter(None, [directory, os.fsdecode(name)]))
+            if not tracked(relpath):
+                continue
+            if mask & IN_ISDIR and mask & (IN_MOVED_FROM | IN_MOVE_SELF | IN_DELETE):
+                # Watches below a moved folder keep stale paths: rebuild them
+                rescan = True
+            elif mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self.watch_tree(relpath)
+            changed.add(relpath)
+        if rescan:
+            self.watch_all()
+            return None
+        return changed
+
+    def close(self):
+        """Release the inotify descriptor"""
+        os.close(self.fd)
+
+class Poller:
+    """Portable fallback: compares mtimes of the watched trees every interval"""
+
+    def __init__(self, root: str, interval: float = POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.state = self.stat_all()
+
+    def stat_all(self) -> Dict[str, Tuple[int, int]]:
+        """Return {relpath: (mtime_ns, size)} for every tracked file"""
+        state = {relpath: (st.st_mtime_ns, st.st_size) for top in TREES
+                 for relpath, st in walk_files(self.root, top)}
+        try:
+            st = os.stat(os.path.join(self.root, CONSTITUTION))
+            state[CONSTITUTION] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return state
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """Sleep up to one interval and return the paths that changed"""
+        time.sleep(min(timeout, self.interval))
+        current = self.stat_all()
+        changed = {p for p in set(current) | set(self.state) if current.get(p) != self.state.get(p)}
+        self.state = current
+        return changed
+
+    def close(self):
+        """Nothing to release"""
+
+def tracked(relpath: str) -> bool:
+    """Check whether a path belongs to a watched tree or is the constitution"""
+    if relpath == CONSTITUTION:
+        return True
+    top = relpath.split('/', 1)[0]
+    return top in TREES and not any(part.startswith('.') for part in relpath.split('/'))
+
+def publish(root: str, model: WorkspaceModel, refresh_index: bool = True,
+            changed: Optional[Set[str]] = None):
+    """Write workspace.json, the status snapshot and (optionally) update the index and domain pairings
+
+    Given the changed paths only those are re-read; otherwise both caches re-walk ideas/.
+    """
+    path = cache_path(root, SNAPSHOT_FILE)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(model.snapshot())
+    os.replace(tmp, path)
+    save_snapshot(root, render(model.status_state()))
+    if not refresh_index:
+        return
+    if changed is None:
+        index.refresh(root)
+        domains.refresh(root)
+    else:
+        index.update(root, changed)
+        domains.update(root, changed)
+
+def open_source(root: str, poll: bool, interval: float):
+    """Use inotify where available, polling otherwise"""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return Inotify(root)
+        except (OSError, AttributeError):
+            pass
+    return Poller(root, interval)
+
+def watch(root: str, poll: bool = False, interval: float = POLL_INTERVAL, debounce: float = DEBOUNCE,
+          refresh_index: bool = True, report=None):
+    """Run until SIGINT/SIGTERM, publishing after each quiet period of debounce seconds"""
+    report = report or (lambda message: None)
+    model = WorkspaceModel(root)
+    source = open_source(root, poll, interval)
+    model.scan()
+    publish(root, model, refresh_index)
+    report(f"👀 Watching {root} ({'inotify' if isinstance(source, Inotify) else 'polling'}, "
+           f"{len(model.ideas)} ideas)")
+
+    stopping = []
+    previous = signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    pending, rescan = set(), False
+    first = last = 0.0
+    try:
+        while not stopping:
+            timeout = debounce if pending or rescan else 1.0
+            changed = source.wait(timeout)
+            now = time.monotonic()
+            if changed is None:
+                rescan = True
+            elif changed:
+                pending |= changed
+            if changed is None or changed:
+                first = first or now
+                last = now
+            if (pending or rescan) and (now - last >= debounce or now - first >= MAX_DELAY):
+                started = time.perf_counter()
+                dirty = model.scan() if rescan else model.update(pending)
+                if dirty:
+                    publish(root, model, refresh_index, None if rescan else pending)
+                    report(f"🔄 {len(pending) or 'all'} changes published in "
+                           f"{(time.perf_counter() - started) * 1000:.0f} ms")
+                pending, rescan, first = set(), False, 0.0
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+        source.close()
+
+def load_workspace(root: str) -> Optional[Dict]:
+    """Read the published workspace snapshot, None if missing or from another version"""
+    try:
+        with open(cache_path(root, SNAPSHOT_FILE), 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return snapshot if snapshot.get('version') == SNAPSHOT_VERSION else None
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog='ideakit watch', description=__doc__.strip().splitlines()[1])
+    add_root_argument(parser)
+    parser.add_argument('--poll', action='store_true', help="Poll instead of using inotify")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help="Polling interval in seconds (default: 1.0)")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE,
+                        help="Quiet period before publishing, in seconds (default: 0.2)")
+    parser.add_argument('--no-index', action='store_true', help="Do not refresh the idea index")
+    parser.add_argument('--once', action='store_true', help="Publish one snapshot and exit")
+    args = parser.parse_args(argv)
+
+    root = find_root(args.root)
+    if args.once:
+        started = time.perf_counter()
+        model = WorkspaceModel(root)
+        model.scan()
+        publish(root, model, not args.no_index)
+        print(f"✅ Published {len(model.ideas)} ideas to {os.path.join(root, '.ideakit', 'cache', SNAPSHOT_FILE)} "
+              f"in {time.perf_counter() - started:.2f}s")
+        return 0
+
+    watch(root, args.poll, args.interval, args.debounce, not args.no_index,
+          report=lambda message: print(message, flush=True))
+    print("👋 Watcher stopped")
+    return 0
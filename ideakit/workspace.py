@@ -0,0 +1,149 @@
+"""
+IdeaKit workspace layout
+Locates the workspace root, walks the ideas/ tree and maps idea names to (sharded) folders
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import stat
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+IDEAS_DIR = 'ideas'
+STATUS_FOLDERS = ('active', 'archive', 'implemented')
+UNSORTED = 'unsorted'
+CONSTITUTION = '.ideakit/constitution.md'
+CACHE_DIR = '.ideakit/cache'
+LAYOUT_FILE = '.ideakit/layout.json'
+
+# flat: ideas/<status>/<name>, date: ideas/<status>/<YYYY-MM>/<name>, hash: ideas/<status>/<xx>/<name>
+LAYOUTS = ('flat', 'date', 'hash')
+DEFAULT_LAYOUT = 'flat'
+UNDATED_SHARD = 'undated'
+NAME_DATE_RE = re.compile(r'^(\d{4})(\d{2})\d{2}-')
+
+def find_root(start: Optional[str] = None) -> str:
+    """Find the nearest directory containing .ideakit/, falling back to start"""
+    start = os.path.abspath(start or os.getcwd())
+    current = start
+    while True:
+        if os.path.isdir(os.path.join(current, '.ideakit')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return start
+        current = parent
+
+def add_root_argument(parser: argparse.ArgumentParser):
+    """Add the shared --root option to a command parser"""
+    parser.add_argument('--root', default=None,
+                        help="IdeaKit workspace (default: nearest parent with .ideakit/)")
+
+def cache_path(root: str, name: str) -> str:
+    """Return the path of a cache file, creating the cache directory"""
+    directory = os.path.join(root, CACHE_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, name)
+
+def status_of(relpath: str) -> str:
+    """Return the status folder of an idea path relative to the workspace"""
+    parts = relpath.replace(os.sep, '/').split('/')
+    if len(parts) > 2 and parts[0] == IDEAS_DIR:
+        return parts[1]
+    return UNSORTED
+
+def iter_idea_files(root: str, top: str = IDEAS_DIR) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (relative path, stat) for every markdown file under top"""
+    # Relative paths are built from the walked prefix; os.path.relpath per file is slow
+    stack = [(os.path.join(root, top), top.replace(os.sep, '/').rstrip('/') + '/')]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, prefix + entry.name + '/'))
+                elif entry.name.endswith('.md') and entry.is_file():
+                    yield prefix + entry.name, entry.stat()
+
+def stat_idea_paths(root: str, paths: Iterable[str]) -> Tuple[Dict[str, os.stat_result], List[str]]:
+    """Return stats of the ideas now at or below the given relative paths, and the paths under ideas/ checked
+
+    Cached rows equal to or below a checked path but missing from the stats are gone from disk.
+    """
+    found, scopes = {}, []
+    for relpath in paths:
+        relpath = relpath.replace(os.sep, '/').rstrip('/')
+        parts = relpath.split('/')
+        if parts[0] != IDEAS_DIR or len(parts) < 2 or any(part.startswith('.') for part in parts):
+            continue
+        scopes.append(relpath)
+        try:
+            st = os.stat(os.path.join(root, relpath))
+        except OSError:
+            continue
+        if stat.S_ISDIR(st.st_mode):
+            found.update(iter_idea_files(root, relpath))
+        elif stat.S_ISREG(st.st_mode) and relpath.endswith('.md'):
+            found[relpath] = st
+    return found, scopes
+
+def load_layout(root: str) -> str:
+    """Return the workspace's idea layout (flat unless .ideakit/layout.json says otherwise)"""
+    try:
+        with open(os.path.join(root, LAYOUT_FILE), 'r', encoding='utf-8') as f:
+            layout = json.load(f).get('layout', DEFAULT_LAYOUT)
+    except (OSError, ValueError, AttributeError):
+        return DEFAULT_LAYOUT
+    return layout if layout in LAYOUTS else DEFAULT_LAYOUT
+
+def save_layout(root: str, layout: str):
+    """Record the idea layout new files are placed in"""
+    path = os.path.join(root, LAYOUT_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'layout': layout}) + "\n")
+    os.replace(path + '.tmp', path)
+
+def shard_of(name: str, layout: str) -> str:
+    """Return the shard folder of an idea file name ('' in the flat layout)"""
+    if layout == 'hash':
+        return format(zlib.crc32(name.encode('utf-8')) & 0xFF, '02x')
+    if layout == 'date':
+        match = NAME_DATE_RE.match(name)
+        return f"{match.group(1)}-{match.group(2)}" if match else UNDATED_SHARD
+    return ''
+
+def idea_folder(status: str, name: str, layout: str) -> str:
+    """Return the workspace-relative folder an idea file belongs in"""
+    shard = shard_of(name, layout)
+    folder = f"{IDEAS_DIR}/{status}"
+    return f"{folder}/{shard}" if shard else folder
+
+def logical_path(relpath: str) -> str:
+    """Return ideas/<status>/<name> for an idea path in any layout"""
+    parts = relpath.split('/')
+    if len(parts) > 3 and parts[0] == IDEAS_DIR:
+        return '/'.join(parts[:2] + parts[-1:])
+    return relpath
+
+def resolve_idea(root: str, relpath: str) -> str:
+    """Find an idea given its path in any layout, e.g. ideas/active/<name> in a sharded workspace"""
+    relpath = posixpath.normpath(relpath.replace(os.sep, '/'))
+    if os.path.exists(os.path.join(root, relpath)):
+        return relpath
+    parts = relpath.split('/')
+    if len(parts) >= 3 and parts[0] == IDEAS_DIR:
+        current = load_layout(root)
+        for layout in (current,) + tuple(other for other in LAYOUTS if other != current):
+            candidate = f"{idea_folder(parts[1], parts[-1], layout)}/{parts[-1]}"
+            if os.path.exists(os.path.join(root, candidate)):
+                return candidate
+    return relpath
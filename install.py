@@ -7,11 +7,27 @@ Run with: curl -sSL https://raw.githubusercontent.com/JJs23/idea-kit/main/instal
 
 import os
 import sys
-import platform
-import subprocess
-import shutil
-from pathlib import Path
-from typing import Optional
+import time
+import _thread
+
+# Heavier modules (subprocess, shutil, platform, json, hashlib, tempfile,
+# concurrent.futures) are imported inside the functions that need them so
+# that --help and small installs start quickly. typing alone costs more than
+# the rest of startup, so annotations are strings and it is never imported.
+if False:  # pragma: no cover - for type checkers only
+    from typing import Dict, List, Optional
+
+INSTALLER_VERSION = "1.1.0"
+INSTALL_MANIFEST = '.ideakit/manifest.json'
+# Idea folder layouts; anything but 'flat' is recorded in LAYOUT_FILE for the ideakit tools
+LAYOUTS = ('flat', 'date', 'hash')
+LAYOUT_FILE = '.ideakit/layout.json'
+
+# Files written by write_file() while a recording is active, keyed by thread id
+_recordings = {}
+
+# Step timings and I/O counters while --trace / IDEAKIT_TRACE is active, keyed by thread id
+_traces = {}
 
 def print_status(message: str, emoji: str = "🚀"):
     """Print status message with emoji"""
@@ -27,24 +43,32 @@ def print_info(message: str):
 
 def get_os_type() -> str:
     """Get operating system type"""
+    import platform
     return platform.system().lower()
 
 def is_git_repo() -> bool:
     """Check if current directory is a git repository"""
     return os.path.exists('.git')
 
-def run_command(command: str, shell: bool = True) -> bool:
-    """Run a command and return success status"""
+def run_command(command, shell: bool = False, cwd: 'Optional[str]' = None) -> bool:
+    """Run a command (an argument list unless shell=True) and return success status"""
+    import subprocess
+    trace = _traces.get(_thread.get_ident())
+    started = time.perf_counter()
     try:
-        result = subprocess.run(command, shell=shell, capture_output=True, text=True)
+        result = subprocess.run(command, shell=shell, cwd=cwd, capture_output=True, text=True)
         return result.returncode == 0
     except Exception:
         return False
+    finally:
+        if trace is not None:
+            trace['subprocesses'] += 1
+            trace['subprocess_s'] += time.perf_counter() - started
 
 def create_directory(path: str) -> bool:
     """Create directory if it doesn't exist"""
     try:
-        Path(path).mkdir(parents=True, exist_ok=True)
+        os.makedirs(path, exist_ok=True)
         return True
     except Exception:
         return False
@@ -54,10 +78,32 @@ def write_file(filepath: str, content: str) -> bool:
     try:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
+        recorded = _recordings.get(_thread.get_ident())
+        if recorded is not None:
+            recorded[filepath] = content
+        trace = _traces.get(_thread.get_ident())
+        if trace is not None:
+            trace['files'] += 1
+            trace['bytes'] += len(content.encode('utf-8'))
         return True
     except Exception:
         return False
 
+def content_hash(content: str) -> str:
+    """Hash generated content the way it is stored in the install manifest"""
+    import hashlib
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def file_hash(filepath: str) -> 'Optional[str]':
+    """Hash a file on disk (ignoring CRLF conversion), None if it does not exist"""
+    import hashlib
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    return hashlib.sha256(data.replace(b'\r\n', b'\n')).hexdigest()
+
 def get_project_name() -> str:
     """Get project name from user input"""
     try:
@@ -70,6 +116,7 @@ def get_project_name() -> str:
 
 def create_new_project(project_name: str, skip_git: bool = False) -> bool:
     """Create new project directory and initialize git"""
+    import shutil
     try:
         print(f"   Creating project folder: {project_name}")
         
@@ -85,7 +132,7 @@ def create_new_project(project_name: str, skip_git: bool = False) -> bool:
         # Initialize git (unless skipped)
         if not skip_git and shutil.which('git'):
             print("   🔧 Initializing Git repository...")
-            run_command('git init')
+            run_command(['git', 'init', '-q'])
             write_file('README.md', f"# {project_name} - IdeaKit Project\n")
             print("   ✅ Git repository initialized")
         elif skip_git:
@@ -100,7 +147,7 @@ def create_new_project(project_name: str, skip_git: bool = False) -> bool:
         print(f"   ❌ Error creating project: {e}")
         return False
 
-def create_directory_structure():
+def create_directory_structure(base: str = '.'):
     """Create the complete directory structure"""
     directories = [
         '.ideakit/prompts',
@@ -114,576 +161,700 @@ def create_directory_structure():
         'research'
     ]
     
+    success = True
     for directory in directories:
-        if not create_directory(directory):
+        if not create_directory(os.path.join(base, directory)):
             print(f"Warning: Could not create directory {directory}")
+            success = False
+    
+    return success
 
-def create_constitution():
-    """Create constitution.md file"""
-    content = """# 1-Person Unicorn Creator's Idea Constitution
-
-## Core Philosophy
-- **Fun comes first**: Both the creation process and user experience should be enjoyable
-- **Cross-domain innovation**: Create new value by connecting completely different fields
-- **Solo execution power**: Must be implementable to MVP by one person alone
-- **Pursue originality**: Focus on "how to make it different?" rather than "it already exists"
-
-## Evaluation Criteria (Priority)
-1. **Fun Factor** (10 points): Joy for both users and developers
-2. **Differentiation** (9 points): Clear distinction from existing solutions
-3. **Feasibility** (8 points): MVP possible within 6 months for solo developer
-4. **Monetization** (7 points): Clear business model exists
-5. **Scalability** (6 points): Future feature/market expansion potential
-
-## Pitfalls to Avoid
-- Overly complex tech stack
-- Unclear target users
-- Boring utility tools
-- Direct competition with existing big tech services
-
-## Preferred Tech Stack
-- Frontend: React, Next.js, Flutter
-- Backend: Node.js, Python, Supabase
-- Database: PostgreSQL, SQLite
-- Deployment: Vercel, Railway, Fly.io
-- Others: Utilize No-code/Low-code tools for rapid prototyping
-
----
-*Edit this file if modifications are needed*
-"""
-    return write_file('.ideakit/constitution.md', content)
+def load_asset(name: str) -> str:
+    """Decode one file from the embedded asset bundle"""
+    import base64
+    import zlib
+    return zlib.decompress(base64.b85decode(ASSET_BUNDLE[name])).decode('utf-8')
 
-def create_cursor_instructions():
-    """Create Cursor AI instructions"""
-    content = """# IdeaKit Assistant Instructions
-
-You are an AI assistant specialized in helping a solo entrepreneur develop creative ideas for fun services and games. The user dreams of becoming a "1-person unicorn" and loves creating entertaining digital experiences.
-
-Always read the constitution at `.ideakit/constitution.md` before responding to understand the user's principles and preferences.
-
-## Your Roles & Personas
-
-### Creative Partner Mode (@expand)
-- Extremely enthusiastic about new ideas
-- Masters at connecting different domains creatively  
-- Always asks "What if we combine this with...?"
-- Focuses on maximizing fun and uniqueness
-- Speaks with excitement and uses creative analogies
-- References constitution's preferred tech stack when relevant
-
-### Critical Mentor Mode (@reality-check)  
-- Experienced, realistic perspective
-- Focuses on implementation challenges based on constitution criteria
-- Asks tough questions about feasibility for 1-person development
-- Provides constructive criticism
-- Balances optimism with practical concerns
-- Evaluates against the 5 criteria in constitution
-
-### Blueprint Architect Mode (@blueprint)
-- Systematic and structured approach
-- Organizes ideas into actionable plans
-- Uses preferred tech stack from constitution
-- Creates realistic 6-month roadmaps
-- Focuses on deliverable outcomes for solo developer
-
-## Available Commands
-
-### @spark [idea]
-Capture and initially assess a new idea. Create idea-seed.md file in ideas/ folder.
-
-### @expand
-Switch to Creative Partner mode. Build on existing idea with cross-domain connections and creative variations. Create creative-expansion.md file.
-
-### @reality-check  
-Switch to Critical Mentor mode. Analyze idea against constitution criteria. Create validation-report.md file.
-
-### @blueprint
-Switch to Blueprint Architect mode. Create comprehensive project proposal with technical specs. Create project-proposal.md file.
-
-### @constitution
-Review or help update the constitution.md file based on user feedback.
-
-## File Management
-- Always create files in appropriate folders (ideas/, prototypes/, etc.)
-- Use clear naming with timestamps
-- Reference related files with links
-- Keep constitution as source of truth for all decisions
-
-## Output Format
-- Always reference the constitution when evaluating ideas
-- Use established templates for consistency
-- Maintain appropriate persona for current command
-- Suggest specific next steps
-- Include fun factor assessment in every evaluation
-"""
-    return write_file('.cursor/instructions.md', content)
+def write_asset(base: str, name: str) -> bool:
+    """Write one bundled asset below base"""
+    return write_file(os.path.join(base, name), load_asset(name))
 
-def create_cursor_commands():
-    """Create Cursor custom commands as individual markdown files"""
-    # Create commands directory
-    if not create_directory('.cursor/commands'):
+def write_asset_group(base: str, folder: str) -> bool:
+    """Write every bundled asset in folder"""
+    if not create_directory(os.path.join(base, folder)):
         return False
     
-    commands = {
-        'ik-spark.md': """# Capture and initially assess a new idea
-
-I want to capture and assess a new idea. Please read the constitution at .ideakit/constitution.md first, then:
-
-1. Show excitement for the new idea
-2. Quickly assess against constitution criteria (1-10 scale)
-3. Ask 2-3 clarifying questions to understand core vision
-4. Create idea-seed.md file in ideas/ folder with timestamp
-5. Suggest using @expand as next step
-
-Use the template from .ideakit/templates/idea-seed.md for formatting.""",
-        
-        'ik-expand.md': """# Switch to Creative Partner mode for idea expansion
-
-I want to expand my idea creatively. Please read the constitution at .ideakit/constitution.md first, then switch to Creative Partner mode:
-
-1. Build on existing idea with 3-5 creative variations
-2. Cross-pollinate with different domains (gaming+cooking, music+fitness, etc.)
-3. Amplify fun factors - what makes it more entertaining?
-4. Explore unusual use cases or edge cases
-5. Generate creative-expansion.md with multiple directions
-
-Use the template from .ideakit/templates/creative-expansion.md for formatting.""",
-        
-        'ik-reality-check.md': """# Switch to Critical Mentor mode for feasibility analysis
-
-I want to do a reality check on my idea. Please read the constitution at .ideakit/constitution.md first, then switch to Critical Mentor mode:
-
-Analyze the idea against constitution criteria:
-
-### Technical Feasibility
-- Can 1 person build this in 6 months for MVP?
-- What are the hardest technical challenges?
-- Required skill gaps vs constitution's preferred stack?
-- Third-party dependencies and costs?
-
-### Market Reality
-- Who exactly will use this? (be specific)
-- How will they discover it?
-- What similar solutions exist?
-- Why would they switch from current solutions?
+    success = True
+    for name in ASSET_BUNDLE:
+        if os.path.dirname(name) == folder and not write_asset(base, name):
+            success = False
+    
+    return success
 
-### Business Viability
-- Clear revenue model within 12 months?
-- Sustainable as 1-person business?
-- Customer acquisition strategy?
-- Resource requirements vs solo capacity?
+def create_constitution(base: str = '.'):
+    """Create constitution.md file"""
+    return write_asset(base, '.ideakit/constitution.md')
 
-### Risk Assessment
-- What could go wrong?
-- Plan B options?
-- Minimum viable scope?
-- Exit strategy if it doesn't work?
+def create_cursor_instructions(base: str = '.'):
+    """Create Cursor AI instructions"""
+    return write_asset(base, '.cursor/instructions.md')
 
-Create validation-report.md file with your analysis.""",
-        
-        'ik-blueprint.md': """# Switch to Blueprint Architect mode for project planning
-
-I want to create a blueprint for my idea. Please read the constitution at .ideakit/constitution.md first, then switch to Blueprint Architect mode:
-
-Create a comprehensive project proposal with:
-
-### Executive Summary
-- One-sentence pitch
-- Core value proposition
-- Primary target audience
-- Key differentiation
-
-### Technical Specification
-- Tech stack (prefer constitution's choices)
-- Architecture overview
-- Key integrations needed
-- Performance requirements
-
-### Implementation Roadmap
-- MVP scope (3-month goal)
-- Phase 1 features (months 1-3)
-- Phase 2 features (months 4-6)
-- Launch strategy
-
-### Business Model
-- Primary revenue streams
-- Cost structure
-- Key metrics to track
-- Growth strategy
-
-### Risk Mitigation
-- Technical risks & solutions
-- Market risks & alternatives
-- Resource risks & backup plans
-- Success criteria & milestones
-
-Create project-proposal.md file with your comprehensive plan.""",
-        
-        'ik-constitution.md': """# Review or update the constitution
+def create_cursor_commands(base: str = '.'):
+    """Create Cursor custom commands as individual markdown files"""
+    return write_asset_group(base, '.cursor/commands')
 
-I want to review or update my constitution. Please read the current constitution at .ideakit/constitution.md and help me:
+def create_prompt_templates(base: str = '.'):
+    """Create all prompt template files"""
+    return write_asset_group(base, '.ideakit/prompts')
 
-1. Review current philosophy and evaluation criteria
-2. Suggest improvements based on my feedback
-3. Update tech stack preferences if needed
-4. Adjust evaluation criteria weights
-5. Add or modify pitfalls to avoid
+def create_file_templates(base: str = '.'):
+    """Create file templates"""
+    return write_asset_group(base, '.ideakit/templates')
 
-Provide specific recommendations and help update the constitution file.""",
-        
-        'ik-status.md': """# Show current IdeaKit project status
+def create_example_idea(base: str = '.'):
+    """Create example idea file"""
+    return write_asset(base, 'ideas/example-idea.md')
 
-Show me the current status of my IdeaKit project:
+def create_gitignore(base: str = '.'):
+    """Create .gitignore file"""
+    return write_asset(base, '.gitignore')
 
-1. Count ideas in each folder (active/, archive/, implemented/)
-2. Show recent ideas with their constitution scores
-3. Display project statistics
-4. Suggest next actions based on current state
+def create_package_json(base: str = '.'):
+    """Create package.json file"""
+    return write_asset(base, 'package.json')
+
+# Installation steps: (status message, create function, warning on failure)
+INSTALL_STEPS = [
+    ("Creating directory structure...", create_directory_structure,
+     "Could not create all directories"),
+    ("Creating constitution.md...", create_constitution,
+     "Could not create constitution.md"),
+    ("Creating Cursor instructions...", create_cursor_instructions,
+     "Could not create Cursor instructions"),
+    ("Creating Cursor custom commands...", create_cursor_commands,
+     "Could not create Cursor custom commands"),
+    ("Creating prompt templates...", create_prompt_templates,
+     "Could not create all prompt templates"),
+    ("Creating file templates...", create_file_templates,
+     "Could not create all file templates"),
+    ("Creating example files...", create_example_idea,
+     "Could not create example idea"),
+    ("Creating .gitignore...", create_gitignore,
+     "Could not create .gitignore"),
+    ("Creating package.json...", create_package_json,
+     "Could not create package.json"),
+]
+
+def run_install_steps(base: str, verbose: bool = True):
+    """Run every installation step against base and return (warnings, {relpath: content})"""
+    warnings = []
+    thread = _thread.get_ident()
+    _recordings[thread] = {}
+    try:
+        for message, step, warning in INSTALL_STEPS:
+            if verbose:
+                print_status(message)
+            if traced(step.__name__, step, base) is False and warning:
+                warnings.append(warning)
+                if verbose:
+                    print(f"⚠️  Warning: {warning}")
+    finally:
+        written = _recordings.pop(thread)
+    
+    files = {os.path.relpath(path, base).replace(os.sep, '/'): content
+             for path, content in written.items()}
+    return warnings, files
 
-Use the constitution at .ideakit/constitution.md for context."""
-    }
+def read_install_manifest(base: str) -> 'Dict[str, str]':
+    """Read {relpath: sha256} recorded at install time, empty for older installs"""
+    import json
+    try:
+        with open(os.path.join(base, INSTALL_MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def write_install_manifest(base: str, hashes: 'Dict[str, str]') -> bool:
+    """Record the content hash of every installed asset"""
+    import json
+    content = json.dumps({'installer': INSTALLER_VERSION, 'assets': ASSET_BUNDLE_VERSION,
+                          'files': dict(sorted(hashes.items()))}, indent=2) + "\n"
+    return write_file(os.path.join(base, INSTALL_MANIFEST), content)
+
+def write_layout(base: str, layout: str) -> bool:
+    """Record a sharded idea layout (ideas/<status>/<YYYY-MM or xx>/) for the ideakit tools"""
+    import json
+    return write_file(os.path.join(base, LAYOUT_FILE), json.dumps({'layout': layout}) + "\n")
+
+def install_components(base: str = '.', verbose: bool = True, layout: str = 'flat') -> 'List[str]':
+    """Run every installation step against base, record the manifest and return warnings"""
+    warnings, files = run_install_steps(base, verbose)
+    hashes = {path: content_hash(content) for path, content in files.items()}
+    if not traced('write_install_manifest', write_install_manifest, base, hashes):
+        warnings.append("Could not write install manifest")
+    if layout != 'flat' and not traced('write_layout', write_layout, base, layout):
+        warnings.append("Could not write idea layout")
+    return warnings
+
+def render_assets() -> 'Dict[str, str]':
+    """Render the installer's current assets and return {relpath: content}"""
+    import shutil
+    import tempfile
+    scratch = tempfile.mkdtemp(prefix='ideakit-assets-')
+    try:
+        warnings, files = run_install_steps(scratch, verbose=False)
+        if warnings:
+            raise OSError("; ".join(warnings))
+        return files
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+def plan_upgrade(base: str, assets: 'Dict[str, str]') -> 'List[Dict]':
+    """Compare shipped assets with the install manifest and the files on disk
+
+    Actions: 'add' (new asset), 'update' (shipped content changed, file untouched),
+    'current' (already identical), 'keep' (edited locally, shipped content unchanged),
+    'deleted' (removed locally) and 'conflict' (edited locally and changed upstream).
+    """
+    installed = read_install_manifest(base)
+    plan = []
+    for relpath, content in sorted(assets.items()):
+        new = content_hash(content)
+        old = installed.get(relpath)
+        current = file_hash(os.path.join(base, relpath))
+        if current == new:
+            action = 'current'
+        elif old is None:
+            action = 'add' if current is None else 'conflict'
+        elif current is None:
+            action = 'deleted'
+        elif current == old:
+            action = 'update'
+        elif new == old:
+            action = 'keep'
+        else:
+            action = 'conflict'
+        plan.append({'path': relpath, 'action': action, 'hash': new, 'installed': old})
+    return plan
+
+def upgrade_workspace(base: str, assets: 'Dict[str, str]', dry_run: bool = False) -> 'List[Dict]':
+    """Write only assets that changed upstream and were not edited locally"""
+    # Never turn an arbitrary directory into a workspace: upgrades need an earlier install
+    if not os.path.isdir(os.path.join(base, '.ideakit')):
+        raise OSError(f"not an IdeaKit workspace (no .ideakit folder): {os.path.abspath(base)}")
+    plan = plan_upgrade(base, assets)
+    if dry_run:
+        return plan
     
-    success = True
-    for filename, content in commands.items():
-        if not write_file(f'.cursor/commands/{filename}', content):
-            success = False
+    hashes = read_install_manifest(base)
+    for item in plan:
+        path = os.path.join(base, item['path'])
+        if item['action'] in ('add', 'update'):
+            if not create_directory(os.path.dirname(path)) or not write_file(path, assets[item['path']]):
+                item['action'] = 'failed'
+                continue
+        if item['action'] in ('add', 'update', 'current'):
+            hashes[item['path']] = item['hash']
+    for directory in ('ideas/active', 'ideas/archive', 'ideas/implemented', 'prototypes', 'research'):
+        create_directory(os.path.join(base, directory))
+    if not write_install_manifest(base, hashes):
+        raise OSError("could not write install manifest")
+    return plan
+
+UPGRADE_MARKS = {'add': "➕", 'update': "✏️ ", 'conflict': "⚠️ ", 'keep': "🔒",
+                 'deleted': "🗑️ ", 'failed': "❌"}
+
+def print_upgrade_plan(base: str, plan: 'List[Dict]', dry_run: bool):
+    """Print the files an upgrade writes, keeps or cannot merge"""
+    print_status(f"{'Upgrade plan' if dry_run else 'Upgraded'}: {os.path.abspath(base)}", "🔄")
+    for item in plan:
+        if item['action'] != 'current':
+            print(f"   {UPGRADE_MARKS[item['action']]} {item['action']:<8}  {item['path']}")
+    counts = {}
+    for item in plan:
+        counts[item['action']] = counts.get(item['action'], 0) + 1
+    written = counts.get('add', 0) + counts.get('update', 0)
+    print_info(f"{written} files {'to write' if dry_run else 'written'}, "
+               f"{counts.get('conflict', 0)} conflicts, {counts.get('keep', 0)} kept local edits, "
+               f"{counts.get('current', 0)} unchanged")
+    if counts.get('failed'):
+        print(f"❌ {counts['failed']} files could not be written")
+
+def load_manifest(manifest_path: str) -> 'Dict':
+    """Load a batch manifest from a JSON or TOML file"""
+    import json
+    with open(manifest_path, 'rb') as f:
+        raw = f.read()
+    if manifest_path.endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML manifests require Python 3.11+ (use JSON instead)")
+        manifest = tomllib.loads(raw.decode('utf-8'))
+    else:
+        manifest = json.loads(raw.decode('utf-8'))
     
-    return success
-
-def create_prompt_templates():
-    """Create all prompt template files"""
-    templates = {
-        'spark.md': """# @spark - Initial Idea Capture
-
-## Purpose
-Capture raw ideas with enthusiasm while doing initial assessment against constitution principles.
-
-## Behavior
-1. Show excitement for the new idea
-2. Quickly assess against constitution criteria (1-10 scale)
-3. Ask 2-3 clarifying questions to understand core vision
-4. Create idea-seed.md file in ideas/ folder
-5. Suggest using @expand as next step
-
-## Response Template
-```
-🌟 Exciting new idea captured!
-
-Initial Assessment:
-- Fun Factor: [1-10] - [brief reason]
-- Differentiation: [1-10] - [brief reason]  
-- Feasibility: [1-10] - [brief reason]
-
-Questions to explore:
-1. [specific question about target users]
-2. [specific question about core feature]
-3. [specific question about differentiation]
-
-✅ Created: ideas/[timestamp]-[idea-name].md
-
-Next step: Use @expand to explore creative directions!
-```
-""",
-        'expand.md': """# @expand - Creative Development
-
-## Persona: Creative Partner
-Enthusiastic, cross-domain thinker who loves connecting unrelated fields.
-
-## Behavior
-1. Build on existing idea with 3-5 creative variations
-2. Cross-pollinate with different domains (gaming+cooking, music+fitness, etc.)
-3. Amplify fun factors - what makes it more entertaining?
-4. Explore unusual use cases or edge cases
-5. Generate creative-expansion.md with multiple directions
-
-## Key Phrases
-- "What if we mixed this with..."
-- "This reminds me of [different domain]..."
-- "Users would laugh if..."
-- "Imagine if instead of..."
-- "That's cool, but what if it was also..."
-
-## Focus Areas
-- Cross-domain combinations
-- Gamification opportunities
-- Social interaction elements  
-- Surprise and delight moments
-- Viral potential features
-""",
-        'reality-check.md': """# @reality-check - Critical Analysis
-
-## Persona: Critical Mentor
-Experienced, practical, caring but tough. Knows the challenges of solo development.
-
-## Analysis Framework
-
-### Technical Feasibility
-- Can 1 person build this in 6 months for MVP?
-- What are the hardest technical challenges?
-- Required skill gaps vs constitution's preferred stack?
-- Third-party dependencies and costs?
-
-### Market Reality  
-- Who exactly will use this? (be specific)
-- How will they discover it?
-- What similar solutions exist?
-- Why would they switch from current solutions?
-
-### Business Viability
-- Clear revenue model within 12 months?
-- Sustainable as 1-person business?
-- Customer acquisition strategy?
-- Resource requirements vs solo capacity?
-
-### Risk Assessment
-- What could go wrong?
-- Plan B options?
-- Minimum viable scope?
-- Exit strategy if it doesn't work?
-
-## Tone
-Constructive but direct. "I love the creativity, but let's be real about..."
-""",
-        'blueprint.md': """# @blueprint - Structured Planning
-
-## Persona: Blueprint Architect
-Systematic, organized, action-oriented. Transforms ideas into implementable plans.
-
-## Document Structure
-
-### Executive Summary
-- One-sentence pitch
-- Core value proposition  
-- Primary target audience
-- Key differentiation
-
-### Technical Specification
-- Tech stack (prefer constitution's choices)
-- Architecture overview
-- Key integrations needed
-- Performance requirements
-
-### Implementation Roadmap
-- MVP scope (3-month goal)
-- Phase 1 features (months 1-3)
-- Phase 2 features (months 4-6)
-- Launch strategy
-
-### Business Model
-- Primary revenue streams
-- Cost structure
-- Key metrics to track
-- Growth strategy
-
-### Risk Mitigation
-- Technical risks & solutions
-- Market risks & alternatives
-- Resource risks & backup plans
-- Success criteria & milestones
-
-## Output Format
-Comprehensive project-proposal.md that someone could actually follow to build the project.
-"""
-    }
+    if isinstance(manifest, list):
+        manifest = {'projects': manifest}
+    projects = manifest.get('projects')
+    if not isinstance(projects, list) or not projects:
+        raise ValueError("manifest must list at least one project under 'projects'")
     
-    success = True
-    for filename, content in templates.items():
-        if not write_file(f'.ideakit/prompts/{filename}', content):
-            success = False
+    default_root = manifest.get('root', '.')
+    specs = []
+    for entry in projects:
+        if isinstance(entry, str):
+            entry = {'name': entry}
+        if not entry.get('name'):
+            raise ValueError(f"project entry without a name: {entry!r}")
+        specs.append({
+            'name': entry['name'],
+            'root': entry.get('root', default_root),
+            'no_git': bool(entry.get('no_git', entry.get('no-git', manifest.get('no_git', False)))),
+            'existing': bool(entry.get('existing', False)),
+            'staged': bool(entry.get('staged', manifest.get('staged', False))),
+            'commit': bool(entry.get('commit', manifest.get('commit', False))),
+            'layout': entry.get('layout', manifest.get('layout')),
+        })
+        if specs[-1]['layout'] not in LAYOUTS + (None,):
+            raise ValueError(f"unknown layout {specs[-1]['layout']!r} (choose {', '.join(LAYOUTS)})")
     
-    return success
+    names = [os.path.abspath(os.path.join(spec['root'], spec['name'])) for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("manifest lists the same project path more than once")
+    return {'projects': specs, 'workers': manifest.get('workers')}
+
+def provision_project(spec: 'Dict') -> 'Dict':
+    """Create and install one project from a manifest entry without chdir or prompts"""
+    import shutil
+    path = os.path.join(spec['root'], spec['name'])
+    result = {'name': spec['name'], 'path': os.path.abspath(path), 'ok': False,
+              'seconds': 0.0, 'warnings': [], 'error': None}
+    started = time.perf_counter()
+    if spec.get('trace'):
+        start_trace()
+    try:
+        if spec.get('assets') is not None:
+            if not os.path.isdir(path):
+                raise OSError(f"project not found: {path}")
+            plan = traced('upgrade_workspace', upgrade_workspace, path, spec['assets'],
+                          spec.get('dry_run', False))
+            result['upgrade'] = {action: sum(1 for item in plan if item['action'] == action)
+                                 for action in ('add', 'update', 'conflict', 'failed')}
+            result['warnings'].extend(f"conflict: {item['path']}" for item in plan
+                                      if item['action'] == 'conflict')
+            failed = [item['path'] for item in plan if item['action'] == 'failed']
+            if failed:
+                raise OSError(f"could not write {', '.join(failed)}")
+        elif spec.get('staged'):
+            if spec['existing'] and not os.path.isdir(path):
+                raise OSError(f"existing project not found: {path}")
+            staged_install(path, spec['name'], not spec['existing'], spec['no_git'], spec['commit'],
+                           spec['layout'])
+        elif spec['existing']:
+            if not os.path.isdir(path):
+                raise OSError(f"existing project not found: {path}")
+            result['warnings'].extend(install_components(path, False, spec['layout']))
+        else:
+            if not create_directory(path):
+                raise OSError(f"failed to create directory: {path}")
+            git_ready = False
+            if not spec['no_git'] and shutil.which('git'):
+                git_ready = traced('git_init', run_command, ['git', 'init', '-q'], False, path)
+                if not git_ready:
+                    result['warnings'].append("git init failed")
+            write_file(os.path.join(path, 'README.md'), f"# {spec['name']} - IdeaKit Project\n")
+            result['warnings'].extend(install_components(path, False, spec['layout']))
+            if spec['commit'] and not (git_ready and traced('commit_workspace', commit_workspace, path)):
+                result['warnings'].append("initial commit skipped")
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - started
+    if spec.get('trace'):
+        result['trace'] = trace_summary(finish_trace(), result['seconds'])
+    return result
+
+def print_batch_summary(results: 'List[Dict]', elapsed: float):
+    """Print per-project timing and result summary"""
+    width = max(len(r['name']) for r in results)
+    print()
+    print("📋 Batch summary:")
+    for r in results:
+        mark = "✅" if r['ok'] and not r['warnings'] else ("⚠️ " if r['ok'] else "❌")
+        detail = r['error'] or "; ".join(r['warnings']) or r['path']
+        if 'upgrade' in r:
+            changes = r['upgrade']
+            detail = f"{changes['add']} added, {changes['update']} updated  {detail}"
+        print(f"   {mark} {r['name']:<{width}}  {r['seconds'] * 1000:8.1f} ms  {detail}")
+    ok = sum(1 for r in results if r['ok'])
+    print()
+    print(f"🎯 {ok}/{len(results)} projects provisioned in {elapsed:.2f}s")
 
-def create_file_templates():
-    """Create file templates"""
-    templates = {
-        'idea-seed.md': """# 💡 Idea Seed: [TITLE]
-
-**Captured:** [DATE]
-**Status:** Seed Stage
-**Constitution Score:** [X/50]
-
-## Raw Idea
-[Original concept as expressed]
-
-## Core Problem/Opportunity
-[What problem does this solve or what fun does it create?]
-
-## Initial Vision
-[What does success look like?]
-
-## Constitution Assessment
-- **Fun Factor:** [1-10] - [reason]
-- **Differentiation:** [1-10] - [reason]  
-- **Feasibility:** [1-10] - [reason]
-- **Monetization:** [1-10] - [reason]
-- **Scalability:** [1-10] - [reason]
-
-## Questions to Explore
-- [ ] [Question 1]
-- [ ] [Question 2]
-- [ ] [Question 3]
-
-## Next Steps
-- [ ] Run @expand to explore creative directions
-- [ ] Research similar existing solutions
-- [ ] Define target user more clearly
-
-## Related Files
-- Expansion: [link when created]
-- Validation: [link when created]
-- Blueprint: [link when created]
-
----
-*Created with IdeaKit 🚀*
-""",
-        'creative-expansion.md': """# 🎨 Creative Expansion: [TITLE]
-
-**Based on:** [link to idea-seed.md]
-**Expanded:** [DATE]
-**Status:** Exploring Variations
-
-## Original Concept Recap
-[Brief summary]
-
-## Creative Variations
-
-### Variation 1: [Name]
-**Concept:** [Description]
-**Cross-domain inspiration:** [What other field inspired this?]
-**Fun factor:** [What makes this entertaining?]
-**Implementation notes:** [Technical considerations]
-
-### Variation 2: [Name]
-**Concept:** [Description]
-**Cross-domain inspiration:** [What other field inspired this?]
-**Fun factor:** [What makes this entertaining?]
-**Implementation notes:** [Technical considerations]
-
-### Variation 3: [Name]
-**Concept:** [Description]
-**Cross-domain inspiration:** [What other field inspired this?]
-**Fun factor:** [What makes this entertaining?]
-**Implementation notes:** [Technical considerations]
-
-## Wild Card Ideas
-[Completely out-of-the-box suggestions]
-
-## Enhanced Features
-[Ways to make the core idea more engaging]
-
-## User Experience Scenarios
-[Specific use cases that would make users smile]
-
-## Preferred Direction
-[Which variation feels most promising and why?]
-
-## Next Steps
-- [ ] Run @reality-check on preferred direction
-- [ ] Create simple mockup/wireframe
-- [ ] Research technical requirements
-- [ ] Test concept with potential users
-
-## Related Files
-- Original: [link to idea-seed.md]
-- Validation: [link when created]
-- Blueprint: [link when created]
-
----
-*Created with IdeaKit 🚀*
-"""
-    }
+def run_batch(manifest_path: str, workers: 'Optional[int]' = None, staged: bool = False,
+              upgrade: bool = False, dry_run: bool = False, commit: bool = False,
+              layout: str = 'flat') -> bool:
+    """Provision (or upgrade) every project in a manifest with a worker pool"""
+    from concurrent.futures import ThreadPoolExecutor
+    try:
+        manifest = load_manifest(manifest_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: Could not read manifest: {e}")
+        return False
     
-    success = True
-    for filename, content in templates.items():
-        if not write_file(f'.ideakit/templates/{filename}', content):
-            success = False
+    specs = manifest['projects']
+    assets = render_assets() if upgrade else None
+    for spec in specs:
+        spec['staged'] = spec['staged'] or staged
+        spec['commit'] = spec['commit'] or commit
+        spec['layout'] = spec['layout'] or layout
+        spec['assets'] = assets
+        spec['dry_run'] = dry_run
+        spec['trace'] = _thread.get_ident() in _traces
+    workers = workers or manifest['workers'] or min(32, (os.cpu_count() or 1) * 4)
+    print_status(f"Provisioning {len(specs)} IdeaKit projects with {workers} workers...")
     
-    return success
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(provision_project, specs))
+    print_batch_summary(results, time.perf_counter() - started)
+    trace = _traces.get(_thread.get_ident())
+    if trace is not None:
+        trace['projects'] = [dict(r['trace'], name=r['name'], ok=r['ok']) for r in results]
+    return all(r['ok'] for r in results)
+
+def sync_tree(path: str):
+    """Fsync the staged files and their directories (not every filesystem, as os.sync would)"""
+    for directory, _, files in os.walk(path):
+        for name in files:
+            with open(os.path.join(directory, name), 'rb+') as f:
+                os.fsync(f.fileno())
+        # Directory entries need their own fsync; Windows cannot open directories, so skip them there
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def move_into_place(staging: str, target: str, moved: 'List'):
+    """Rename staged entries into target, recursing only into directories that already exist"""
+    for name in sorted(os.listdir(staging)):
+        source = os.path.join(staging, name)
+        destination = os.path.join(target, name)
+        if os.path.isdir(source) and os.path.isdir(destination):
+            move_into_place(source, destination, moved)
+            continue
+        backup = None
+        if os.path.lexists(destination):
+            if os.path.isdir(destination):
+                raise OSError(f"cannot replace directory with a file: {destination}")
+            backup = source + '.ideakit-backup'
+            os.replace(destination, backup)
+        try:
+            os.replace(source, destination)
+        except BaseException:
+            if backup is not None:
+                os.replace(backup, destination)
+            raise
+        moved.append((source, destination, backup))
+
+def roll_back(moved: 'List'):
+    """Undo move_into_place in reverse order"""
+    for source, destination, backup in reversed(moved):
+        try:
+            os.replace(destination, source)
+            if backup is not None:
+                os.replace(backup, destination)
+        except OSError as e:
+            print(f"   ⚠️  Could not roll back {destination}: {e}")
+
+def staged_install(target: str, project_name: 'Optional[str]' = None,
+                   new_project: bool = False, skip_git: bool = False, commit: bool = False,
+                   layout: str = 'flat') -> bool:
+    """Render the whole tree into a temporary directory, then move it into place
+
+    A new project is moved with a single atomic rename. Installing into an
+    existing directory renames each staged entry and restores the previous
+    files if anything fails. Raises on failure after rolling back.
+    """
+    import shutil
+    target = os.path.abspath(target)
+    parent = os.path.dirname(target)
+    if not create_directory(parent):
+        raise OSError(f"failed to create directory: {parent}")
+    if new_project and os.path.isdir(target) and os.listdir(target):
+        raise OSError(f"{target} is not empty; to install into it, run the installer there with --existing "
+                      f"(or set \"existing\": true in a batch manifest)")
+    # os.mkdir honours the umask, unlike tempfile.mkdtemp (0700), so a new project renamed
+    # into place gets the same permissions as one created directly
+    while True:
+        staging = os.path.join(parent, f".{os.path.basename(target)}.{os.urandom(4).hex()}.ideakit-staging")
+        try:
+            os.mkdir(staging)
+            break
+        except FileExistsError:
+            continue
+    moved = []
+    git_ready = False
+    try:
+        if new_project:
+            if not skip_git and shutil.which('git'):
+                git_ready = traced('git_init', run_command, ['git', 'init', '-q'], False, staging)
+            if not write_file(os.path.join(staging, 'README.md'),
+                              f"# {project_name or os.path.basename(target)} - IdeaKit Project\n"):
+                raise OSError("could not write README.md")
+        warnings = install_components(staging, False, layout)
+        if warnings:
+            raise OSError("; ".join(warnings))
+        if commit and not (git_ready and traced('commit_workspace', commit_workspace, staging)):
+            print("   ⚠️  Initial commit skipped (needs a new project with Git)")
+        traced('sync_tree', sync_tree, staging)
+        
+        if new_project:
+            if os.path.isdir(target):
+                os.rmdir(target)
+            traced('move_into_place', os.rename, staging, target)
+        else:
+            traced('move_into_place', move_into_place, staging, target, moved)
+        return True
+    except BaseException:
+        roll_back(moved)
+        raise
+    finally:
+        if os.path.isdir(staging):
+            shutil.rmtree(staging, ignore_errors=True)
+
+INITIAL_COMMIT_MESSAGE = "Initial IdeaKit workspace"
+
+def git_identity() -> str:
+    """Return 'Name <email>' from GIT_AUTHOR_* or ~/.gitconfig without running git"""
+    name = os.environ.get('GIT_AUTHOR_NAME')
+    email = os.environ.get('GIT_AUTHOR_EMAIL')
+    if not (name and email):
+        section = None
+        try:
+            with open(os.path.expanduser('~/.gitconfig'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('['):
+                        section = line.strip('[]').strip().lower()
+                    elif section == 'user' and '=' in line:
+                        key, value = (part.strip() for part in line.split('=', 1))
+                        if key.lower() == 'name' and not name:
+                            name = value.strip('"')
+                        elif key.lower() == 'email' and not email:
+                            email = value.strip('"')
+        except OSError:
+            pass
+    return f"{name or 'IdeaKit'} <{email or 'ideakit@localhost'}>"
+
+def git_write_object(git_dir: str, kind: str, data: bytes) -> bytes:
+    """Store a loose object and return its binary SHA-1"""
+    import hashlib
+    import zlib
+    raw = f"{kind} {len(data)}".encode('ascii') + b'\0' + data
+    sha = hashlib.sha1(raw).digest()
+    hexsha = sha.hex()
+    directory = os.path.join(git_dir, 'objects', hexsha[:2])
+    path = os.path.join(directory, hexsha[2:])
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(zlib.compress(raw, 1))
+    return sha
+
+def load_ignore_patterns(base: str) -> 'List[str]':
+    """Read the top-level .gitignore (patterns only, no negation)"""
+    try:
+        with open(os.path.join(base, '.gitignore'), 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f
+                    if line.strip() and not line.startswith(('#', '!'))]
+    except OSError:
+        return []
+
+def is_ignored(relpath: str, is_dir: bool, patterns: 'List[str]') -> bool:
+    """Apply .gitignore patterns the way the generated .gitignore uses them"""
+    from fnmatch import fnmatch
+    name = relpath.rsplit('/', 1)[-1]
+    for pattern in patterns:
+        if pattern.endswith('/'):
+            if not is_dir:
+                continue
+            pattern = pattern[:-1]
+        if '/' in pattern:
+            if fnmatch(relpath, pattern.lstrip('/')):
+                return True
+        elif fnmatch(name, pattern):
+            return True
+    return False
+
+def git_write_tree(git_dir: str, base: str, relpath: str, patterns: 'List[str]',
+                   index: 'List') -> bytes:
+    """Store blobs and trees for a directory, collecting index entries"""
+    entries = []
+    directory = os.path.join(base, relpath) if relpath else base
+    for entry in os.scandir(directory):
+        path = f"{relpath}/{entry.name}" if relpath else entry.name
+        if path == '.git' or entry.is_symlink():
+            continue
+        if entry.is_dir():
+            if is_ignored(path, True, patterns):
+                continue
+            sha = git_write_tree(git_dir, base, path, patterns, index)
+            if sha is not None:
+                entries.append((entry.name + '/', b'40000', entry.name, sha))
+        elif not is_ignored(path, False, patterns):
+            with open(entry.path, 'rb') as f:
+                sha = git_write_object(git_dir, 'blob', f.read())
+            st = entry.stat()
+            mode = 0o100755 if st.st_mode & 0o111 else 0o100644
+            entries.append((entry.name, b'%o' % mode, entry.name, sha))
+            index.append((path, mode, sha, st))
+    if not entries:
+        return None
+    
+    # Git orders tree entries by name, with directories compared as 'name/'
+    entries.sort(key=lambda e: e[0].encode('utf-8'))
+    data = b''.join(mode + b' ' + name.encode('utf-8') + b'\0' + sha
+                    for _, mode, name, sha in entries)
+    return git_write_object(git_dir, 'tree', data)
+
+def git_write_index(git_dir: str, index: 'List'):
+    """Write a version 2 index matching the committed tree, so git status is clean"""
+    import hashlib
+    import struct
+    body = [struct.pack('>4sII', b'DIRC', 2, len(index))]
+    for path, mode, sha, st in sorted(index, key=lambda e: e[0].encode('utf-8')):
+        name = path.encode('utf-8')
+        fields = (int(st.st_ctime), st.st_ctime_ns % 1000000000,
+                  int(st.st_mtime), st.st_mtime_ns % 1000000000,
+                  st.st_dev, st.st_ino, mode, st.st_uid, st.st_gid, st.st_size)
+        entry = struct.pack('>10I', *(value & 0xFFFFFFFF for value in fields))
+        entry += sha + struct.pack('>H', min(len(name), 0xFFF)) + name
+        body.append(entry + b'\0' * (8 - len(entry) % 8))
+    data = b''.join(body)
+    with open(os.path.join(git_dir, 'index'), 'wb') as f:
+        f.write(data + hashlib.sha1(data).digest())
+
+def commit_workspace(base: str, message: str = INITIAL_COMMIT_MESSAGE) -> bool:
+    """Write the initial commit of a freshly initialized repository in-process
+
+    Blobs, trees, the commit, the branch ref and the index are written
+    directly into .git/, so the only subprocess is the preceding git init.
+    """
+    git_dir = os.path.join(base, '.git')
+    try:
+        with open(os.path.join(git_dir, 'HEAD'), 'r', encoding='utf-8') as f:
+            head = f.read().strip()
+        if not head.startswith('ref: '):
+            return False
+        ref_path = os.path.join(git_dir, *head[5:].split('/'))
+        if os.path.exists(ref_path):
+            # Only bootstrap empty repositories
+            return False
+        
+        index = []
+        tree = git_write_tree(git_dir, base, '', load_ignore_patterns(base), index)
+        if tree is None:
+            return False
+        offset = -time.altzone if time.localtime().tm_isdst > 0 else -time.timezone
+        stamp = f"{int(time.time())} {'+' if offset >= 0 else '-'}{abs(offset) // 3600:02d}{abs(offset) % 3600 // 60:02d}"
+        identity = git_identity()
+        commit = (f"tree {tree.hex()}\nauthor {identity} {stamp}\ncommitter {identity} {stamp}\n"
+                  f"\n{message}\n").encode('utf-8')
+        sha = git_write_object(git_dir, 'commit', commit)
+        
+        git_write_index(git_dir, index)
+        os.makedirs(os.path.dirname(ref_path), exist_ok=True)
+        with open(ref_path, 'w', encoding='utf-8') as f:
+            f.write(sha.hex() + "\n")
+        return True
+    except OSError:
+        return False
 
-def create_example_idea():
-    """Create example idea file"""
-    content = """# 💡 Example: Pet + Fitness AR Game
-
-**Captured:** 2024-01-01
-**Status:** Example Seed
-**Constitution Score:** 35/50
-
-## Raw Idea
-AR app game to exercise with pets. When you actually exercise, virtual pets exercise together and grow.
-
-## Core Problem/Opportunity
-- Lack of exercise motivation
-- Desire for interaction with pets
-- Providing fun fitness experience
-
-## Initial Vision
-When user jogs, AR dog runs alongside, and pets level up and learn new skills based on exercise amount
-
-## Constitution Assessment
-- **Fun Factor:** 9/10 - AR pet interaction would be very fun
-- **Differentiation:** 8/10 - AR + pet + fitness combination is unique
-- **Feasibility:** 6/10 - AR development could be complex
-- **Monetization:** 7/10 - Multiple models possible like pet accessories, premium pets
-- **Scalability:** 5/10 - High dependency on AR technology
-
-## Questions to Explore
-- [ ] Can it be fun without AR?
-- [ ] How about integration with real pets?
-- [ ] What if different pets for different exercise types?
-
-## Next Steps
-- [ ] Run @expand to explore creative directions
-- [ ] Research AR fitness apps
-- [ ] Define target user more clearly
-
----
-*Created with IdeaKit 🚀 - This is an example file*
-"""
-    return write_file('ideas/example-idea.md', content)
+def start_trace():
+    """Start recording steps and I/O counters on the current thread"""
+    _traces[_thread.get_ident()] = {'steps': [], 'files': 0, 'bytes': 0,
+                                    'subprocesses': 0, 'subprocess_s': 0.0}
 
-def create_gitignore():
-    """Create .gitignore file"""
-    content = """# IdeaKit specific
-.ideakit/drafts/
-.ideakit/temp/
-
-# General
-.DS_Store
-*.log
-node_modules/
-.env
-.env.local
-
-# IDE
-.vscode/
-.idea/
-*.swp
-*.swo
-
-# OS
-Thumbs.db
-desktop.ini
-"""
-    return write_file('.gitignore', content)
+def finish_trace() -> 'Optional[Dict]':
+    """Stop recording on the current thread and return the trace"""
+    return _traces.pop(_thread.get_ident(), None)
 
-def create_package_json():
-    """Create package.json file"""
-    content = """{
-  "name": "ideakit-project",
-  "version": "1.0.0",
-  "description": "IdeaKit project for creative idea development",
-  "scripts": {
-    "start": "echo 'Use @spark to start developing ideas!'",
-    "list-ideas": "find ideas/ -name '*.md' -not -name 'example-*' | head -20",
-    "archive-idea": "echo 'Move completed ideas to ideas/archive/'",
-    "stats": "find ideas/ -name '*.md' | wc -l && echo 'ideas captured'"
-  },
-  "keywords": ["ideakit", "creativity", "1-person-unicorn"],
-  "author": "1-Person Unicorn Creator",
-  "license": "MIT"
-}
-"""
-    return write_file('package.json', content)
+def traced(name: str, func, *args):
+    """Run func(*args), recording wall time, files, bytes and subprocess time when tracing"""
+    trace = _traces.get(_thread.get_ident())
+    if trace is None:
+        return func(*args)
+    
+    before = (trace['files'], trace['bytes'], trace['subprocesses'], trace['subprocess_s'])
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        trace['steps'].append({
+            'step': name,
+            'wall_ms': round((time.perf_counter() - started) * 1000, 3),
+            'files_written': trace['files'] - before[0],
+            'bytes_written': trace['bytes'] - before[1],
+            'subprocesses': trace['subprocesses'] - before[2],
+            'subprocess_ms': round((trace['subprocess_s'] - before[3]) * 1000, 3),
+        })
+
+def trace_summary(trace: 'Dict', seconds: float) -> 'Dict':
+    """Convert a finished trace into its JSON form"""
+    summary = {
+        'wall_ms': round(seconds * 1000, 3),
+        'files_written': trace['files'],
+        'bytes_written': trace['bytes'],
+        'subprocesses': trace['subprocesses'],
+        'subprocess_ms': round(trace['subprocess_s'] * 1000, 3),
+        'steps': trace['steps'],
+    }
+    if 'projects' in trace:
+        summary['projects'] = trace['projects']
+    return summary
+
+def run_observed(run, trace: bool = False, trace_path: 'Optional[str]' = None,
+                 profile_path: 'Optional[str]' = None):
+    """Run the installer, writing a JSON step trace and/or a cProfile dump when requested
+
+    The trace goes to trace_path (IDEAKIT_TRACE) or, with --trace alone, to stderr.
+    """
+    tracing = trace or bool(trace_path)
+    profiler = None
+    if profile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if tracing:
+        start_trace()
+    
+    started = time.perf_counter()
+    try:
+        run()
+    finally:
+        elapsed = time.perf_counter() - started
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            print_info(f"Profile written to {profile_path} (view with: python3 -m pstats {profile_path})")
+        if tracing:
+            import json
+            document = dict(installer=INSTALLER_VERSION, assets=ASSET_BUNDLE_VERSION,
+                            python=sys.version.split()[0], platform=sys.platform,
+                            argv=sys.argv[1:], cwd=os.getcwd(), **trace_summary(finish_trace(), elapsed))
+            content = json.dumps(document, indent=2) + "\n"
+            if trace_path:
+                if write_file(trace_path, content):
+                    print_info(f"Trace written to {trace_path}")
+                else:
+                    print(f"⚠️  Warning: Could not write trace to {trace_path}")
+            else:
+                sys.stderr.write(content)
 
 def print_completion_message():
     """Print installation completion message"""
@@ -728,12 +899,26 @@ def print_help():
     print("  -n, --name     Specify project name directly")
     print("  --no-git       Skip Git initialization")
     print("  --existing     Install in existing project (skip project creation)")
+    print("  --commit       Write the initial commit of a new project without extra git calls")
+    print("  --staged       Build the tree in a temporary directory and move it into place")
+    print("  --upgrade      Update installed assets, keeping files you have edited")
+    print("  --dry-run      With --upgrade, only print the upgrade plan")
+    print("  --batch FILE   Provision every project listed in a JSON/TOML manifest")
+    print("  --trace        Print a JSON trace of every step to stderr")
+    print("                 (or set IDEAKIT_TRACE=path to write it to a file)")
+    print("  --profile FILE Write a cProfile dump of the run (or set IDEAKIT_PROFILE=path)")
+    print("  --workers N    Worker pool size for --batch (default: based on CPU count)")
+    print("  --layout NAME  Idea folders: flat (default), date (ideas/active/2024-03/)")
+    print("                 or hash (ideas/active/3f/) for workspaces with 100k+ ideas")
     print()
     print("EXAMPLES:")
     print("  python install.py                    # Show this help message")
     print("  python install.py -n my-ideas        # Create project named 'my-ideas'")
     print("  python install.py --existing         # Install in current directory")
     print("  python install.py -n game-dev --no-git  # Create project without Git")
+    print("  python install.py --batch teams.json # Provision many projects at once")
+    print("  python install.py -n big --layout hash  # Shard ideas into 256 folders per status")
+    print("  python install.py --upgrade --dry-run  # Preview an upgrade of this project")
     print()
     print("QUICK START:")
     print("  1. Create a new project:")
@@ -778,6 +963,15 @@ def main():
     project_name = None
     skip_git = False
     existing_project = False
+    batch_manifest = None
+    workers = None
+    staged = False
+    upgrade = False
+    dry_run = False
+    trace = False
+    profile_path = None
+    commit = False
+    layout = 'flat'
     
     i = 1
     while i < len(sys.argv):
@@ -795,20 +989,117 @@ def main():
         elif arg == '--existing':
             existing_project = True
             i += 1
+        elif arg == '--upgrade':
+            upgrade = True
+            i += 1
+        elif arg == '--dry-run':
+            dry_run = True
+            i += 1
+        elif arg == '--staged':
+            staged = True
+            i += 1
+        elif arg == '--commit':
+            commit = True
+            i += 1
+        elif arg == '--trace':
+            trace = True
+            i += 1
+        elif arg == '--profile':
+            if i + 1 < len(sys.argv):
+                profile_path = sys.argv[i + 1]
+                i += 2
+            else:
+                print("❌ Error: --profile requires an output file")
+                sys.exit(1)
+        elif arg == '--batch':
+            if i + 1 < len(sys.argv):
+                batch_manifest = sys.argv[i + 1]
+                i += 2
+            else:
+                print("❌ Error: --batch requires a manifest file")
+                sys.exit(1)
+        elif arg == '--layout':
+            if i + 1 < len(sys.argv) and sys.argv[i + 1] in LAYOUTS:
+                layout = sys.argv[i + 1]
+                i += 2
+            else:
+                print(f"❌ Error: --layout requires one of: {', '.join(LAYOUTS)}")
+                sys.exit(1)
+        elif arg == '--workers':
+            if i + 1 < len(sys.argv) and sys.argv[i + 1].isdigit() and int(sys.argv[i + 1]) > 0:
+                workers = int(sys.argv[i + 1])
+                i += 2
+            else:
+                print("❌ Error: --workers requires a positive number")
+                sys.exit(1)
         else:
             print(f"❌ Error: Unknown argument '{arg}'")
             print("Use --help for usage information")
             sys.exit(1)
     
+    # Resolve output paths now: new projects chdir into the project folder
+    trace_path = os.environ.get('IDEAKIT_TRACE') or None
+    profile_path = profile_path or os.environ.get('IDEAKIT_PROFILE') or None
+    run_observed(
+        lambda: run_install(project_name, skip_git, existing_project, batch_manifest,
+                            workers, staged, upgrade, dry_run, commit, layout),
+        trace,
+        os.path.abspath(trace_path) if trace_path else None,
+        os.path.abspath(profile_path) if profile_path else None)
+
+def run_install(project_name: 'Optional[str]', skip_git: bool, existing_project: bool,
+                batch_manifest: 'Optional[str]', workers: 'Optional[int]', staged: bool,
+                upgrade: bool, dry_run: bool, commit: bool = False, layout: str = 'flat'):
+    """Run the installation selected on the command line"""
+    if batch_manifest is not None:
+        sys.exit(0 if run_batch(batch_manifest, workers, staged, upgrade, dry_run, commit, layout) else 1)
+    
+    if upgrade:
+        # Refresh installed assets in the current workspace
+        try:
+            plan = traced('upgrade_workspace', upgrade_workspace, '.', render_assets(), dry_run)
+        except OSError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        print_upgrade_plan('.', plan, dry_run)
+        sys.exit(1 if any(item['action'] == 'failed' for item in plan) else 0)
+    if dry_run:
+        print("❌ Error: --dry-run is only supported with --upgrade")
+        sys.exit(1)
+    
     print_status("Installing IdeaKit...")
     print()
     
+    if staged:
+        # Render everything into a staging directory and move it into place
+        new_project = not existing_project and (project_name is not None or not is_git_repo())
+        if new_project:
+            print_status("Setting up new IdeaKit project...")
+            if project_name is None:
+                project_name = get_project_name()
+        else:
+            print_status("Installing in existing project...")
+        
+        print_status("Staging IdeaKit components...")
+        try:
+            staged_install(project_name if new_project else '.', project_name, new_project,
+                           skip_git, commit, layout)
+        except Exception as e:
+            print(f"❌ Staged installation failed and was rolled back: {e}")
+            sys.exit(1)
+        print_success("Moved staged files into place")
+        
+        if new_project:
+            os.chdir(project_name)
+        print_completion_message()
+        return
+    
     # Check if we need to create a new project
     if not existing_project and project_name is not None:
         # User specified a project name, create new project
         print_status("Setting up new IdeaKit project...")
         
-        if not create_new_project(project_name, skip_git):
+        if not traced('create_new_project', create_new_project, project_name, skip_git):
             print("❌ Failed to create new project")
             sys.exit(1)
         
@@ -819,7 +1110,7 @@ def main():
         print_status("Setting up new IdeaKit project...")
         project_name = get_project_name()
         
-        if not create_new_project(project_name, skip_git):
+        if not traced('create_new_project', create_new_project, project_name, skip_git):
             print("❌ Failed to create new project")
             sys.exit(1)
         
@@ -832,50 +1123,186 @@ def main():
         else:
             print_status("Installing in existing Git repository...")
     
-    # Create directory structure
-    print_status("Creating directory structure...")
-    create_directory_structure()
-    
-    # Create configuration files
-    print_status("Creating constitution.md...")
-    if not create_constitution():
-        print("⚠️  Warning: Could not create constitution.md")
-    
-    print_status("Creating Cursor instructions...")
-    if not create_cursor_instructions():
-        print("⚠️  Warning: Could not create Cursor instructions")
+    # Create directory structure, configuration, templates and project files
+    install_components(layout=layout)
     
-    print_status("Creating Cursor custom commands...")
-    if not create_cursor_commands():
-        print("⚠️  Warning: Could not create Cursor custom commands")
-    
-    # Create prompt templates
-    print_status("Creating prompt templates...")
-    if not create_prompt_templates():
-        print("⚠️  Warning: Could not create all prompt templates")
-    
-    # Create file templates
-    print_status("Creating file templates...")
-    if not create_file_templates():
-        print("⚠️  Warning: Could not create all file templates")
-    
-    # Create example files
-    print_status("Creating example files...")
-    if not create_example_idea():
-        print("⚠️  Warning: Could not create example idea")
-    
-    # Create project files
-    print_status("Creating .gitignore...")
-    if not create_gitignore():
-        print("⚠️  Warning: Could not create .gitignore")
-    
-    print_status("Creating package.json...")
-    if not create_package_json():
-        print("⚠️  Warning: Could not create package.json")
+    if commit:
+        if os.path.isdir('.git') and traced('commit_workspace', commit_workspace, '.'):
+            print_success(f"Created initial commit: {INITIAL_COMMIT_MESSAGE}")
+        else:
+            print("⚠️  Warning: Initial commit skipped (needs a new project with Git)")
     
     # Print completion message
     print_completion_message()
 
+# BEGIN ASSET BUNDLE (generated by tools/build_assets.py from assets/, do not edit)
+ASSET_BUNDLE_VERSION = "bb1678515e20"
+ASSET_BUNDLE = {
+    '.cursor/commands/ik-blueprint.md':
+        ('c-n<jU2hXH5PZ+CSg8^esTWj=c&HE(tq`gpYSdIb*YRy~CO-Sv^(D=}XZG^Z4<2}G&$Bx_o>}LFW}8raLnYHy?75'
+         'SW3Vjvdgu=d1n`@>;7V0Gbwu3IZltNmLMmMx^s70d}c7@5&{K#M}?Uq8#ZcNk2PMKnMHI;_R=T!I+MM1P&QdkV9R'
+         '=WyDn4^*t5UyQ_ZXWrJq)+tFZA+8W1y${__(1j94nP?B3ssfRZR=9~r00R`6Eb%KI_Fn}?g3Leb;hG5l)i+Vs18f'
+         'ka&}a8hFYbFJ8B_*>|9bSGs?A#p>{);aF+#LyGd4E58e8X0?2K4UQq7X>;rd(B_>!YC#Lz<{*37sLuC_y9o4?j<_'
+         'eAXmw*2p7`OG9?i)^|{|)qVG`c=S2CF(@^l4c0Q_7ONtS%C`8kC=$oY1#N_85h#Sr2<<JF4h5aixq1l1H=6#o={E'
+         'b}**rJx?%!0HzYGkBXBe7jk_atP#i$-oo|8f(2w@@N+lxo_&*ohmu*xJ}mI>p3D%^Vo9Fj255a@)LSLr<ltG~q4;'
+         '?J9@6rfWgU34p9_C@DFdxiVy?M1tt{AKY>~Gl{`5h(g*M&Ex@o&OeD9*a!)CXxL)+xnl++_+I=!e`EN4T@?4oIyH'
+         'ueb4X#wXU18X<nO6S$Z6aL{}{A2aW@Sm<v!<C_xm)o6?t6oE5Rhl5z_{?MBH76v1a(1l_v0!`g*$*!4FW+*J;MKM'
+         'Tyncn_?~*s=^_;t)E1Dq4<#Ydc$p|o|H>5cZ*4wa&lNBO9KrR-R<ZOEky<^S2n6rC)j?sNL{J0oC>%F&2c|m9r94'
+         'cCSDFshNkITDX*6OgVcml(N8kUx}nDBbLK|lTrLeRYz'),
+    '.cursor/commands/ik-constitution.md':
+        ('c-nQ5y-ox%421hU#Ypr){55oxbSDrGkV~9hbIB%3ynDL0$GdQXL(p2^jK||EywJjQL}{37a6*ug;LFs7Wfm@zG0!'
+         '-<NgxI7H=Iuwti>*o>!hFypH6dYq~f0xoWOD*cVM}`kmmq51&ov`GCdk|W6uH4Ms?&=da2`SLuqkocAKkjEY#SUT'
+         'Z`9u7^n+4*H#wFs_fWnvH&GDbtDRV=MU!2;_d5j@*}$F5VcVxUFWHTBPN9@n0t$-@II^UA6s!G9!BZrVWq;_Q7(b'
+         'w36&+fl=@nrTM7qbb{a|xK(FLEve&+R$(k~3rv1Bxf1ZNKiR=dg_o2l'),
+    '.cursor/commands/ik-expand.md':
+        ('c-nna%Wm5+5WMRv2IwV5ECsEbOIoz(3q?;g(DrUxT3Lko5J<|7{=P%WR#G77!H`An&d$t^Ug6hSr@BM(_!2}VeG+'
+         'U{NKOK*Zv?Fm(2Xd_W3OD)-WA0UoRv$tXF6<P$GN7yK$x+@)`*G%<5h#y32N_>JSMa{#Pk5&PN%u;s56!~5h@7ON'
+         'ok|@M%D;}!>%7w=iLUSU5c+z@28=yHu3>wS$k_UnVHiL`9Jy0(|c7P!PY)#mm+Rd28l_hAyE<<eUO;e3#Bz{BaBK'
+         'sT~s|;utwvp(vGm2fQNV)mK&N0Ag-W^pU3+az8A+b!h2eh2}gJ**pK;9;V0*Yv*z7G_#b*Ip}L5_dwx;bro!(|9O'
+         'D1i_)rwDD|{ZbAs<H}niwQB8OYWSoAUli=t%{w@_<;psfg%fEPHQ^b`&_*H@a;l2xBl?K~E3L67#n9{>bMVc8I#Z'
+         'Z8cfMxQ3*<TD{{2gpHHN!O>CU13g=eY=gJc<=5Ha?e!u`J$Z4%K)w`;D~)HN*sb7CoW*49GxaQJ!an<OjEn@+X0q'
+         'cWIu(meg-^COx*gFnd9A9G4-qBK9T#BLkz3;+OTwUV35f&A?PKw_!nauoH4Sl41_PH_^8?_b1Ee`z-irGQ--T<*M'
+         'qd3cmtb+Bv%PjON%uzRbC`w4qWDA1Og{-}W`N18B^lS_c=s}J{*?K%D&^f*e*x|wZ^r'),
+    '.cursor/commands/ik-reality-check.md':
+        ('c-nnb!EVz)5WVLsM(Uv;)j<V`141CEKyaw2+N!;FvYy1Ftar`MI%)WN-fmpeUN|MO-@JMA-b_yDX0O?Glp|dv&Fa'
+         '|GrGy+4^|2LN<I7subfsSNfjF=~nA&3TllB~PDQqJ#CE*HiowzN<K>dNV6<*SnN4=1b+*0m@Tnt$rGp#jQ{y@5}P'
+         'YZUdg)e#|PC~q6^}O<OMrjQ6FdT9h!#isF8T>@`u{;2wmrv9*F7`c#_DNDxB|Xse=qO@fs0721G-RV!T(~T29<xG'
+         'xs~fR=HY+;=*2r_lQ<BGlgB4hz+@VR!wJOOF6RM7#3c9V;_L>yrrFUFY93*JifIGsLBHG}W(CSb=mh=lv(_ZmzR{'
+         'KI5XIf4Mym|g&*|$r&?Ie)>H`5P`#g~%eADPD^-f&U)vXMivBxMwwoSe|DxGq$(@BbEJ(a;44I;TOBp=LFzFPhab'
+         'GQCH`kUOhuba{968SwiK1C)GA^Nv$nEX^~w>)3k<u)lz><@cxwHriIbrwtEAJ9{DX)DWVqB~@5PuBGs{)6_NtC#+'
+         ';EaJ-e^6i%0HT(k`OI@Kkotz<OfX`K5mB4KvfA822ijwW@W&-7{~WP><et9uRTkGMZVFbdkJxww;rRhj2B?Xkm&E'
+         'cz<eK&>{t2Y(!^Td1BgTc_BQ8!-%SYp$BKejQDNn9-f`Kl^cB39GV`FiH*BLlgufmA8}srQgj6b2OBLA~rg2=ERP'
+         'q1#<yR>@fm6_-<O)z;ePSZw|*iERM;Q)vUqvQmzMyKx!n%I4h`{<X)?7>5Cc23+~AiSBKt2+NT&ch4so~g}&l2re'
+         'Pbp)S&&?(@v{i7&}OL{_PPr`y{CRb>L?k#lmTZnF-M^E^swjo}FcLJWHHMJ+^8N9WciHXSVzc=heoH'),
+    '.cursor/commands/ik-spark.md':
+        ('c-n<hO^?$+487-9Sj(j=ZBn`g4l9H}d)gBq;J#+!G*;(}@nqZndpwi2v_gnO4))m3FYmoq@Q5)_i2!{M>^U=9djJ'
+         '$65kT;?1MUf%<_UJ_Gvol~V&$*F4!&4IA+P~^$RmLXKGQzKz)A80@KC#DcFP4XSlushFUS^uTDpTYd3cV8JO;mp)'
+         '}4n>P;G01bLGB7Ok1sM`{sSZnZ<{j=SnZpkwiqZ1x1L7eHK_?!II2*${alOydlZQ6^ohr3M022eAe}}WBsEu*wrd'
+         '#=#KoBmk*umJNQ15e`uOj2j9l91KJzT<VbZKLaJD2f$ux`I<eVasJ}s0yz6r&DMDg|#j0Js1~F*qwpn-ZNw#p`uE'
+         'AJLJRI0>;Mb%-rAty=n|x1dK>0-zRPGlReQMrx@Hmo+QwVv&)b>-fY*Yg|S@thGdeT{yqwZgduZF}F)JmuAdhJ*)'
+         'LyRHiNrQGM9xeW#2DRX60AZ(Pnq8>_mPKv411Z8PhO6$$w5d+gK5AJ+DDbq`;Zl@!D54fC!=P#s)`vO3!Bg{A1u5'
+         'N`R4YWiTB%Z4?f99%Qq{65C+s+nklE=;bg_A-J|788QeZ#MJk(Le*M#cf*fc*hOof(4A(pVgkb?V@qElOz*9_Dk{'
+         'T$}Pxcd!C&rys'),
+    '.cursor/commands/ik-status.md':
+        ('c-nPR%TB~F47}$nEO7y8NyX#D6)uP);=b9`ZOyhx6}xoz?{S(6brIYmduBZ2_zK>;ID?;3!XWTkqkAKPF~v{x0xV'
+         '7@Hf8}02-4vXw)7x2Fr0rApNx5Jz>-#vB$ao*!>SPMC&vJIA{K`0IgtnkIGkZWo~4W70d5CaiR+9#xKP6pNBJ544'
+         '}NyyyZy}$61p0i*w>iA$0-Qsn$OgX<wcQwObD)R6Shu}p-EA-6cSjnfM#RwLZHwVT4n#pHOF-1(RtiP+rh-BS_~t'
+         'm+e`o<=}{Xc)bh#(ikF_kQ4PcdHHxF2w<h9<iwD$sixFt3M{CTTh3A}Z4Mm|q*5KF93w>d=1DAYPUNnq74!Q@ds~'
+         'dA~%l}`jW+v(KPg7o<njo2kG+1$K9xS{NkG(rzoQZ}e&*o7Tr?y2F2zV067E}Zdj#0COi}OKaK6t&V?Ib6g9d8<T'
+         'sFxLKO;p@|176tsg#'),
+    '.cursor/instructions.md':
+        ('c-n1N(QX?z5Pa8HENq~S0ZB$tw6Bd5B!CeZ4U!f`Q4|ox+tV?+BUzFsS^4_TlDxBI`^naENzTsB&hnb>8&;o8qPr'
+         'MPOv)y@w=soLC*y2fEdF*QslcQx-QAO#qoQYRRByg>L&j3ay*GA8ilXZsu}y(}V9R5mh7a63Pdczl=D=idXQb8zY'
+         'DY_v!@+2dxT2w*8aS@$kB(`?0yWq(L~<={S-YWJarM*6bBNB;XpMHkUgf>LJK&UZ3*vx*LsG`dkH+jwQa$k_b{e+'
+         '0Z@pOD^+$DzgdGhfT&a<AGHI0DNhR8>1?t|U+w+z6&};w)_!(QHcear$k^`IuxRQWLHG>}``CzOzzON~QmX^Z=;r'
+         'g0DaiA|w)_<VSIWZMw<(l44lzmnqS@7}T8m2dIkp_;sS*+;8BbXkzKS{pb7>xo>O=|1LM3#?*Yy>`F0cT5ENXD{G'
+         'g_kyiNz}LjT*bLcIFYceQl#QO($!xbcAJ)tLe;P}mXW84bTp}3uh+j_VZ%qKkvB?aX;6=5FyG}KDYPVyg8er_7Ev'
+         'I5^&q$GMq#u`NCZf7T;wMx_@a8ZGc23F%<Ns1EAuQ%0fJ1dJ3<}wo{k+`RH^3!R6CJsKoP|7fZN>6DK6_xI<0iad'
+         'ViCX|1hhiSyEol<cj#b5P0Crgw22|OAab4NO!95+3v8oRS~%4+quLvkl+F(JPX0ejk}IOP|V#|tJtD|W@`joZkk#'
+         'BwXx(vobWlg1BzW~$sG*pbWYa90TJ(1uQGAYCln?Qg?b;9E`(sG=3s^94+qtcDv4%yqKlLj{mTqln*KbOLhZYLWR'
+         'W}kB<K#2I!*L$rzKJC*Av7zsH{{}yTBc#bjthSl<pApd)O%pgNfBJu-B2w#-z4AlSeiJ^-p2{)#A6o4VNfarKLEY'
+         'mGjrt;LtmSdz(S|cv;hid+-?Yji?56&&9j4(bW=g$enz5P^Qn3@7*vUv)aaQqgP>1|41JHF5W9Ix#rB_P6;-OW`n'
+         'h&E8uQZ)2=Jj{9_fF8yF9@2B(AjOvx>P^st<Dy{6d0;w#Du4#3t6{}@n=HN6{6pVi2ZLIL_yjw@==!Ns^LZZJDV7'
+         '9-%!9eGgDK>j|%oYqzuMJz^{@lNnAIt&eVj`Ol53(PyT{poulV3y&l4K#y*YE6@YtuTOGNY63MGCaHeHPsdbQ)+I'
+         '2zThNLa)&^_NeKRW7Xdo+CbF|R2l0j{T59xaihd60LY`mvU{HQAAOn>~-^dZqN7Jl>*;VqaY$1^?WM8JrM+ta<bM'
+         'CkrM745VaLEDEQ>Ej)l#{ERBE2c{S_=B)(#f;@;H1|#rQt~TtO8k;M{*&+pfi#h{Dn)4_u}NH-j^eLWA_sDiP=A!'
+         'xe;wO25iH`hbbUfS`7_?PJ@f(H;J@os6DluM8AA4FOln0wU^Z(Dwl(YkI2=DA5qBJD>nX=I%j{T)j)OhPf;6sqv1'
+         '>CxpVd~kZ-p&=5}*Kc!Y%fqR4N87mo^{f@Or$1usbHzI}1%(S<#d)V%%%x8IazMQ!%%focqSY;RAmf<7u}dvmiCW'
+         'e|P~i@A+}1a(-7K_;;{{D&8m{LNJ<U4D-E$Y$3iQ3@;@?<5ok;aXWc`9{3Wg8O|;9@7f7fw4cyZGP>%BqPseE`w%'
+         '1tm;dow1q);+0ijqvuR5jas-ILk*EBuL3PzL8JGE}N_Zto7e|)iGwv{w>l3!c0I(tgoS2n+Z*@OnV#$l8g-S$z*_'
+         '!j)#MoNC2{xMcf0A7ajs'),
+    '.gitignore':
+        ('c-l>ju?~YU5JUI-3M94;;U_>9>d+zGQAmz*g5)AD(BE%@DwV~O?Pu3j@6bFbRT9zCL>3g~WTDi!%}hy}e~{3}i?z'
+         'nic<~ZUl$px}>gtXGH?x9j^`H}P2sgFz8v;8VJiC3x@{Qp*C3iN{dDyods6%Y#e&<b|$|s)61$k<C&AT5(xe*-7k'
+         '~k^~1Yh$VLhA'),
+    '.ideakit/constitution.md':
+        ('c-mc5U2_vL41B*|p=lo|nWj)a3gm@>l+3`i5D4Yn@#%7+j&)<}k{-Vv$rqX#o^r9R)oOR`Q@ETiF=dW$7s+#qFi+'
+         '@&(~}IJYjiN@n1!Sl;#gIur@D|3mMsO&+_ghBg~?>mNASGG3=O3$lgSJ|va}#Af;T)ZhAy$koWaE!`iu$ip~FNNJ'
+         'wk4|4>hb2F#hJjtpgU|dE%U>HE$h7pcr{qu&hDhi4buQI~RI{^`IPLL@yLKMyCrX7zU`RX)s|FWrv~81$o7Rl>z#'
+         'GB*%M927B9QF&<>)TP-p!APl#^meztJLN_Yrg8nIB%RXggz=<{#T_70@YQetGS^y_4?+s$>?iE;$gx;S(aw<|%rJ'
+         'SDAJr{JYdQfVVC7%?@KiPnzi1S3EqB%HQCenT~JgqJ-4i+q&SLY@ZIJ<nV6H%1>bOv8|fQA#S%@GrRw4lZv2DVYE'
+         '7Y1<sj}#pwhO>7^ka<9tl(=Rg`og41yd7DZ+?hiWGFLAP8+4i0G%5jSZ;wDGW2dH)$+{<L)z~Z8a+Ed~n%RtbBv-'
+         'vMxLXxk=+7guH~$k`_nD%FYs)o;gLu_zt6g~)+>y%Fv2@W(uUT$1NBaA0>(V`nrP9SbW<rV_p_s5FX<P`|jQp@;s'
+         '@3^#J4|6XWbFY2eG6Hfzt_FH=nFM*X``@3cwPRerm0>kmN8N=4z_$vNrPLEbkZWQiE|WqO`8KgrXA@;8c8Ko(-PM'
+         '3)Am+}-ixGqVytKI12q%p@D(5A;&(oWh1#S6G9r4k9Qmq}mA&O4Eyr_M^_^S0Y|*}UQa)#}<Sd(ntM4~@;QNiH(6'
+         '+G)JlHLn!7of6!#VtL6!vbgR>K9csbmSyGq|&v|DZOUdhPk_hWF)T6rq@(Tt~IN6v8reI(Jn~r_*Zksn)BZS+NI3'
+         'b3=_8O%3@H2@Q0zmjG+5C)HnN<f%&'),
+    '.ideakit/prompts/blueprint.md':
+        ('c-m!C%We}v5WM><TCxN|%32CR95_M3LkO%`cEr6s+um(FkEMIY#(X_JyNMIQ#j>aRQC(G@!~3l-GziBG4Q#R$my1'
+         'vfD~~a9>}Iq199ATnBEEy0bMXgpJ!f)xwmE60fSKJTB<V2nA8IcFUFH;<Bup_=yMTMasJkRVfm=fRj5z^^!Bemj+'
+         '<Jn+w(4Ts`7yat-=9d;=Q(`(O|E1<5Nt{aD5qHicaa*cYofCmoLz5^w@C;NXpCWyG$iFp2*99~aP5SQ(oqI1E!S2'
+         '<zR?L<-t9<i9AoX6*4~rrBRll48OZU@zK&osBA^-F9xetUYXz60X3nKnyi{;~Vn_PQiqEpyJ&+D02d3l0Uekj*8O'
+         'JI_qL$jqm86P>^)#Vhg=LgWCt6?6@{Px>6Se^dYg_(Ufx0vhTwFIH#oR-e&{qzt9+lt<c7&CN!o`RyTs7BE`0M}i'
+         'H_h9Mf5#HXlZ`8Nr-{f-QI4bv%hZy8rm@h0qIqEDgh5ARG}oUGu1?1X%EC^;B4Kmg-k!fmI_7`(tXcQ4G%LI3`cK'
+         'Y?VG1umlOLt8%a$m6v-lB0pGhLt{8V&Jnu=6qAMmZMF2j^V!#BmbdXy70O&F~ruqVyQZXIKKSMpFYe6AMd*=-6If'
+         'u5q)fLiQ+n$^t|KlF>xLhjLyPl0TL<)rww{!<Eie}Y}|J{_wB+rqxqo@Xp(e*xz;MN$'),
+    '.ideakit/prompts/expand.md':
+        ('c-mc4OK%i048G5=u-XHy*ck~*F9-o`DHY;UiPr%kHO)9X)+TWjC%fH$kCSax#AzlI`}6nk9K%O^NG8rO!c|67Xp8'
+         'U(x9B+qjAa;(kKq=xa5Qh9D{f6L5%X{z%Tk4m6tXL@nMKB#gP{mzp}4^eyM@8?76mNFh_+B%LyZ}|DL8{8^s`KT&'
+         'Lu8pOPq&S6I@pEGjIfaAn83cqk$cj1<uBEo%Kj%YclB@M;TsE%CJ#L>^()rKh)3U9A;Gm2W|o<YZDanrDfjea|J<'
+         'F*q4q}mB<RP*y(fyDWf*#Ha!_?Pf=Zp%6TKnScJt0L@vrQdCsb5j|EQd(!MMl&tMFl_J*EEzw0_2d3=9&I-E^#5t'
+         '1jj2UjCFV+&`|Fm{V65X?q>)8?SqpaL)#1yLR!hBp&jABL)%RjTn&1;HB87S4e4`tdZJPjG`8S2N_vx3R}A>f03N'
+         'gH56OLdm20m0M2D(iY2C+{5jXJJbkAzZx@gutNy+pprFd=?K#_9kq(@?L$U&coql<?BMtR8T@%F{vo<u>S)!ty{Y'
+         'R(v7hd~1hb}yZJJtF(C9|E=P9PVXj{d81^2ZaENi9us<9X^+-sYL&upu}g^F()uKrzA%i+E)OV>NXjc$e`+t0u$a'
+         'V|Adp)UR#TT-K`C1JWnfF9eAA^`2a=9EceXn)j<p4LkXuNUa`Ps-YzxahgzIL)GFMg9wxNjO*'),
+    '.ideakit/prompts/reality-check.md':
+        ('c-lo%J#QN^4Bh=Jh<Zp1#0Ju#LzgrO60|4`1Zj}Yw2r<btP`)KWXJ!$l<e56^u+f?&Eba<M$U&t7$|IE0T0TV14g'
+         '(@7!Srao6YC&Olp$w`{jB?DT~e?-zQS06sWs~NinqBYY3>EdRUhXSxP@F;dhd~K^_RgfH6|)$v`$>5(PTiQIu))q'
+         '02`2!46M~Bke`E^>_}i6o%9UJP{hNxr(2;Y)o(iQ<Lee96P7-=bYdhjFR$Tun~pT+w-l%{|=Y|m71ObwIg$(=h+v'
+         '975qZ~3M+MBTaFQWoD6mbL6T+8C9|X}bMv$zZLo}CTOYm-tleTl%?EclQR+M>cH5Xbe{R{wH&-jvEoCQaT>vzN0`'
+         '%^A#slmtZ82(=ZsGHqz$Oa3;qb+wKV^S}xEUv63$h~x&S$5_BS+Mlb(3p8n(cJ&^QE-B{I%^lhXFP!BZT61Qog)8'
+         'sl6}8iOk@Q@lrq}Cs6M(74pP8iZ03pdoN#44OG5A#pB_G>qvkGH;Z#;$DtMT;20U*0tQdsxRQISikbSuu@RG^ft;'
+         '^ZQ}?EI(v~UUguzvv<i4<N;m*v5SKLP?p_%Rl_A05bQ=g+R(LKm?GP{5kCmzcPJ8pVC*oo@-<2&cGAmEK>4V{pss'
+         '|<Bl8#BC0qS-^;5-t8OcGSK@=Xyh4!lz#ly{F@k@L%Wv*L>YDk+N^py882N#I=;XTrNM&{sWnaMXL'),
+    '.ideakit/prompts/spark.md':
+        ('c-nPS%Wl&^6y48PoF*GsIHfJHh)~s1sMHOjJXTSpOvcyoRqUBzX52I%z^<Qw)PLg(_yq1aP63H*EI;m?dtM&nB6='
+         'OxC~#vrv2JivlE#(xsSBjkc#Mx-@Gg=X-XZ7>ScW1toNACwbr)I37Mq$ILh0D9zyq9)kz#CR3VNm4#suT!%Bf52E'
+         'PP;V*f$g>{kFGM>pONqolNk#b{o*W;Y2+^<pNSou(V^KPA9nS*sPoFu;>3fOb~>?8qZFOlNX3aH}qVcO>i04I4#a'
+         '#8XdUWX5QaAiuq7Pa_DSHAtr500Tk(X9OaXGIl)y;X5ACAq(f15zG0&i4W=yoHr39ap=f)iYfdOhrU<4#IeN3V@q'
+         'C1$@WCw`YUOpmXLvkz-n)=Gv2uGpS|IbtMr2LeZV|a<VJ;T2aL%UZSkx<_7f8tT&qX9ECvAx;hr@O^bS&H(5vN{@'
+         '&E0Axq9G{?#s%H`yh!r3be|9t`97IX6utOD_(H931YRu`3-#;q;Suk1M)~kQ8JJyJ$|I%r#kzcI!c-Nw?kujgNiI'
+         'w=%dyO*gR^B|svzW}vvZkx$5llkOV(NS!BHSX$~`Z+5w{Lws@uN<7OjmKKFw{LMNft+HcuUZUb-$J>9C?~k91+4J'
+         '9luh53dsIMfyA!?BHbiuQ1{D^T+ogwsJaTG)vsdDc$;cG3&Fmx}~{<snmykHdB0+O!le$(Il-GFus!?k^`Au@=+h'
+         'zZ(S#1!T'),
+    '.ideakit/templates/creative-expansion.md':
+        ('c-q}mOKuZE5Z%uyO7hOqfPh^#fjEv7fdYyRSy)~)JvE+^XS#>3o;cod0uI22Eyv>sdEFB`fZzhz**&jby?XVT(61'
+         'lge$p(kiE_&{zw3=t@$Q6H%gg1v`MM~k(=(%75gw;gTD9V~6g^4Brc~zYSy!zA%Aplk8Fc<;IZuy^XyTyh37=aZ#'
+         'BJ!434(0iX;Dlj^ghT&oM~z1o#j5#HCxjctFs_nlMY>H!hW5hN11<8OdkK!3kbh59jD|Egrgu<8>CN|{3&?Vvhtk'
+         '~N8+@XkmED<rZJIxY&cLY+*S_&SP&c0(-eO(II4|}K0HQrX3Lr(#4d7(;6}X}f7$gdcX%FEIv+W^vRbljoLH1^Q4'
+         'KsDb?Ex<!d^br!d^Y4!stejeP%*Mm)H+2Rx_W7BDZ_;Lo9t=LT35d-(j>j8`j@q=dLlRzoH9_`4AY<H)gMC*^*KS'
+         'W#kN;SC6{%i`~Xxdp0A%M}+}cG{)+Hh!&O|eD)w(^lYUTOM`+0`<&{A1v@`LaHhwXproC&Jkos#Tysb+p2JI<ltN'
+         'J>wxQc&`)cM^Ax0zh!FQr*#c>E|*X&P6o-4kKw20hmQPPUmbd6rT#xA!K_oZ#vZgE@?en?jx(~bDN_e?6uO60QJp'
+         '?|&us16vM11T$;0B!Nupuk@Spi&nPsh4m(H7;M8oy3NEbk;=yJR6V|UvrCuXau}Sk%t>~^1t&}VxU{8#)*6Y?HYD'
+         'uv-FHOYX|Oe0pq^`MOl``bS$+RrKJ&iD-k#P``2l45BzHLi2'),
+    '.ideakit/templates/idea-seed.md':
+        ('c-nnZyKWmX5bW<O7EnjvV9P<8G>M}JAmri15}W{sD`?(IT8JVK<X$AF$~UA;WB3pK30WQ`Ab~BHyE`-cngKlC|9*'
+         'g3gBs?D%^Ro|v&F|rT@*@<bjw|kq*73gFBg(kYR;Owm{JK360R^|y^BoTF?k1b;{*1r?`N;iMQbpCYrX5+6xCIr6'
+         '*+CecxSL>&=GLo28<D#3?2y|z65`3aeH>vwmxv@i0_K(+gdZUxdM&H2)w2U(c2#gKEN*3mz~QsVlV+U<J+t|6A_Z'
+         'mHxy;ggIbS_oiQ>1SnoGrX>(-!x7Vdi7~>Wl7bPe)l{Qmt*oS`CVL3dnp@d30M(^q#Gp6MdgD^-ZiD!WTSxzFlB`'
+         'bTL*8AigGW|R))}!V|Tm6z$TJ39xG0DgYJxunkm7@#0f*Pu04TklT)Wy@(tE~7L_biUUHXabya-nzfTkV?E1ap)8'
+         '6OxBD6wvfD90?dv2eXDqTe3O`g`|aBr4M)iBFDHShrl|lkfDnhVB2e35wLgJb7<xF4NS>m;!V;d>GNW9OKu}>L3e'
+         'OSleW6imYRIq6NvY=!#0rP=K)1omW3MS5O&1t-t-^Dh>!PweyQRw6E+{_'),
+    'ideas/example-idea.md':
+        ('c-nPT%W~5|5WMRvrYbilPMkn^<O0EoNeTkNrjkP{hqW}47O!@fefYtNZ{Wx!#UJJqm|58}R6&(4yF1g<J=3Edczp'
+         'Qr3(l9Ku?kP%8UyUYNCu7G!|52_iUzZ+*Bc5OqQl~(*Mp<M(bN9mkUn~t1QDX=>oo{W5DU&Q+6Nh8kVeBKHx4=I$'
+         '??JQAj@`kU@R7JS)j<Mim(<csszCRF45)EBP?X7!D8_Ha9g8>m5Cto5QS2!E@}_v((zr2+$IN8VW`o8&;?Y^EcR2'
+         ';A<=+qXQm39gOAo4%GENgvOc^Q`3y|Cg=kEWbHViK^$fkF)Y3SRI-nyWtgGWlAp|>@h13<4QA4@zAucUCi8{wb;F'
+         '79IVtXS!11Dk86VETE@_XFz!c^d*_8^qem6ru+WD!Z9!Z|94Hr*%`PJ_k;_?cA7!&G=IfM|6ZL}Q{3Yw3T?<J5a1'
+         '*C4(1q1PJ`;SotPj%W1p;BWwa=0Y|9mTRIaV2UtDw_=$o`%IQ4I>M5vTMY4{gV;?VyIntW(@dpKfgn9l_rFGLNuc'
+         'm@Diw``A)a**1&cP8*;4wN0pXC@mMQbfXbkdOSN(aLdKFcW?8wFxNbRx4Qvo_FIm1Lt<T-ING#~1{b=b(*Y{p5}&'
+         'V>?NLdPxYg{*3#WKkD1)fKm!I0npXZIr22so9?*dS>I<(dSF6$ajQ!2lp@(Bs{PLwh0@^#6S?Q*6$Z)0b<H`-1*9'
+         'ht<fB=eZGmktp$aZP;4g9x`bW2z1r@?$|9vQzYn+!FbQb=8fi>iUXxeZS7`|oWyq-{Z2=OT!{mW30X^9-uUY(Nwz'
+         'S5Z=QAv&rjo+Z9<~l|5+IvawM`nM5`hdmk_tKRoXhiCoWPxudIk&Ljzj^AdkVM_N*3*u{}b^>MYN6@_wRtL-|uI='
+         'VS8+Q%D<p@G>^xJpWkV^pKCHDeS(*${hyUYub2G>6>YqM'),
+    'package.json':
+        ('c-noEyG{c!5JmfZ#o!_<p*RmpDkQ21MWP@TqOj}<YqIOH>`6kD<lpgQ7dpy$+%tDPzDxjwQ$31D5Z0jDTb4f17it'
+         '!>Ts&fkmRzo{=F9oAW(`IitmmP!PRbX{FeqV10dzpc_K1+NVDN|?`5xWCt@@bMmlWm%tH2qCx+Q3~5#cF%752acr'
+         '8q*Y`z+9S*A!L~cQ&#txlGtuXKKd+WZn*%`+0Ag6cCRY{8qj1P~JCig%*_o`LG;$D(E(OFUUVn8%pbF$}+}bLUvb'
+         '24VuNTsbre}_j84l2HC-M3Uxw7YUTM5&@>`}Zsoc5cs@}u8TUROO3XkEuWb38qm}gOT;$}zSxv!-k0MqFZYh)#%G'
+         'c5W+u8unS)Xd9ud^CmEPr9MeiM`1<Oe}Xr=k'),
+}
+# END ASSET BUNDLE
+
 if __name__ == "__main__":
     try:
         main()
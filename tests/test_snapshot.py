@@ -0,0 +1,78 @@
+"""
+Snapshot store and restore regressions
+Run with: python3 -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from ideakit import restore
+from ideakit.snapshot import Store, snapshot, store_path
+
+IDEA = os.path.join('ideas', 'active', 'idea.md')
+
+class SameSecondRestoreTest(unittest.TestCase):
+    """A restore whose backup lands in the snapshot's second gets id X-2, which X prefixes"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, '.ideakit'))
+        os.makedirs(os.path.join(self.root, 'ideas', 'active'))
+        self.write("# Idea\n\nfirst version\n")
+        # Every id and timestamp falls in the same second
+        frozen = time.localtime()
+        strftime = time.strftime
+        patcher = mock.patch('time.strftime', lambda fmt, t=None: strftime(fmt, frozen))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def write(self, text: str):
+        with open(os.path.join(self.root, IDEA), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def read(self) -> str:
+        with open(os.path.join(self.root, IDEA), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def restore(self, snapshot_id: str) -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return restore.main(['--root', self.root, snapshot_id])
+
+    def test_restore_with_backup_in_same_second(self):
+        taken = snapshot(self.root)
+        self.write("# Idea\n\nsecond version\n")
+        self.assertEqual(self.restore(taken['id']), 0)
+        self.assertEqual(self.read(), "# Idea\n\nfirst version\n")
+
+        store = Store(store_path(self.root))
+        ids = [record['id'] for record in store.list_records()]
+        self.assertEqual(ids, [taken['id'], taken['id'] + '-2'])
+        self.assertEqual(store.record(taken['id'])['id'], taken['id'])
+        self.assertTrue(store.record(taken['id'] + '-2')['backup'])
+
+    def test_repeated_restore_resolves_exact_id(self):
+        taken = snapshot(self.root)
+        for version in ("second", "third"):
+            self.write(f"# Idea\n\n{version} version\n")
+            self.assertEqual(self.restore(taken['id']), 0)
+            self.assertEqual(self.read(), "# Idea\n\nfirst version\n")
+
+    def test_prefix_still_resolves_and_reports_ambiguity(self):
+        taken = snapshot(self.root)
+        self.write("# Idea\n\nsecond version\n")
+        snapshot(self.root)
+        store = Store(store_path(self.root))
+        self.assertEqual(store.record(taken['id'] + '-')['id'], taken['id'] + '-2')
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(restore.main(['--root', self.root, taken['id'][:8]]), 1)
+        self.assertIn("ambiguous", out.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
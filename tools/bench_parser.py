@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+IdeaKit idea parser benchmark
+Parses a synthetic workspace with the compact Idea parser and compares it with raw reads and the dict parser
+Run with: python3 tools/bench_parser.py [--ideas N] [--corpus DIR] [--json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import gen_corpus  # noqa: E402
+from ideakit.parser import (ASSESSMENT_SECTION, LINK_RE, RELATED_SECTION, parse_assessment,  # noqa: E402
+                            parse_idea_file, read_idea)
+from ideakit.workspace import iter_idea_files  # noqa: E402
+
+# Ideas parsed under tracemalloc to estimate the size of each record
+MEMORY_SAMPLE = 10000
+
+def measure(paths, parse, size: int) -> dict:
+    """Parse every path, keeping the results alive, and return throughput and record size"""
+    gc.collect()
+    started = time.perf_counter()
+    kept = [parse(path) for path in paths]
+    elapsed = time.perf_counter() - started
+    del kept
+    # tracemalloc slows allocation-heavy code down a lot, so the size comes from a separate sample
+    sample = paths[:MEMORY_SAMPLE]
+    gc.collect()
+    tracemalloc.start()
+    kept = [parse(path) for path in sample]
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    per_record = retained / max(len(sample), 1)
+    return {'seconds': round(elapsed, 3), 'files_per_s': round(len(paths) / elapsed),
+            'mb_per_s': round(size / 2 ** 20 / elapsed, 1), 'bytes_per_record': round(per_record),
+            'retained_mb': round(per_record * len(paths) / 2 ** 20, 1)}
+
+def read_bytes(path: str) -> int:
+    """Baseline: read the file without parsing it"""
+    with open(path, 'rb') as f:
+        return len(f.read())
+
+def dict_record(path: str) -> dict:
+    """The dict parser plus the assessment and links every Idea record carries"""
+    idea = parse_idea_file(path)
+    idea['scores'] = parse_assessment(idea['sections'].get(ASSESSMENT_SECTION))
+    idea['links'] = LINK_RE.findall(idea['sections'].get(RELATED_SECTION, ''))
+    return idea
+
+def main() -> int:
+    """Build or reuse a corpus and benchmark the parsers on it"""
+    parser = argparse.ArgumentParser(description="Benchmark parsing a whole workspace of ideas")
+    parser.add_argument('--ideas', type=int, default=100000, help="Synthetic ideas to generate (default: 100000)")
+    parser.add_argument('--corpus', help="Existing workspace to parse instead of a synthetic one")
+    parser.add_argument('--skip-dict', action='store_true', help="Do not time the dict parser")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        root = args.corpus or scratch
+        if not args.corpus:
+            started = time.perf_counter()
+            gen_corpus.generate(root, args.ideas)
+            if not args.json:
+                print(f"🧪 Generated {args.ideas} ideas in {time.perf_counter() - started:.1f}s")
+        paths = [os.path.join(root, relpath) for relpath, _ in iter_idea_files(root)]
+        size = sum(read_bytes(path) for path in paths)  # also warms the page cache
+
+        results = {'python': sys.version.split()[0], 'files': len(paths), 'mb': round(size / 2 ** 20, 1),
+                   'read': measure(paths, read_bytes, size), 'idea': measure(paths, read_idea, size)}
+        if not args.skip_dict:
+            results['dict'] = measure(paths, dict_record, size)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"⏱️  Parsing {results['files']} ideas ({results['mb']} MB, warm cache)")
+    for name, label in (('read', 'raw read'), ('idea', 'read_idea'), ('dict', 'dict parser')):
+        if name in results:
+            row = results[name]
+            print(f"   {label:16} {row['seconds']:7.2f} s  {row['files_per_s']:7d} files/s  "
+                  f"{row['mb_per_s']:6.1f} MB/s  {row['bytes_per_record']:6d} B/record  "
+                  f"{row['retained_mb']:6.1f} MB kept")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
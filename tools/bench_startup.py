@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+IdeaKit installer startup benchmark
+Times cold starts of install.py and reports the slowest imports from -X importtime
+Run with: python3 tools/bench_startup.py [--runs N] [--max-ms MS] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INSTALLER = os.path.join(REPO, 'install.py')
+
+def time_runs(args, runs: int, cwd: str = None) -> list:
+    """Return wall times in milliseconds of running the interpreter with args"""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=cwd, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+def import_times(args) -> list:
+    """Return (cumulative us, module) for every import reported by -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, universal_newlines=True, check=False)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((int(cumulative), name.strip()))
+    return modules
+
+def main() -> int:
+    """Run the benchmark and compare against an optional budget"""
+    parser = argparse.ArgumentParser(description="Benchmark install.py cold-start latency")
+    parser.add_argument('--runs', type=int, default=20, help="Runs per scenario (default: 20)")
+    parser.add_argument('--max-ms', type=float,
+                        help="Fail if install.py --help is slower than the bare interpreter by more than this")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    baseline = time_runs(['-S', '-c', 'pass'], args.runs)
+    interpreter = time_runs(['-c', 'pass'], args.runs)
+    help_times = time_runs([INSTALLER, '--help'], args.runs)
+    with tempfile.TemporaryDirectory() as scratch:
+        install_times = []
+        for i in range(max(3, args.runs // 4)):
+            install_times += time_runs([INSTALLER, '-n', f'bench-{i}', '--no-git'], 1, cwd=scratch)
+
+    overhead = statistics.median(help_times) - statistics.median(interpreter)
+    slowest = sorted(import_times([INSTALLER, '--help']), reverse=True)[:10]
+    results = {
+        'python': sys.version.split()[0],
+        'interpreter_no_site_ms': round(statistics.median(baseline), 2),
+        'interpreter_ms': round(statistics.median(interpreter), 2),
+        'help_ms': round(statistics.median(help_times), 2),
+        'install_ms': round(statistics.median(install_times), 2),
+        'help_overhead_ms': round(overhead, 2),
+        'slowest_imports_us': [{'module': name, 'cumulative_us': us} for us, name in slowest],
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("⏱️  IdeaKit installer startup")
+        print(f"   python -c pass         {results['interpreter_ms']:8.2f} ms")
+        print(f"   install.py --help      {results['help_ms']:8.2f} ms  (+{overhead:.2f} ms)")
+        print(f"   install.py -n project  {results['install_ms']:8.2f} ms")
+        print("   slowest imports (--help):")
+        for us, name in slowest:
+            print(f"     {us / 1000:7.2f} ms  {name}")
+
+    if args.max_ms is not None and overhead > args.max_ms:
+        print(f"❌ --help overhead {overhead:.2f} ms exceeds budget of {args.max_ms} ms")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
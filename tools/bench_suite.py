@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+IdeaKit benchmark suite
+Times install, status, search, score ranking and lint on generated workspaces of several sizes
+Run with: python3 tools/bench_suite.py [--sizes 10,10000] [--runs N] [--baseline FILE] [--json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import gen_corpus  # noqa: E402
+from ideakit.workspace import CACHE_DIR  # noqa: E402
+
+INSTALLER = os.path.join(REPO, 'install.py')
+QUERY = 'music fitness'
+# Each operation: (name, ideakit arguments, timed once on a cold cache or repeated warm)
+OPERATIONS = (
+    ('status_cold', ['status', '--rescan', '--json'], 'cold'),
+    ('status', ['status', '--json'], 'warm'),
+    ('search_cold', ['search', QUERY, '--rebuild', '--json'], 'cold'),
+    ('search', ['search', QUERY, '--json'], 'warm'),
+    ('scores_cold', ['scores', '--json'], 'cold'),
+    ('scores', ['scores', '--json'], 'warm'),
+    ('lint_cold', ['lint', '--json'], 'cold'),
+    ('lint_changed', ['lint', '--changed', '--json'], 'warm'),
+)
+# Slowdowns smaller than this are treated as noise when comparing with a baseline
+NOISE_SECONDS = 0.05
+
+def run(args, cwd: str) -> float:
+    """Run a command and return its wall time in seconds"""
+    env = dict(os.environ, PYTHONPATH=REPO + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    started = time.perf_counter()
+    result = subprocess.run(args, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    elapsed = time.perf_counter() - started
+    # lint exits 1 when it finds problems; anything else is a broken run
+    if result.returncode not in (0, 1):
+        raise RuntimeError(f"{' '.join(args)} failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return elapsed
+
+def bench_install(scratch: str, runs: int) -> float:
+    """Median time of installing a fresh workspace"""
+    times = []
+    for i in range(runs):
+        times.append(run([sys.executable, INSTALLER, '-n', f'install-{i}', '--no-git'], scratch))
+        shutil.rmtree(os.path.join(scratch, f'install-{i}'))
+    return statistics.median(times)
+
+def bench_workspace(root: str, runs: int) -> dict:
+    """Median time of every operation on one workspace; each cold run starts from an empty cache"""
+    results = {}
+    for name, args, kind in OPERATIONS:
+        command = [sys.executable, '-m', 'ideakit'] + args
+        times = []
+        for _ in range(runs):
+            if kind == 'cold':
+                shutil.rmtree(os.path.join(root, CACHE_DIR), ignore_errors=True)
+            times.append(run(command, root))
+        results[name] = round(statistics.median(times), 4)
+    return results
+
+def slower(new: float, old, tolerance: float) -> bool:
+    """Check whether a timing regressed beyond the tolerance and the noise floor"""
+    return old is not None and new > old * (1 + tolerance) and new - old > NOISE_SECONDS
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return (size, operation, old, new) for every operation slower than the baseline allows"""
+    regressions = []
+    for size, operations in results['sizes'].items():
+        for name, seconds in operations.items():
+            old = baseline.get('sizes', {}).get(size, {}).get(name)
+            if slower(seconds, old, tolerance):
+                regressions.append((size, name, old, seconds))
+    if slower(results['install'], baseline.get('install'), tolerance):
+        regressions.append(('-', 'install', baseline['install'], results['install']))
+    return regressions
+
+def main() -> int:
+    """Generate the workspaces, run the suite and optionally compare with a baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark IdeaKit operations on synthetic workspaces")
+    parser.add_argument('--sizes', default='10,10000',
+                        help="Comma-separated idea counts (default: 10,10000; add 1000000 for the large run)")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per operation (default: 5)")
+    parser.add_argument('--workdir', help="Keep generated workspaces here and reuse them on later runs")
+    parser.add_argument('--seed', type=int, default=7, help="Corpus random seed (default: 7)")
+    parser.add_argument('--output', help="Also write the JSON results to this file")
+    parser.add_argument('--baseline', help="Earlier --output file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown against the baseline (default: 0.25 = 25%%)")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    scratch = tempfile.mkdtemp(prefix='ideakit-bench-')
+    workdir = args.workdir or scratch
+    results = {'python': sys.version.split()[0], 'platform': platform.platform(), 'cpus': os.cpu_count(),
+               'seed': args.seed, 'runs': args.runs, 'generate': {}, 'sizes': {}}
+    try:
+        results['install'] = round(bench_install(scratch, args.runs), 4)
+        for size in sizes:
+            root = os.path.join(workdir, f'ideas-{size}-seed{args.seed}')
+            if not os.path.isdir(os.path.join(root, 'ideas', 'active')):
+                started = time.perf_counter()
+                gen_corpus.generate(root, size, args.seed)
+                results['generate'][str(size)] = round(time.perf_counter() - started, 2)
+            if not args.json:
+                print(f"⏱️  {size} ideas...", flush=True)
+            results['sizes'][str(size)] = bench_workspace(root, args.runs)
+    except (OSError, RuntimeError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        names = [name for name, _, _ in OPERATIONS]
+        print(f"   {'ideas':>9}  " + ''.join(f"{name:>13}" for name in names))
+        for size, operations in results['sizes'].items():
+            print(f"   {size:>9}  " + ''.join(f"{operations[name]:12.3f}s" for name in names))
+        print(f"   install {results['install']:.3f}s")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for size, name, old, new in regressions:
+            print(f"❌ {name} on {size} ideas: {new:.3f}s vs {old:.3f}s baseline", file=sys.stderr)
+        if regressions:
+            return 1
+        if not args.json:
+            print(f"✅ No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
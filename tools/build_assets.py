@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+IdeaKit asset bundler
+Packs the files under assets/ into the compressed ASSET_BUNDLE embedded in install.py
+Run with: python3 tools/build_assets.py [--check]
+"""
+
+import base64
+import hashlib
+import os
+import re
+import sys
+import zlib
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(REPO, 'assets')
+INSTALLER = os.path.join(REPO, 'install.py')
+
+# Source files whose installed name differs (a real .gitignore would apply to assets/)
+RENAMES = {'gitignore': '.gitignore'}
+BEGIN = "# BEGIN ASSET BUNDLE"
+END = "# END ASSET BUNDLE"
+LINE_WIDTH = 88
+
+def read_assets():
+    """Return {installed relpath: bytes} for every file under assets/"""
+    assets = {}
+    for directory, _, files in os.walk(ASSETS_DIR):
+        for name in files:
+            path = os.path.join(directory, name)
+            relpath = os.path.relpath(path, ASSETS_DIR).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                assets[RENAMES.get(relpath, relpath)] = f.read()
+    return dict(sorted(assets.items()))
+
+def render_bundle(assets) -> str:
+    """Render the bundle as Python source: one zlib+base85 string per asset"""
+    digest = hashlib.sha256()
+    for relpath, data in assets.items():
+        digest.update(relpath.encode('utf-8') + b'\0' + data + b'\0')
+
+    lines = [f"{BEGIN} (generated by tools/build_assets.py from assets/, do not edit)",
+             f"ASSET_BUNDLE_VERSION = \"{digest.hexdigest()[:12]}\"",
+             "ASSET_BUNDLE = {"]
+    for relpath, data in assets.items():
+        packed = base64.b85encode(zlib.compress(data, 9)).decode('ascii')
+        lines.append(f"    '{relpath}':")
+        chunks = [packed[i:i + LINE_WIDTH] for i in range(0, len(packed), LINE_WIDTH)]
+        for i, chunk in enumerate(chunks):
+            prefix = "        (" if i == 0 else "         "
+            suffix = ")," if i == len(chunks) - 1 else ""
+            lines.append(f"{prefix}'{chunk}'{suffix}")
+    lines.append("}")
+    lines.append(END)
+    return "\n".join(lines)
+
+def main() -> int:
+    """Rewrite (or with --check, verify) the bundle section of install.py"""
+    with open(INSTALLER, 'r', encoding='utf-8') as f:
+        source = f.read()
+    pattern = re.compile(re.escape(BEGIN) + r'.*?' + re.escape(END), re.DOTALL)
+    if not pattern.search(source):
+        print(f"❌ Error: bundle markers not found in {INSTALLER}")
+        return 1
+
+    assets = read_assets()
+    updated = pattern.sub(lambda _: render_bundle(assets), source, count=1)
+    if '--check' in sys.argv[1:]:
+        if updated != source:
+            print("❌ install.py asset bundle is out of date, run: python3 tools/build_assets.py")
+            return 1
+        print("✅ install.py asset bundle is up to date")
+        return 0
+
+    with open(INSTALLER, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(updated)
+    raw = sum(len(data) for data in assets.values())
+    print(f"✅ Packed {len(assets)} assets ({raw} bytes) into install.py")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
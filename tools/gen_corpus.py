@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+IdeaKit synthetic corpus generator
+Builds a deterministic workspace of seeds, expansions and validation reports from the installed templates
+Run with: python3 tools/gen_corpus.py DIR [--ideas N] [--seed S] [--layout flat|date|hash]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import install  # noqa: E402
+from ideakit.parser import CRITERIA  # noqa: E402
+from ideakit.templates import TEMPLATES_DIR  # noqa: E402
+from ideakit.workspace import IDEAS_DIR, LAYOUTS, idea_folder  # noqa: E402
+
+DOMAINS = ('pet', 'fitness', 'gaming', 'cooking', 'music', 'gardening', 'travel', 'finance', 'education',
+           'sleep', 'language', 'photography', 'fashion', 'parenting', 'productivity', 'dating', 'art',
+           'sports', 'reading', 'meditation', 'home', 'weather', 'coding', 'shopping')
+FORMATS = ('app', 'game', 'AR experience', 'chatbot', 'marketplace', 'browser extension', 'wearable',
+           'community', 'board game', 'newsletter')
+WORDS = ('users', 'daily', 'share', 'friends', 'reward', 'simple', 'track', 'progress', 'fun', 'social',
+         'streak', 'challenge', 'learn', 'build', 'quick', 'local', 'smart', 'playful', 'habit', 'team',
+         'budget', 'offline', 'story', 'level', 'coach', 'map', 'voice', 'camera', 'weekly', 'market')
+# Share of ideas in each status folder, and of seeds that reached each later stage
+STATUS_WEIGHTS = (('active', 60), ('archive', 25), ('implemented', 15))
+EXPANSION_RATE = 0.4
+VALIDATION_RATE = 0.5  # of expanded ideas
+FIRST_DAY = date(2023, 1, 1)
+DAYS = 900
+
+PLACEHOLDER_RE = re.compile(r'\[([^\]]*)\]')
+LABEL_RE = re.compile(r'^\s*[-*]?\s*\**([\w ]+?)\**:')
+LINK_LABELS = {'expansion': 'expansion', 'validation': 'validation', 'blueprint': 'blueprint',
+               'original': 'seed', 'based on': 'seed'}
+VALIDATION_SECTIONS = ('Technical Feasibility', 'Market Reality', 'Business Viability', 'Risk Assessment')
+
+class Template:
+    """An installed template, split once into static lines and lines with placeholders to fill"""
+
+    def __init__(self, text: str):
+        self.lines = []
+        section = ''
+        for line in text.splitlines():
+            if line.startswith('## '):
+                section = line[3:].strip()
+            match = LABEL_RE.match(line)
+            label = match.group(1).strip().lower() if match else ''
+            self.lines.append((line, section, label, bool(PLACEHOLDER_RE.search(line))))
+
+    def render(self, rng: random.Random, context: dict) -> str:
+        """Fill every placeholder from the context, inventing text for free-form ones"""
+        scores = iter(context['scores'])
+        out = []
+        for line, section, label, has_placeholder in self.lines:
+            if not has_placeholder:
+                out.append(line)
+                continue
+
+            def fill(match, section=section, label=label):
+                key = match.group(1).strip().lower()
+                if key in ('', 'x'):
+                    # A checkbox: some questions are already answered
+                    return '[x]' if section == 'Questions to Explore' and rng.random() < 0.3 else '[ ]'
+                if key == 'title':
+                    return context['title']
+                if key == 'date':
+                    return context['date']
+                if key == 'x/50':
+                    return f"{sum(context['scores'])}/50"
+                if key == '1-10':
+                    return f"{next(scores)}/10"
+                if key.startswith('link'):
+                    return context['links'].get(LINK_LABELS.get(label, ''), match.group(0))
+                if key.startswith('question'):
+                    return sentence(rng, 6, 12)[:-1] + '?'
+                if key == 'name':
+                    return pair(rng).title()
+                return sentence(rng, 8, 30)
+
+            out.append(PLACEHOLDER_RE.sub(fill, line))
+        return '\n'.join(out) + '\n'
+
+def sentence(rng: random.Random, low: int, high: int) -> str:
+    """A pseudo-sentence mixing domain and filler words"""
+    words = [rng.choice(WORDS if rng.random() < 0.8 else DOMAINS) for _ in range(rng.randint(low, high))]
+    return ' '.join(words).capitalize() + '.'
+
+def pair(rng: random.Random) -> str:
+    """Two distinct domains, e.g. 'music + fitness'"""
+    first, second = rng.sample(DOMAINS, 2)
+    return f"{first} + {second}"
+
+def validation_report(rng: random.Random, context: dict) -> str:
+    """A validation report with the sections ik-reality-check asks for"""
+    lines = [f"# 🔍 Validation Report: {context['title']}", "",
+             f"**Based on:** {context['links']['seed']}", f"**Validated:** {context['date']}",
+             "**Status:** Reality Check", ""]
+    for name in VALIDATION_SECTIONS:
+        lines += [f"## {name}"] + [f"- {sentence(rng, 8, 20)}" for _ in range(rng.randint(2, 4))] + [""]
+    lines += ["## Verdict", rng.choice(("Go", "Pivot", "Park")) + " - " + sentence(rng, 8, 16), "",
+              "## Related Files", f"- Original: {context['links']['seed']}"]
+    if 'expansion' in context['links']:
+        lines.append(f"- Expansion: {context['links']['expansion']}")
+    lines += ["", "---", "*Created with IdeaKit 🚀*", ""]
+    return '\n'.join(lines)
+
+def load_templates(root: str) -> dict:
+    """Read the workspace's installed seed and expansion templates"""
+    templates = {}
+    for kind, filename in (('seed', 'idea-seed.md'), ('expansion', 'creative-expansion.md')):
+        with open(os.path.join(root, TEMPLATES_DIR, filename), 'r', encoding='utf-8') as f:
+            templates[kind] = Template(f.read())
+    return templates
+
+def generate(root: str, ideas: int, seed: int = 7, layout: str = 'flat') -> dict:
+    """Install a workspace at root and fill it with ideas; the same arguments give the same files"""
+    os.makedirs(root, exist_ok=True)
+    warnings = install.install_components(root, verbose=False, layout=layout)
+    if warnings:
+        raise OSError("; ".join(warnings))
+    templates = load_templates(root)
+    rng = random.Random(seed)
+    statuses = [status for status, weight in STATUS_WEIGHTS for _ in range(weight)]
+    counts = {'seed': 0, 'expansion': 0, 'validation': 0}
+    made = set()
+    for number in range(ideas):
+        domains = pair(rng)
+        title = f"{domains.title()} {rng.choice(FORMATS)} {number}"
+        day = FIRST_DAY + timedelta(days=rng.randrange(DAYS))
+        stem = (f"{day:%Y%m%d}-{rng.randrange(24):02d}{rng.randrange(60):02d}{rng.randrange(60):02d}-"
+                f"{re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')}")
+        status = rng.choice(statuses)
+        names = {'seed': stem + '.md'}
+        if rng.random() < EXPANSION_RATE:
+            names['expansion'] = stem + '-expansion.md'
+            if rng.random() < VALIDATION_RATE:
+                names['validation'] = stem + '-validation-report.md'
+        paths = {kind: f"{idea_folder(status, name, layout)}/{name}" for kind, name in names.items()}
+        context = {'title': title, 'date': day.isoformat(), 'links': paths,
+                   'scores': [rng.randint(1, 10) for _ in CRITERIA]}
+
+        for kind, relpath in paths.items():
+            if kind == 'validation':
+                text = validation_report(rng, context)
+            else:
+                context['date'] = (day + timedelta(days=rng.randint(1, 30))).isoformat() \
+                    if kind == 'expansion' else day.isoformat()
+                text = templates[kind].render(rng, context)
+            directory = os.path.dirname(os.path.join(root, relpath))
+            if directory not in made:
+                os.makedirs(directory, exist_ok=True)
+                made.add(directory)
+            with open(os.path.join(root, relpath), 'w', encoding='utf-8') as f:
+                f.write(text)
+            counts[kind] += 1
+    return counts
+
+def main() -> int:
+    """Generate a workspace from the command line"""
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic IdeaKit workspace")
+    parser.add_argument('directory', help="Workspace to create (may already hold an install)")
+    parser.add_argument('--ideas', type=int, default=10000, help="Idea seeds to generate (default: 10000)")
+    parser.add_argument('--seed', type=int, default=7, help="Random seed (default: 7)")
+    parser.add_argument('--layout', choices=LAYOUTS, default='flat', help="Idea folder layout (default: flat)")
+    args = parser.parse_args()
+
+    active = os.path.join(args.directory, IDEAS_DIR, 'active')
+    if os.path.isdir(active) and os.listdir(active):
+        print(f"❌ Error: {args.directory} already has ideas; generate into an empty directory")
+        return 1
+    started = time.perf_counter()
+    counts = generate(args.directory, args.ideas, args.seed, args.layout)
+    print(f"✅ Generated {counts['seed']} seeds, {counts['expansion']} expansions and "
+          f"{counts['validation']} validation reports in {time.perf_counter() - started:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())